@@ -0,0 +1,78 @@
+"""
+Cifrados clásicos (desplazamiento, multiplicativo, afín, Vigenère, Hill y Playfair) y
+sus ataques. Importar el paquete no ejecuta nada ni carga NumPy: cada submódulo se
+importa la primera vez que se usa uno de sus nombres y NumPy la primera vez que una
+función lo necesita. Las demostraciones se ejecutan con python -m cifrados módulo.
+"""
+
+import importlib
+
+SUBMODULES = (
+    "affine",
+    "alphabets",
+    "analysis",
+    "codec",
+    "displacement",
+    "hill",
+    "inplace",
+    "jobrunner",
+    "keycache",
+    "lazy",
+    "modular",
+    "multiplication",
+    "ngrams",
+    "operations",
+    "parallel",
+    "playfair",
+    "profiling",
+    "service",
+    "streaming",
+    "substitution",
+    "vigenere",
+)
+
+# Nombre público -> submódulo que lo define
+EXPORTS = {
+    "Alphabet": "alphabets",
+    "BYTES": "alphabets",
+    "STANDARD": "alphabets",
+    "CiphertextProfile": "analysis",
+    "KEY_CACHE": "keycache",
+    "caesar_encrypt": "displacement",
+    "caesar_decrypt": "displacement",
+    "multiplicative_encrypt": "multiplication",
+    "multiplicative_decrypt": "multiplication",
+    "guess_displacement_cipher": "multiplication",
+    "guess_multiplicative_cipher": "multiplication",
+    "affine_encrypt": "affine",
+    "affine_decrypt": "affine",
+    "affine_sweep": "affine",
+    "vigenere_encrypt": "vigenere",
+    "vigenere_decrypt": "vigenere",
+    "crack_vigenere": "vigenere",
+    "hill_encrypt": "hill",
+    "hill_decrypt": "hill",
+    "known_plaintext_attack": "hill",
+    "ciphertext_only_attack": "hill",
+    "cifrar_playfair": "playfair",
+    "descifrar_playfair": "playfair",
+    "romper_playfair": "playfair",
+}
+
+__all__ = [*SUBMODULES, *EXPORTS]
+
+
+def __getattr__(name):
+    # Solo se llama para nombres que todavía no están en el módulo
+    if name in EXPORTS:
+        value = getattr(importlib.import_module(f".{EXPORTS[name]}", __name__), name)
+    elif name in SUBMODULES:
+        value = importlib.import_module(f".{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
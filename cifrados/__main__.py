@@ -0,0 +1,23 @@
+"""
+Ejecuta la demostración o la interfaz de línea de comandos de un submódulo.
+Uso: python -m cifrados módulo [argumentos ...]
+"""
+
+import importlib.util
+import runpy
+import sys
+
+from . import SUBMODULES
+
+
+def main(argv):
+    if not argv or importlib.util.find_spec(f"{__package__}.{argv[0]}") is None:
+        sys.exit(f"Uso: python -m {__package__} módulo [argumentos ...]\nMódulos: {', '.join(SUBMODULES)}")
+    name = f"{__package__}.{argv[0]}"
+    # El submódulo ve sus argumentos como si se hubiera ejecutado con python -m
+    sys.argv = [name, *argv[1:]]
+    runpy.run_module(name, run_name="__main__", alter_sys=True)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,146 +1,82 @@
 from itertools import permutations
-from math import gcd
 
-# Especificacion del alfabeto
-alphabet = list("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
-# alphabet = generate_alphabet("alfabeto.txt", separator="")
-
-# Diccionarios para facil transformación del alfabeto a su equivalente númerico
-alphabetical_decimal = {char: i for i, char in enumerate(alphabet)}
-decimal_alphabetical = {i: char for char, i in alphabetical_decimal.items()}
-
-modulus = len(alphabet)
+from .alphabets import STANDARD
+from .analysis import CiphertextProfile, as_profile, expected_frequencies
+from .lazy import numpy as np
+from .modular import solve_linear_congruences
+from .profiling import ARITHMETIC, MAP, NORMALIZE, OUTPUT, stage
 
 # Lista de caracteres comunes en inglés y español usando alfabeto estandar
 english_common = "ETAO"
 spanish_common = "EAOS"
 
-# Lista de inversos multiplicativos para el cifrado afín
-inverses = {pow(i, -1, modulus) for i in range(26) if gcd(i, modulus) == 1}
-
 
-def generate_alphabet(filename, separator=None):
-    """
-    Extrae los caracteres de un archivo de texto y los devuelve como una lista,
-    en orden para hacer un alfabeto extendido. Permite definir un separador del contenido.
-    Argumentos:
-    filename (str): El nombre del archivo de texto desde donde se extraerán los caracteres.
-    separator (str, optional): El separador que se usa en el archivo, por defecto es None si no hay separador.
-    Regresa:
-    list: Una lista con los caracteres válidos que pueden usarse como alfabeto.
-    """
-    try:
-        # Abrir el archivo y leer su contenido
-        with open(filename, "r", encoding="utf-8") as file:
-            content = file.read()  # Se almacena el contenido del archivo
-
-        # Si hay un separador, separar el contenido
-        if separator:
-            content = content.split(separator)
-        # Si no hay separador, tomar todos los caracteres
-        else:
-            content = list(content)
-
-        seen = set()  # Almacena los elementos ya vistos
-        characters = []  # Almacena los caracteres
-        # Se lee el archivo y se almacenan los caracteres en orden
-        for char in content:
-            if char not in seen:
-                characters.append(char)
-                seen.add(char)
-        # Regresa los caracteres para el diccionario extendido
-        return characters
-    # Excepcion por si no se encuentra el archivo
-    except FileNotFoundError:
-        print(f"El archivo {filename} no se encontró.")
-        return []
-
-
-def affine_encrypt(message, a, b):
+def affine_encrypt(message, a, b, unknown="drop", alphabet=STANDARD):
     """
     Cifra un mensaje usando el cifrado afín.
     Argumentos:
     message (str): El mensaje a cifrar.
     a (int): El multiplicador del cifrado afín.
     b (int): El desplazamiento del cifrado afín.
+    unknown (str): Política para caracteres fuera del alfabeto ("drop", "keep" o "error").
+    alphabet (Alphabet): El alfabeto del cifrado.
     Regresa:
     str: El mensaje cifrado.
     """
-    encrypted_message = []
-    for char in message.upper():
-        if char in alphabetical_decimal:
-            x = alphabetical_decimal[char]
-            encrypted_char = decimal_alphabetical[(a * x + b) % modulus]
-            encrypted_message.append(encrypted_char)
-        else:
-            print(f"Carácter '{char}' no está en el alfabeto.")
-    return "".join(encrypted_message)
+    with stage("affine_encrypt", ARITHMETIC, len(message)):
+        return alphabet.substitution(a, b).encrypt(message, unknown)
 
 
-def affine_decrypt(encrypted_message, a, b):
+def affine_decrypt(encrypted_message, a, b, unknown="drop", alphabet=STANDARD):
     """
     Descifra un mensaje cifrado usando el cifrado afín.
     Argumentos:
     encrypted_message (str): El mensaje cifrado a descifrar.
     a (int): El multiplicador del cifrado afín.
     b (int): El desplazamiento del cifrado afín.
+    unknown (str): Política para caracteres fuera del alfabeto ("drop", "keep" o "error").
+    alphabet (Alphabet): El alfabeto del cifrado.
     Regresa:
     str: El mensaje descifrado.
     """
-    # Calcular el inverso multiplicativo de 'a' módulo 'modulus'
-    a_inv = pow(a, -1, modulus)
-    decrypted_message = []
-    for char in encrypted_message.upper():
-        if char in alphabetical_decimal:
-            y = alphabetical_decimal[char]
-            decrypted_char = decimal_alphabetical[(a_inv * (y - b)) % modulus]
-            decrypted_message.append(decrypted_char)
-        else:
-            print(f"Carácter '{char}' no está en el alfabeto.")
-    return "".join(decrypted_message)
+    # La tabla de descifrado es la inversa de la de cifrado
+    with stage("affine_decrypt", ARITHMETIC, len(encrypted_message)):
+        return alphabet.substitution(a, b).decrypt(encrypted_message, unknown)
 
 
-def frequency_analysis(message):
+def frequency_analysis(message, alphabet=STANDARD):
     """
-    Realiza un análisis de frecuencia del mensaje.
+    Realiza un análisis de frecuencia del mensaje. Los caracteres fuera del
+    alfabeto se ignoran.
     Argumentos:
-    message (str): El mensaje a analizar.
+    message (str | CiphertextProfile): El mensaje a analizar, o su perfil.
+    alphabet (Alphabet): El alfabeto del cifrado.
     Regresa:
-    str: Una cadena que representa la frecuencia de cada carácter en el mensaje.
+    str: Los caracteres del mensaje del más al menos frecuente.
     """
-    frequency = {}
-    for char in message.upper():
-        if char in alphabetical_decimal:
-            frequency[char] = frequency.get(char, 0) + 1
-        else:
-            print(f"Carácter '{char}' no está en el alfabeto.")
-    # Crea una lista de tuplas de los caracteres ordenados con su frencuencia
-    sorted_frequency = sorted(frequency.items(), key=lambda item: item[1], reverse=True)
-    return "".join([char[0] for char in sorted_frequency])
+    return as_profile(message, alphabet).most_common()
 
 
-def solve_affine_equations(equation1, equation2):
+def solve_affine_equations(equation1, equation2, alphabet=STANDARD):
     """
     Resuelve un sistema de ecuaciones lineales para encontrar los valores de 'a' y 'b'
     en el cifrado afín, donde la ecuacion es de la forma: y = ax + b (mod m).
     Argumentos:
     equation1 (tuple): Primera ecuación en forma (x, y).
     equation2 (tuple): Segunda ecuación en forma (x, y).
+    alphabet (Alphabet): El alfabeto del cifrado.
     Regresa:
-    tuple: Una tupla con los valores de 'a' y 'b'.
+    tuple: Una tupla con los valores de 'a' y 'b', o (None, None) si la solución no
+    es única.
     """
     x1, y1 = equation1
     x2, y2 = equation2
-    # Calcular el inverso multiplicativo de (x2 - x1) mod m
-    try:
-        inv = pow(x2 - x1, -1, modulus)
-        # Calcular 'a'
-        a = ((y2 - y1) * inv) % modulus
-        # Calcular 'b'
-        b = (y1 - a * x1) % modulus
-        return a, b
-    except ValueError:
+    _, a, b = solve_linear_congruences([x1], [y1], [x2], [y2], alphabet.modulus)
+    # Con (x2 - x1) invertible la solución es única; si no, hay 0 o varias y se
+    # regresa (None, None); solve_linear_congruences las da todas
+    if len(a) != 1:
         return None, None
+    return int(a[0]), int(b[0])
 
 
 def mapping(cipher_freq, plain_freq):
@@ -168,48 +104,167 @@ def mapping(cipher_freq, plain_freq):
     return result
 
 
-def affine_solver(cipher_text, common_language):
+def mapping_equations(cipher_freq, plain_freq, alphabet=STANDARD):
     """
-    Resuelve el cifrado afín dado un texto cifrado.
+    Construye de una vez los sistemas de ecuaciones de todos los mapeos de mapping:
+    cada par de letras cifradas distintas (en orden de aparición) contra cada par
+    ordenado de letras planas distintas.
     Argumentos:
-    cipher_text (str): El texto cifrado a resolver.
-    common_language (str): El idioma que se cree se usó para cifrar el texto.
+    cipher_freq (str): Los caracteres más comunes del texto cifrado.
+    plain_freq (str): Los caracteres más comunes del texto plano.
+    alphabet (Alphabet): El alfabeto del cifrado.
     Regresa:
-    list: Una lista de posibles soluciones (pares de 'a' y 'b').
+    np.array: Matriz (mapeos x 4) con las columnas x1, y1, x2, y2.
+    """
+    cipher = np.array([alphabet.positions[c] for c in cipher_freq], dtype=np.int64)
+    plain = np.array([alphabet.positions[c] for c in plain_freq], dtype=np.int64)
+    i, j = np.triu_indices(len(cipher), 1)
+    k, l = np.nonzero(~np.eye(len(plain), dtype=bool))
+    # Intercambiar las dos ecuaciones da el mismo mapeo, así que basta con i < j
+    rows = np.repeat(np.arange(len(i)), len(k))
+    columns = np.tile(np.arange(len(k)), len(i))
+    return np.column_stack(
+        [cipher[i][rows], plain[k][columns], cipher[j][rows], plain[l][columns]]
+    )
+
+
+def affine_solver(cipher_text, common_language, alphabet=STANDARD, letters=4):
+    """
+    Resuelve el cifrado afín dado un texto cifrado. Cada mapeo de dos letras cifradas
+    frecuentes a dos letras comunes del idioma es un sistema de dos congruencias, y
+    todos los sistemas se resuelven juntos con solve_linear_congruences, incluidos
+    los que tienen varias soluciones.
+    Argumentos:
+    cipher_text (str | CiphertextProfile): El texto cifrado a resolver, o su perfil.
+    common_language (str): Las letras más comunes del idioma que se cree se usó, de
+    la más a la menos frecuente.
+    alphabet (Alphabet): El alfabeto del cifrado.
+    letters (int): Cuántas letras frecuentes de cada lado se mapean; con k letras se
+    prueban k(k-1)/2 * k(k-1) mapeos.
+    Regresa:
+    list: Una lista de posibles soluciones (pares de 'a' y 'b'), sin repetir, en el
+    orden de los mapeos.
     """
-    solutions = []
     # Realizar análisis de frecuencia del texto cifrado
-    freq = frequency_analysis(cipher_text)
-    # Mapeo de caracteres más frecuentes, por defeco usando los 4 más comunes
-    mappings = mapping(freq[:4], common_language[:4])
-    print(freq[:4], common_language[:4])
-    for m in mappings:
-        x1, y1 = alphabetical_decimal[m[0][0]], alphabetical_decimal[m[0][1]]
-        x2, y2 = alphabetical_decimal[m[1][0]], alphabetical_decimal[m[1][1]]
-        a, b = solve_affine_equations((x1, y1), (x2, y2))
-        if m == [("E", "E"), ("Y", "S")]:
-            print(m)
-            print(x1, y1)
-            print(x2, y2)
-            print(a, b)
-            print()
-        # Verifica que la ecuacuión tenga solución
-        if a is not None and b is not None:
-            # Verificar que 'a' y 'b' sean válidos
-            if a in inverses and 0 <= b < modulus:
-                solutions.append((a, b))
-    return solutions
-
-
-lm = """
-BWYYEREYZMICPWYPEQEYGFCIWYEYDERCPVCCIWROYWBMQGWPEYCTEQEYEBEYLMERVWPWWJFGEPEREYMBFCXWYGPIEXGCFWYDERWQWPQWPYFCPQGCODCYGWPDWXEIWYCBQCPVCRPMEYFRWYYMEPWY
-"""
-lm = lm.replace("\n", "")
-
-# Solution a = 7 and b = 2
-# posible = affine_solver(lm, spanish_common)
-# for a, b in posible:
-#     decrypted = affine_decrypt(lm, a, b)
-#     print(f"a: {a}, b: {b} -> {decrypted[:50]}...")
-
-print(solve_affine_equations((4, 4), (24, 18)))
+    with stage("affine_solver", NORMALIZE, len(cipher_text)):
+        freq = frequency_analysis(cipher_text, alphabet)
+    with stage("affine_solver", MAP):
+        equations = mapping_equations(freq[:letters], common_language[:letters], alphabet)
+    with stage("affine_solver", ARITHMETIC):
+        _, a, b = solve_linear_congruences(*equations.T, alphabet.modulus)
+        # Solo las claves con 'a' invertible descifran
+        valid = np.gcd(a, alphabet.modulus) == 1
+    with stage("affine_solver", OUTPUT):
+        return list(dict.fromkeys(zip(a[valid].tolist(), b[valid].tolist())))
+
+
+def affine_keys(alphabet=STANDARD):
+    """
+    Enumera todas las claves (a, b) del cifrado afín para un alfabeto.
+    Argumentos:
+    alphabet (Alphabet): El alfabeto del cifrado.
+    Regresa:
+    tuple: Dos arreglos con los valores de 'a' y 'b' de cada clave (312 para m = 26).
+    """
+    units = np.array(alphabet.units)
+    return np.repeat(units, alphabet.modulus), np.tile(np.arange(alphabet.modulus), len(units))
+
+
+def message_counts(messages, alphabet=STANDARD):
+    """
+    Cuenta las letras de muchos mensajes con un solo bincount.
+    Argumentos:
+    messages (np.array | list): Arreglo (N x L) de índices, rellenado con valores
+    fuera de [0, m) (por ejemplo 255 o -1), o una lista de N arreglos o textos de
+    distinta longitud (también se aceptan perfiles).
+    alphabet (Alphabet): El alfabeto del cifrado.
+    Regresa:
+    np.array: Matriz (N x m) con los conteos de letras de cada mensaje.
+    """
+    modulus = alphabet.modulus
+    if isinstance(messages, np.ndarray) and messages.ndim == 2:
+        valid = (messages >= 0) & (messages < modulus)
+        rows, values = np.nonzero(valid)[0], messages[valid]
+        count = messages.shape[0]
+    else:
+        arrays = [
+            as_profile(message, alphabet).values
+            if isinstance(message, (str, CiphertextProfile))
+            else np.asarray(message)
+            for message in messages
+        ]
+        arrays = [array[(array >= 0) & (array < modulus)] for array in arrays]
+        count = len(arrays)
+        lengths = [len(array) for array in arrays]
+        rows = np.repeat(np.arange(count), lengths)
+        values = np.concatenate(arrays) if arrays else np.empty(0, dtype=np.uint8)
+    flat = rows * modulus + values
+    return np.bincount(flat, minlength=count * modulus).reshape(count, modulus)
+
+
+def affine_sweep(messages, language="spanish", top=5, chunk_rows=8192, alphabet=STANDARD):
+    """
+    Evalúa las 312 claves afines de cada mensaje de un lote y regresa las mejores.
+    El chi-cuadrado del texto descifrado con la clave (a, b) es
+    sum_y c_y² / (n * e_x(y)) - n, donde x(y) es la letra plana de la letra cifrada y,
+    así que las N x 312 x 26 comparaciones son un solo producto de matrices entre los
+    cuadrados de los conteos (N x 26) y los pesos 1 / e de cada clave (26 x 312).
+    Argumentos:
+    messages (np.array | list): Arreglo (N x L) rellenado o lista de mensajes, ver message_counts.
+    language (str | list): "spanish", "english" o una tabla de frecuencias propia.
+    top (int): Cuántas claves regresar por mensaje.
+    chunk_rows (int): Mensajes evaluados a la vez, para acotar la memoria.
+    alphabet (Alphabet): El alfabeto del cifrado.
+    Regresa:
+    tuple: Arreglo (N x top x 2) con las claves (a, b) de mejor a peor y arreglo
+    (N x top) con su chi-cuadrado. Los mensajes vacíos tienen puntaje infinito.
+    """
+    modulus = alphabet.modulus
+    with stage("affine_sweep", NORMALIZE):
+        counts = message_counts(messages, alphabet).astype(np.float64)
+    with stage("affine_sweep", ARITHMETIC, int(counts.sum())):
+        expected = expected_frequencies(language, modulus)
+        a, b = affine_keys(alphabet)
+        top = min(top, len(a))
+
+        # weights[k, y] = 1 / e[x] con x = a⁻¹ (y - b), la letra plana de y con la clave k
+        inverse = alphabet.inverses[a]
+        plain = (inverse[:, None] * (np.arange(modulus)[None, :] - b[:, None])) % modulus
+        weights = (1.0 / expected)[plain].T
+
+        keys = np.empty((len(counts), top, 2), dtype=np.int64)
+        scores = np.empty((len(counts), top))
+        for start in range(0, len(counts), chunk_rows):
+            block = counts[start : start + chunk_rows]
+            totals = block.sum(axis=1, keepdims=True)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                chi = (block**2 @ weights) / totals - totals
+            chi[totals[:, 0] == 0] = np.inf
+            # Selección parcial de las mejores y orden solo entre ellas
+            best = np.argpartition(chi, top - 1, axis=1)[:, :top]
+            order = np.argsort(np.take_along_axis(chi, best, axis=1), axis=1, kind="stable")
+            best = np.take_along_axis(best, order, axis=1)
+            keys[start : start + chunk_rows, :, 0] = a[best]
+            keys[start : start + chunk_rows, :, 1] = b[best]
+            scores[start : start + chunk_rows] = np.take_along_axis(chi, best, axis=1)
+    return keys, scores
+
+
+def demo():
+    # Solution a = 7 and b = 2
+    lm = (
+        "BWYYEREYZMICPWYPEQEYGFCIWYEYDERCPVCCIWROYWBMQGWPEYCTEQEYEBEYLMERVWPWWJFGEPEREYMB"
+        "FCXWYGPIEXGCFWYDERWQWPQWPYFCPQGCODCYGWPDWXEIWYCBQCPVCRPMEYFRWYYMEPWY"
+    )
+    posible = affine_solver(lm, spanish_common)
+    for a, b in posible[:10]:
+        decrypted = affine_decrypt(lm, a, b)
+        print(f"a: {a}, b: {b} -> {decrypted[:50]}...")
+
+    # (24 - 4) no es invertible módulo 26: el sistema tiene dos soluciones
+    _, a, b = solve_linear_congruences([4], [4], [24], [18], 26)
+    print(list(zip(a.tolist(), b.tolist())))
+
+
+if __name__ == "__main__":
+    demo()
@@ -0,0 +1,153 @@
+import string
+from math import gcd
+from types import MappingProxyType
+
+from .codec import DROP, Codec, check_symbols
+from .lazy import numpy as np
+from .substitution import TranslationTable, compile_affine
+
+
+class Alphabet:
+    """
+    Alfabeto compilado e inmutable. Al construirlo se calculan una sola vez la tabla de
+    traducción que normaliza texto y el grupo de unidades módulo m; las tablas de NumPy
+    (conversión entre texto e índices e inversos) se construyen la primera vez que se
+    usan, así que crear un alfabeto no carga NumPy. Cada cifrado recibe el alfabeto
+    como parámetro, así que se pueden usar varios a la vez sin recalcular nada.
+    """
+
+    __slots__ = ("symbols", "modulus", "positions", "units", "normalizer", "_codec", "_inverses")
+
+    def __init__(self, symbols):
+        """
+        Argumentos:
+        symbols (str | list): Los caracteres del alfabeto, en orden.
+        """
+        symbols = "".join(check_symbols(symbols))
+        modulus = len(symbols)
+
+        setter = super().__setattr__
+        setter("symbols", symbols)
+        setter("modulus", modulus)
+        setter("positions", MappingProxyType({char: i for i, char in enumerate(symbols)}))
+        setter("units", tuple(a for a in range(1, modulus) if gcd(a, modulus) == 1))
+        setter("normalizer", TranslationTable(symbols, symbols))
+        setter("_codec", None)
+        setter("_inverses", None)
+
+    @property
+    def codec(self):
+        """
+        Codec: Las tablas de conversión entre texto e índices, de solo lectura.
+        """
+        if self._codec is None:
+            codec = Codec(self.symbols)
+            codec.encode_table.flags.writeable = False
+            codec.decode_table.flags.writeable = False
+            super().__setattr__("_codec", codec)
+        return self._codec
+
+    @property
+    def inverses(self):
+        """
+        np.array: inverses[a] es el inverso de a módulo m, o 0 si a no es unidad.
+        """
+        if self._inverses is None:
+            inverses = np.zeros(self.modulus, dtype=np.int64)
+            inverses[list(self.units)] = [pow(a, -1, self.modulus) for a in self.units]
+            inverses.flags.writeable = False
+            super().__setattr__("_inverses", inverses)
+        return self._inverses
+
+    @classmethod
+    def from_file(cls, filename, separator=None):
+        """
+        Construye un alfabeto con los caracteres de un archivo de texto, en orden de
+        primera aparición.
+        Argumentos:
+        filename (str): El nombre del archivo de texto.
+        separator (str, optional): El separador del contenido; por defecto cada carácter.
+        Regresa:
+        Alphabet: El alfabeto compilado.
+        """
+        with open(filename, "r", encoding="utf-8") as file:
+            content = file.read()
+        content = content.split(separator) if separator else list(content)
+        return cls(dict.fromkeys(content))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Un Alphabet es inmutable.")
+
+    def __delattr__(self, name):
+        raise AttributeError("Un Alphabet es inmutable.")
+
+    def __reduce__(self):
+        return Alphabet, (self.symbols,)
+
+    def __eq__(self, other):
+        return isinstance(other, Alphabet) and other.symbols == self.symbols
+
+    def __hash__(self):
+        return hash(self.symbols)
+
+    def __len__(self):
+        return self.modulus
+
+    def __iter__(self):
+        return iter(self.symbols)
+
+    def __getitem__(self, index):
+        return self.symbols[index]
+
+    def __repr__(self):
+        return f"Alphabet({self.symbols!r})"
+
+    def encode(self, text, unknown=DROP):
+        """
+        Convierte un texto a índices del alfabeto; ver Codec.encode.
+        """
+        return self.codec.encode(text, unknown)
+
+    def decode(self, values, layout=None):
+        """
+        Convierte índices del alfabeto a texto; ver Codec.decode.
+        """
+        return self.codec.decode(values, layout)
+
+    def normalize(self, text, unknown=DROP):
+        """
+        Pliega las minúsculas y aplica la política a los caracteres desconocidos con
+        una sola llamada a translate.
+        """
+        return self.normalizer.apply(text, unknown)
+
+    def inverse(self, a):
+        """
+        Regresa el inverso de a módulo m.
+        Argumentos:
+        a (int): El número a invertir.
+        Regresa:
+        int: El inverso.
+        """
+        inverse = int(self.inverses[a % self.modulus])
+        if inverse == 0:
+            raise ValueError(f"'a' = {a} no tiene inverso en el módulo {self.modulus}.")
+        return inverse
+
+    def substitution(self, a, b):
+        """
+        Regresa la clave afín (a, b) compilada para este alfabeto.
+        Argumentos:
+        a (int): El multiplicador.
+        b (int): El desplazamiento.
+        Regresa:
+        AffineSubstitution: La clave compilada, reutilizada entre llamadas.
+        """
+        return compile_affine(a, b, self.symbols)
+
+
+# Alfabeto clásico de 26 letras, el predeterminado de todos los cifrados
+STANDARD = Alphabet(string.ascii_uppercase)
+
+# Los 256 valores de un byte, para cifrar datos binarios (cada byte es un carácter latin-1)
+BYTES = Alphabet(bytes(range(256)).decode("latin-1"))
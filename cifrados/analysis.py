@@ -0,0 +1,252 @@
+from functools import cached_property
+
+from .alphabets import STANDARD
+from .lazy import numpy as np
+from .ngrams import ngram_indices
+
+# Frecuencias relativas (%) de las letras A-Z, sin acentos ni Ñ
+ENGLISH_FREQUENCIES = [
+    8.167, 1.492, 2.782, 4.253, 12.702, 2.228, 2.015, 6.094, 6.966, 0.153, 0.772, 4.025, 2.406,
+    6.749, 7.507, 1.929, 0.095, 5.987, 6.327, 9.056, 2.758, 0.978, 2.360, 0.150, 1.974, 0.074,
+]
+SPANISH_FREQUENCIES = [
+    11.525, 2.215, 4.019, 5.010, 12.181, 0.692, 1.768, 0.703, 6.247, 0.493, 0.011, 4.967, 3.157,
+    6.712, 8.683, 2.510, 0.877, 6.871, 7.977, 4.632, 2.927, 1.138, 0.017, 0.215, 1.008, 0.467,
+]
+
+LANGUAGES = {"english": ENGLISH_FREQUENCIES, "spanish": SPANISH_FREQUENCIES}
+
+
+def expected_frequencies(language, modulus):
+    """
+    Regresa la distribución de probabilidad de las letras de un idioma.
+    Argumentos:
+    language (str | list): "english", "spanish" o una lista de frecuencias propia.
+    modulus (int): El tamaño del alfabeto; las tablas incluidas son para 26 letras.
+    Regresa:
+    np.array: Probabilidades de cada letra, que suman 1.
+    """
+    frequencies = LANGUAGES[language] if isinstance(language, str) else language
+    frequencies = np.asarray(frequencies, dtype=np.float64)
+    if len(frequencies) != modulus:
+        raise ValueError(
+            f"La tabla de frecuencias tiene {len(frequencies)} letras y el alfabeto {modulus}."
+        )
+    # Se evita dividir entre cero con letras de frecuencia nula
+    frequencies = np.maximum(frequencies, 1e-6)
+    return frequencies / frequencies.sum()
+
+
+def chi_squared(counts, expected):
+    """
+    Calcula el estadístico chi-cuadrado de uno o varios conteos de letras contra
+    una distribución esperada. Un valor menor indica un mejor ajuste.
+    Argumentos:
+    counts (np.array): Conteos de letras, con las letras en el último eje.
+    expected (np.array): Probabilidades esperadas de cada letra.
+    Regresa:
+    np.array: Un valor por cada conteo.
+    """
+    counts = np.asarray(counts, dtype=np.float64)
+    totals = counts.sum(axis=-1, keepdims=True)
+    expected_counts = totals * expected
+    return ((counts - expected_counts) ** 2 / expected_counts).sum(axis=-1)
+
+
+def index_of_coincidence(values, modulus):
+    """
+    Calcula el índice de coincidencia de un arreglo de índices del alfabeto:
+    la probabilidad de que dos letras tomadas al azar sean iguales.
+    Argumentos:
+    values (np.array): Índices del alfabeto.
+    modulus (int): El tamaño del alfabeto.
+    Regresa:
+    float: El índice de coincidencia (0 si hay menos de dos letras).
+    """
+    n = len(values)
+    if n < 2:
+        return 0.0
+    counts = np.bincount(values, minlength=modulus).astype(np.float64)
+    return float(counts @ (counts - 1) / (n * (n - 1)))
+
+
+def digraph_index_of_coincidence(values, modulus):
+    """
+    Calcula el índice de coincidencia de los pares de letras consecutivas. A diferencia
+    del índice simple, depende del orden de las letras.
+    Argumentos:
+    values (np.array): Índices del alfabeto.
+    modulus (int): El tamaño del alfabeto.
+    Regresa:
+    float: El índice de coincidencia de los digramas.
+    """
+    values = np.asarray(values, dtype=np.int64)
+    return index_of_coincidence(values[:-1] * modulus + values[1:], modulus**2)
+
+
+class CiphertextProfile:
+    """
+    Texto cifrado normalizado una sola vez a un arreglo de índices, con sus
+    estadísticas calculadas bajo demanda y guardadas. Todos los ataques aceptan un
+    perfil en lugar del texto, así que varios ataques sobre el mismo mensaje pagan el
+    análisis una sola vez.
+    """
+
+    def __init__(self, text, alphabet=STANDARD, unknown="drop"):
+        """
+        Argumentos:
+        text (str): El texto cifrado.
+        alphabet (Alphabet): El alfabeto del cifrado.
+        unknown (str): Política para caracteres fuera del alfabeto ("drop" o "error").
+        """
+        self.text = text
+        self.alphabet = alphabet
+        self.modulus = alphabet.modulus
+        self.codec = alphabet.codec
+        self.values, _ = self.codec.encode(text, unknown)
+        # Caracteres fuera del alfabeto descartados al construir el perfil
+        self.dropped = len(text) - len(self.values)
+        self._ngrams = {}
+        self._repeats = {}
+        self._prefixes = {}
+
+    @classmethod
+    def from_values(cls, values, alphabet=STANDARD):
+        """
+        Construye un perfil a partir de índices ya normalizados.
+        Argumentos:
+        values (np.array): Índices del alfabeto.
+        alphabet (Alphabet): El alfabeto de los índices.
+        Regresa:
+        CiphertextProfile: El perfil, sin texto original.
+        """
+        profile = cls("", alphabet)
+        profile.text = None
+        profile.values = values
+        return profile
+
+    def __len__(self):
+        return len(self.values)
+
+    def ngram_counts(self, n):
+        """
+        Cuenta los n-gramas del texto.
+        Argumentos:
+        n (int): El tamaño de los n-gramas.
+        Regresa:
+        np.array: El conteo de cada uno de los m^n n-gramas.
+        """
+        if n not in self._ngrams:
+            indices = ngram_indices(self.values, n, self.modulus)
+            self._ngrams[n] = np.bincount(indices, minlength=self.modulus**n)
+        return self._ngrams[n]
+
+    @property
+    def counts(self):
+        return self.ngram_counts(1)
+
+    @property
+    def bigram_counts(self):
+        return self.ngram_counts(2)
+
+    @property
+    def trigram_counts(self):
+        return self.ngram_counts(3)
+
+    def most_common(self, k=None):
+        """
+        Ordena las letras presentes de la más a la menos frecuente; los empates
+        quedan en orden de primera aparición.
+        Argumentos:
+        k (int, optional): Número de letras a regresar; por defecto todas.
+        Regresa:
+        str: Las letras ordenadas.
+        """
+        letters, first = np.unique(self.values, return_index=True)
+        order = np.lexsort((first, -self.counts[letters]))
+        return "".join(self.alphabet[i] for i in letters[order][:k].tolist())
+
+    @cached_property
+    def index_of_coincidence(self):
+        return index_of_coincidence(self.values, self.modulus)
+
+    @cached_property
+    def digraph_index_of_coincidence(self):
+        return digraph_index_of_coincidence(self.values, self.modulus)
+
+    def repeat_distances(self, n=3):
+        """
+        Calcula las distancias entre apariciones consecutivas de cada n-grama repetido,
+        base del examen de Kasiski.
+        Argumentos:
+        n (int): El tamaño de los n-gramas.
+        Regresa:
+        tuple: Arreglo con el n-grama de cada par de apariciones, arreglo con la
+        posición de la primera y arreglo con la distancia a la siguiente.
+        """
+        if n not in self._repeats:
+            ngrams = ngram_indices(self.values, n, self.modulus)
+            # Al ordenar de forma estable, las repeticiones quedan juntas y en orden de aparición
+            order = np.argsort(ngrams, kind="stable")
+            repeated = ngrams[order[1:]] == ngrams[order[:-1]]
+            self._repeats[n] = (
+                ngrams[order[:-1]][repeated],
+                order[:-1][repeated],
+                (order[1:] - order[:-1])[repeated],
+            )
+        return self._repeats[n]
+
+    def repeated_sequences(self, n=3):
+        """
+        Lista las posiciones de cada secuencia de n letras que aparece más de una vez.
+        Argumentos:
+        n (int): El tamaño de las secuencias.
+        Regresa:
+        dict: {secuencia: lista de posiciones}, en orden de aparición.
+        """
+        ngrams, positions, distances = self.repeat_distances(n)
+        sequences = {}
+        for ngram, position, distance in zip(ngrams.tolist(), positions.tolist(), distances.tolist()):
+            found = sequences.setdefault(ngram, [position])
+            found.append(position + distance)
+        return {
+            self.codec.decode(self.values[found[0] : found[0] + n]): found
+            for found in sequences.values()
+        }
+
+    def prefix(self, size):
+        """
+        Regresa el perfil de las primeras letras del texto, reutilizándolo entre llamadas.
+        Argumentos:
+        size (int): El número de letras.
+        Regresa:
+        CiphertextProfile: El perfil del prefijo (el mismo perfil si el texto es más corto).
+        """
+        if size >= len(self.values):
+            return self
+        if size not in self._prefixes:
+            prefix = CiphertextProfile.from_values(self.values[:size], self.alphabet)
+            # Sin la posición de los descartados, el prefijo hereda los del texto completo
+            prefix.dropped = self.dropped
+            self._prefixes[size] = prefix
+        return self._prefixes[size]
+
+
+def as_profile(ciphertext, alphabet=STANDARD, unknown="drop"):
+    """
+    Regresa el perfil de un texto cifrado, construyéndolo solo si se recibió texto.
+    Argumentos:
+    ciphertext (str | CiphertextProfile): El texto cifrado o su perfil.
+    alphabet (Alphabet): El alfabeto que espera el ataque.
+    unknown (str): Política para caracteres fuera del alfabeto. Con "error" también se
+    rechaza un perfil que descartó caracteres al construirse.
+    Regresa:
+    CiphertextProfile: El perfil del texto.
+    """
+    if isinstance(ciphertext, CiphertextProfile):
+        if ciphertext.alphabet != alphabet:
+            raise ValueError("El perfil se construyó con otro alfabeto.")
+        if unknown == "error" and ciphertext.dropped:
+            raise ValueError("El perfil descartó caracteres que no están en el alfabeto.")
+        return ciphertext
+    return CiphertextProfile(ciphertext, alphabet, unknown)
@@ -0,0 +1,78 @@
+"""
+Mide cuántos mensajes afines por segundo evalúa affine_sweep sobre todas las
+claves, comparado con evaluar las 312 claves mensaje por mensaje.
+Uso: python -m cifrados.bench_affine [número_de_mensajes ...]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from .affine import affine_keys, affine_sweep
+from .alphabets import STANDARD
+from .analysis import chi_squared, expected_frequencies
+
+modulus = STANDARD.modulus
+
+
+def random_messages(count, rng, shortest=40, longest=200):
+    """
+    Genera un lote rellenado de mensajes cifrados con claves aleatorias, cuyas
+    letras siguen las frecuencias del español.
+    """
+    expected = expected_frequencies("spanish", modulus)
+    lengths = rng.integers(shortest, longest + 1, size=count)
+    plain = rng.choice(modulus, size=(count, longest), p=expected)
+    a, b = affine_keys()
+    chosen = rng.integers(len(a), size=count)
+    cipher = (a[chosen, None] * plain + b[chosen, None]) % modulus
+    cipher = cipher.astype(np.uint8)
+    cipher[np.arange(longest)[None, :] >= lengths[:, None]] = 255
+    return cipher, np.stack([a[chosen], b[chosen]], axis=1)
+
+
+def loop_sweep(messages):
+    """
+    La forma directa: descifrar cada mensaje con cada clave y calcular su chi-cuadrado.
+    """
+    expected = expected_frequencies("spanish", modulus)
+    a, b = affine_keys()
+    inverse = STANDARD.inverses[a]
+    best = []
+    for message in messages:
+        values = message[message < modulus].astype(np.int64)
+        scores = [
+            chi_squared(np.bincount(inv * (values - shift) % modulus, minlength=modulus), expected)
+            for inv, shift in zip(inverse, b)
+        ]
+        best.append(int(np.argmin(scores)))
+    return np.stack([a[best], b[best]], axis=1)
+
+
+def main(sizes):
+    rng = np.random.default_rng(0)
+    print(f"{'N':>8} {'bucle (msg/s)':>14} {'lote (msg/s)':>14} {'aceleración':>12} {'aciertos':>9}")
+    for size in sizes:
+        messages, keys = random_messages(size, rng)
+
+        # El bucle se mide sobre una muestra y se extrapola
+        sample = messages[: min(size, 500)]
+        start = time.perf_counter()
+        loop_keys = loop_sweep(sample)
+        loop_rate = len(sample) / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        found, _ = affine_sweep(messages, top=3)
+        batch_rate = size / (time.perf_counter() - start)
+
+        assert np.array_equal(found[: len(sample), 0], loop_keys)
+        accuracy = np.mean(np.all(found[:, 0] == keys, axis=1))
+        print(
+            f"{size:>8} {loop_rate:>14.0f} {batch_rate:>14.0f} "
+            f"{batch_rate / loop_rate:>11.1f}x {accuracy:>8.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 100_000])
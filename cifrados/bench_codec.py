@@ -0,0 +1,62 @@
+"""
+Compara la conversión texto <-> índices por comprensión de listas (la forma
+original de los módulos) contra el Codec vectorizado.
+Uso: python -m cifrados.bench_codec [tamaño_en_MB ...]
+"""
+
+import random
+import sys
+import time
+
+from .codec import Codec
+
+alphabet = list("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+alphabetical_decimal = {char: i for i, char in enumerate(alphabet)}
+decimal_alphabetical = {i: char for char, i in alphabetical_decimal.items()}
+
+
+def list_encode(string):
+    return [
+        alphabetical_decimal[char.upper()]
+        for char in string
+        if char.upper() in alphabetical_decimal
+    ]
+
+
+def list_decode(numbers):
+    return "".join([decimal_alphabetical[num] for num in numbers])
+
+
+def best_of(function, argument, repeat=3):
+    """
+    Ejecuta una función varias veces y regresa el menor tiempo y su resultado.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(argument)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(sizes):
+    codec = Codec(alphabet)
+    rng = random.Random(0)
+    characters = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz ,."
+    print(f"{'MB':>6} {'etapa':>8} {'listas (s)':>12} {'codec (s)':>12} {'aceleración':>12}")
+    for size in sizes:
+        text = "".join(rng.choices(characters, k=int(size * 2**20)))
+
+        list_time, list_values = best_of(list_encode, text)
+        codec_time, values = best_of(lambda t: codec.encode(t)[0], text)
+        assert values.tolist() == list_values
+        print(f"{size:>6} {'encode':>8} {list_time:>12.4f} {codec_time:>12.4f} {list_time / codec_time:>11.1f}x")
+
+        list_time, list_text = best_of(list_decode, list_values)
+        codec_time, codec_text = best_of(codec.decode, values)
+        assert codec_text == list_text
+        print(f"{size:>6} {'decode':>8} {list_time:>12.4f} {codec_time:>12.4f} {list_time / codec_time:>11.1f}x")
+
+
+if __name__ == "__main__":
+    main([float(arg) for arg in sys.argv[1:]] or [1, 8])
@@ -0,0 +1,72 @@
+"""
+Mide el costo de arranque en frío de cada cifrado: el tiempo de importar el módulo
+según -X importtime, si la importación cargó NumPy y el tiempo hasta terminar el
+primer cifrado. Cada caso corre en un intérprete nuevo, sin módulos en caché.
+Uso: python -m cifrados.bench_import [repeticiones]
+"""
+
+import json
+import re
+import subprocess
+import sys
+
+# Módulo -> primera llamada que lo usa
+CASES = {
+    "cifrados": "cifrados.STANDARD",
+    "cifrados.displacement": "cifrados.displacement.caesar_encrypt('HOLA')",
+    "cifrados.affine": "cifrados.affine.affine_encrypt('HOLA', 7, 2)",
+    "cifrados.playfair": "cifrados.playfair.cifrar_playfair('HOLA', 'CLAVE')",
+    "cifrados.vigenere": "cifrados.vigenere.vigenere_encrypt('HOLA', 'LEMON')",
+    "cifrados.hill": "cifrados.hill.hill_encrypt('HOLA', cifrados.hill.np.eye(2, dtype=int))",
+}
+
+# Se ejecuta en el intérprete nuevo; NumPy está cargado si ya existe alguno de sus submódulos
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+loaded = time.perf_counter()
+numpy_on_import = any(name.startswith("numpy.") for name in sys.modules)
+{call}
+used = time.perf_counter()
+print(json.dumps([loaded - start, used - start, numpy_on_import]))
+"""
+
+
+def cold_start(module, call):
+    """
+    Importa un módulo en un intérprete nuevo y mide su arranque.
+    Regresa:
+    tuple: (ms según importtime, ms hasta importar, ms hasta el primer uso, NumPy al importar).
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE.format(module=module, call=call)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # Cada línea es "import time: propio | acumulado | módulo"; la del módulo pedido
+    # tiene el acumulado de todo lo que importó
+    cumulative = 0
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|\s*(\S+)$", line)
+        if match and match.group(2) == module:
+            cumulative = int(match.group(1))
+    imported, used, numpy_on_import = json.loads(result.stdout)
+    return cumulative / 1000, imported * 1000, used * 1000, numpy_on_import
+
+
+def main(repeat):
+    print(f"{'módulo':<24} {'importtime (ms)':>16} {'importar (ms)':>14} {'primer uso (ms)':>16} {'NumPy':>6}")
+    for module, call in CASES.items():
+        # Se reporta la mejor de varias ejecuciones para quitar ruido del sistema
+        runs = [cold_start(module, call) for _ in range(repeat)]
+        cumulative = min(run[0] for run in runs)
+        imported = min(run[1] for run in runs)
+        used = min(run[2] for run in runs)
+        numpy_on_import = "sí" if runs[0][3] else "no"
+        print(f"{module:<24} {cumulative:>16.1f} {imported:>14.1f} {used:>16.1f} {numpy_on_import:>6}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 3)
@@ -0,0 +1,61 @@
+"""
+Mide cómo escala el cifrado en paralelo con el número de hilos. En el CPython sin
+GIL (3.13t) la aceleración debería acercarse al número de núcleos.
+Uso: python -m cifrados.bench_parallel [tamaño_en_MB] [hilos ...]
+"""
+
+import os
+import random
+import sys
+import sysconfig
+import time
+
+import numpy as np
+
+from .parallel import parallel_affine, parallel_hill, parallel_shift, parallel_vigenere
+
+HILL_KEY = np.array([[6, 24, 1], [13, 16, 10], [20, 17, 15]])
+
+CASES = {
+    "shift": lambda text, workers: parallel_shift(text, 3, workers=workers),
+    "affine": lambda text, workers: parallel_affine(text, 7, 2, workers=workers),
+    "vigenere": lambda text, workers: parallel_vigenere(text, "LEMON", workers=workers),
+    "hill": lambda text, workers: parallel_hill(text, HILL_KEY, workers=workers),
+}
+
+
+def best_of(function, repeat=3):
+    """
+    Ejecuta una función varias veces y regresa el menor tiempo.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(size, thread_counts):
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'activo' if gil else 'desactivado'}, "
+          f"free-threading {'sí' if sysconfig.get_config_var('Py_GIL_DISABLED') else 'no'}, "
+          f"{os.cpu_count()} núcleos")
+    rng = random.Random(0)
+    text = "".join(rng.choices("ABCDEFGHIJKLMNOPQRSTUVWXYZ", k=int(size * 2**20)))
+    print(f"{'cifrado':>9} {'hilos':>6} {'MB/s':>9} {'aceleración':>12}")
+    for name, function in CASES.items():
+        expected = function(text, 1)
+        base = None
+        for workers in thread_counts:
+            assert function(text, workers) == expected
+            elapsed = best_of(lambda: function(text, workers))
+            base = base or elapsed
+            print(f"{name:>9} {workers:>6} {size / elapsed:>9.1f} {base / elapsed:>11.2f}x")
+
+
+if __name__ == "__main__":
+    size = float(sys.argv[1]) if len(sys.argv) > 1 else 32
+    cores = os.cpu_count() or 1
+    default = sorted({1, 2, 4, 8, cores} & set(range(1, cores + 1))) or [1]
+    main(size, [int(arg) for arg in sys.argv[2:]] or default)
@@ -0,0 +1,119 @@
+"""
+Generador de carga para el servicio de cifrado. Levanta el servicio en otro proceso
+(o usa uno ya en marcha), abre varias conexiones que mantienen muchas solicitudes en
+vuelo y mide solicitudes por segundo y percentiles de latencia del lado del cliente;
+al final muestra las estadísticas del servidor (microlotes, cola, latencias).
+Uso: python -m cifrados.bench_service [solicitudes] [conexiones] [puerto_existente]
+"""
+
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import time
+
+from .service import HOST, MAX_LINE
+
+# Pocas claves repetidas, como en el servicio real, para que se formen microlotes
+WORKLOAD = [
+    ("shift", 3),
+    ("affine", [7, 2]),
+    ("affine", [5, 8]),
+    ("vigenere", "LEMON"),
+    ("hill", [[3, 3], [2, 5]]),
+    ("playfair", "KEYWORD"),
+]
+
+# Solicitudes sin respuesta que mantiene cada conexión
+WINDOW = 64
+
+
+def make_requests(count, rng):
+    """
+    Genera solicitudes de cifrado y descifrado con textos de 20 a 200 letras.
+    """
+    requests = []
+    for i in range(count):
+        cipher, key = rng.choice(WORKLOAD)
+        text = "".join(rng.choices("ABCDEFGHIJKLMNOPQRSTUVWXYZ", k=rng.randint(20, 200)))
+        if cipher == "hill":
+            text = text[: len(text) // 2 * 2]
+        operation = rng.choice(("encrypt", "decrypt"))
+        requests.append({"id": i, "cipher": cipher, "operation": operation, "key": key, "text": text})
+    return requests
+
+
+async def connection(port, requests, latencies, errors):
+    """
+    Envía las solicitudes por una conexión con a lo más WINDOW en vuelo.
+    """
+    reader, writer = await asyncio.open_connection(HOST, port, limit=MAX_LINE)
+    slots = asyncio.Semaphore(WINDOW)
+    sent = {}
+
+    async def receive():
+        for _ in requests:
+            response = json.loads(await reader.readline())
+            latencies.append(time.perf_counter() - sent.pop(response["id"]))
+            if "error" in response:
+                errors.append(response["error"])
+            slots.release()
+
+    receiver = asyncio.create_task(receive())
+    for request in requests:
+        await slots.acquire()
+        sent[request["id"]] = time.perf_counter()
+        writer.write((json.dumps(request) + "\n").encode())
+        await writer.drain()
+    await receiver
+    writer.close()
+    await writer.wait_closed()
+
+
+async def server_stats(port):
+    reader, writer = await asyncio.open_connection(HOST, port, limit=MAX_LINE)
+    writer.write(b'{"id": "stats", "operation": "stats"}\n')
+    await writer.drain()
+    response = json.loads(await reader.readline())
+    writer.close()
+    await writer.wait_closed()
+    return response["result"]
+
+
+async def run(port, count, connections):
+    rng = random.Random(0)
+    requests = make_requests(count, rng)
+    latencies, errors = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        connection(port, requests[i::connections], latencies, errors) for i in range(connections)
+    ))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    print(f"{count} solicitudes en {elapsed:.2f} s: {count / elapsed:.0f} solicitudes/s, {len(errors)} errores")
+    for q in (50, 90, 99):
+        print(f"  p{q} cliente: {1000 * latencies[min(len(latencies) - 1, len(latencies) * q // 100)]:.2f} ms")
+    print(json.dumps(await server_stats(port), indent=2))
+
+
+def main(count, connections, port=None):
+    server = None
+    if port is None:
+        # Puerto 0: el sistema elige uno libre y el servicio lo imprime al arrancar
+        server = subprocess.Popen(
+            [sys.executable, "-m", "cifrados.service", "0"], stdout=subprocess.PIPE, text=True
+        )
+        port = int(server.stdout.readline().rsplit(":", 1)[1])
+    try:
+        asyncio.run(run(port, count, connections))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    connections = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    main(count, connections, int(sys.argv[3]) if len(sys.argv) > 3 else None)
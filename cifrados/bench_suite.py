@@ -0,0 +1,269 @@
+"""
+Suite de rendimiento de todos los cifrados y ataques. Mide caracteres por segundo,
+latencia por llamada y memoria pico adicional (tracemalloc) de cada caso en cada
+tamaño de entrada, guarda los resultados en JSON y, si se da una ejecución anterior,
+marca los casos cuyo rendimiento cayó más que el umbral (y termina con código 1).
+Uso: python -m cifrados.bench_suite [--sizes 100B,10KB,1MB,100MB] [--only texto]
+     [--output resultados.json] [--baseline anterior.json] [--threshold 0.10]
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from . import affine, hill, multiplication, playfair, vigenere
+from .alphabets import STANDARD
+from .analysis import expected_frequencies
+from .modular import is_invertible_mod
+
+# Tamaños por defecto; los casos de 100MB tardan minutos y se piden con --sizes
+SIZES = "100B,10KB,1MB"
+
+# Tamaños de la matriz Hill medidos
+HILL_SIZES = range(2, 17)
+
+# Tiempo mínimo medido por caso y tamaño, y llamadas máximas
+MIN_TIME = 0.2
+MAX_CALLS = 1000
+
+# Textos aleatorios probados hasta que el crib recupere la clave Hill
+KNOWN_PLAINTEXT_TRIES = 20
+
+# Letras distintas generadas por texto aleatorio
+SAMPLE_SIZE = 1 << 20
+
+UNITS = {"B": 1, "KB": 10**3, "MB": 10**6, "GB": 10**9}
+
+
+def parse_size(text):
+    """
+    Convierte un tamaño como "100B", "10KB" o "1MB" a caracteres.
+    """
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)\s*([KMG]?B)", text.strip().upper())
+    if match is None:
+        raise ValueError(f"Tamaño no válido: {text!r}.")
+    return int(float(match.group(1)) * UNITS[match.group(2)])
+
+
+def random_text(size, rng, language="english"):
+    """
+    Genera un texto de letras mayúsculas con las frecuencias del idioma. Los textos de
+    más de SAMPLE_SIZE letras repiten la misma muestra, para no reservar ocho bytes por
+    letra al generar 100 MB.
+    """
+    probabilities = expected_frequencies(language, STANDARD.modulus)
+    codes = rng.choice(STANDARD.modulus, size=min(size, SAMPLE_SIZE), p=probabilities).astype(np.uint8)
+    return np.resize(codes + ord("A"), size).tobytes().decode("ascii")
+
+
+def random_hill_key(size, rng):
+    """
+    Genera una matriz clave invertible módulo 26.
+    """
+    while True:
+        matrix = rng.integers(0, STANDARD.modulus, size=(size, size))
+        if is_invertible_mod(matrix, STANDARD.modulus):
+            return matrix
+
+
+def cipher_cases(rng):
+    """
+    Casos de cifrado y descifrado: (nombre, tamaño máximo, preparación). La preparación
+    recibe el tamaño y regresa la función sin argumentos que se mide.
+    """
+    substitutions = {
+        "shift": (multiplication.displacement_encrypt, multiplication.displacement_decrypt, (3,)),
+        "multiplicative": (multiplication.multiplicative_encrypt, multiplication.multiplicative_decrypt, (7,)),
+        "affine": (affine.affine_encrypt, affine.affine_decrypt, (7, 2)),
+        "vigenere": (vigenere.vigenere_encrypt, vigenere.vigenere_decrypt, ("LEMON",)),
+    }
+    for name, (encrypt, decrypt, key) in substitutions.items():
+        yield f"{name}/encrypt", None, lambda size, f=encrypt, k=key: partial_text(f, random_text(size, rng), k)
+        yield f"{name}/decrypt", None, lambda size, f=decrypt, k=key: partial_text(f, random_text(size, rng), k)
+
+    for n in HILL_SIZES:
+        matrix = random_hill_key(n, rng)
+        yield f"hill{n}/encrypt", None, lambda size, m=matrix: partial_text(hill.hill_encrypt, random_text(size, rng), (m,))
+        yield f"hill{n}/decrypt", None, lambda size, m=matrix: partial_text(
+            hill.hill_decrypt, hill.hill_encrypt(random_text(size, rng), m), (m,)
+        )
+
+    # La preparación del texto de Playfair recorre las letras en Python
+    yield "playfair/encrypt", 10**7, lambda size: partial_text(
+        playfair.cifrar_playfair, random_text(size, rng), ("KEYWORD",)
+    )
+    yield "playfair/decrypt", 10**7, lambda size: partial_text(
+        playfair.descifrar_playfair, playfair.cifrar_playfair(random_text(size, rng), "KEYWORD"), ("KEYWORD",)
+    )
+
+
+def attack_cases(rng):
+    """
+    Casos de los ataques, medidos sobre textos cifrados del tamaño pedido.
+    """
+    spanish = lambda size: random_text(size, rng, "spanish")
+    yield "crack/guess_displacement_cipher", 10**7, lambda size: partial_text(
+        multiplication.guess_displacement_cipher, multiplication.displacement_encrypt(spanish(size), 3), ()
+    )
+    yield "crack/guess_multiplicative_cipher", 10**7, lambda size: partial_text(
+        multiplication.guess_multiplicative_cipher, multiplication.multiplicative_encrypt(spanish(size), 7), ()
+    )
+    yield "crack/affine_solver", 10**7, lambda size: partial_text(
+        affine.affine_solver, affine.affine_encrypt(spanish(size), 7, 2), (affine.spanish_common,)
+    )
+    # affine_sweep evalúa lotes de mensajes de 100 letras
+    yield "crack/affine_sweep", 10**7, lambda size: partial_text(
+        affine.affine_sweep,
+        [affine.affine_encrypt(spanish(100), 7, 2) for _ in range(max(1, size // 100))],
+        (),
+    )
+    yield "crack/crack_vigenere", 10**6, lambda size: partial_text(
+        vigenere.crack_vigenere, vigenere.vigenere_encrypt(random_text(size, rng), "LEMON"), ()
+    )
+    for n in (2, 3):
+        matrix = random_hill_key(n, rng)
+
+        def known_plaintext(size, m=matrix, n=n):
+            # Un crib cuyos bloques no determinan la clave mide solo un regreso temprano:
+            # antes de medir se comprueba que el ataque recupera la clave
+            for _ in range(KNOWN_PLAINTEXT_TRIES):
+                plain = random_text(max(size, 4 * n * n), rng)
+                crib = plain[: 2 * n * n]
+                encrypted = hill.hill_encrypt(plain, m)
+                found = hill.known_plaintext_attack(encrypted, crib, n, top=1)
+                if found and np.array_equal(found[0][0], m % STANDARD.modulus):
+                    return partial_text(hill.known_plaintext_attack, encrypted, (crib, n))
+            raise RuntimeError(f"Ningún crib recuperó la clave Hill {n}x{n}.")
+
+        yield f"crack/hill{n}_known_plaintext_attack", 10**6, known_plaintext
+    yield "crack/hill2_ciphertext_only_attack", 10**6, lambda size: lambda c=hill.hill_encrypt(
+        random_text(max(size, 100), rng), random_hill_key(2, rng)
+    ): hill.ciphertext_only_attack(c, 2, workers=1)
+
+
+def partial_text(function, text, arguments):
+    """
+    Regresa la llamada a medir con su entrada ya preparada.
+    """
+    return lambda: function(text, *arguments)
+
+
+def measure(function, size, min_time=MIN_TIME, max_calls=MAX_CALLS):
+    """
+    Llama a la función hasta acumular min_time segundos y luego una vez más con
+    tracemalloc para la memoria pico.
+    Regresa:
+    dict: Tamaño, llamadas, latencia mediana y mínima, caracteres por segundo y
+    memoria pico adicional en bytes.
+    """
+    times = []
+    while sum(times) < min_time and len(times) < max_calls:
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    latency = statistics.median(times)
+    return {
+        "size": size,
+        "calls": len(times),
+        "latency_s": latency,
+        "best_s": min(times),
+        "chars_per_s": size / latency,
+        "peak_bytes": peak,
+    }
+
+
+def run_suite(sizes, only=None, seed=0):
+    """
+    Ejecuta todos los casos en todos los tamaños.
+    Regresa:
+    dict: Resultados por "caso@tamaño".
+    """
+    rng = np.random.default_rng(seed)
+    results = {}
+    print(f"{'caso':<40} {'tamaño':>10} {'caracteres/s':>14} {'latencia':>12} {'memoria':>10}")
+    for name, max_size, prepare in [*cipher_cases(rng), *attack_cases(rng)]:
+        if only and only not in name:
+            continue
+        for size in sizes:
+            if max_size is not None and size > max_size:
+                continue
+            function = prepare(size)
+            result = measure(function, size)
+            results[f"{name}@{size}"] = result
+            print(
+                f"{name:<40} {size:>10} {result['chars_per_s']:>14.3g} "
+                f"{result['latency_s'] * 1000:>10.3f}ms {result['peak_bytes'] / 2**20:>8.1f}MB"
+            )
+            del function
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Compara con una ejecución anterior.
+    Regresa:
+    list: Tuplas (caso, proporción del rendimiento anterior) de los casos cuya mejor
+    llamada es más lenta que el umbral.
+    """
+    regressions = []
+    for case, result in results.items():
+        previous = baseline.get(case)
+        if previous is None:
+            continue
+        # La mejor llamada varía menos entre ejecuciones que la mediana
+        ratio = previous["best_s"] / result["best_s"]
+        if ratio < 1 - threshold:
+            regressions.append((case, ratio))
+    return regressions
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog="python -m cifrados.bench_suite", description=__doc__.split("\n")[1])
+    parser.add_argument("--sizes", default=SIZES, help="tamaños separados por comas (100B, 10KB, 1MB...)")
+    parser.add_argument("--only", help="solo los casos cuyo nombre contiene este texto")
+    parser.add_argument("--output", default="bench_results.json", help="archivo JSON de resultados")
+    parser.add_argument("--baseline", help="resultados anteriores con los que comparar")
+    parser.add_argument("--threshold", type=float, default=0.10, help="caída relativa que se marca")
+    args = parser.parse_args(argv)
+
+    sizes = [parse_size(size) for size in args.sizes.split(",")]
+    results = run_suite(sizes, args.only)
+    report = {
+        "meta": {
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    print(f"Resultados guardados en {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for case, ratio in regressions:
+            print(f"REGRESIÓN {case}: {ratio:.0%} del rendimiento anterior")
+        if regressions:
+            sys.exit(1)
+        print(f"Sin regresiones mayores a {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,141 @@
+from .lazy import numpy as np
+
+# Politicas para los caracteres que no pertenecen al alfabeto
+DROP = "drop"  # Se descartan del resultado
+KEEP = "keep"  # Se conservan sin cifrar en su posición original
+ERROR = "error"  # Se lanza un ValueError
+
+UNKNOWN_POLICIES = (DROP, KEEP, ERROR)
+
+
+def check_symbols(alphabet):
+    """
+    Verifica que un alfabeto sea válido para construir un Codec.
+    Argumentos:
+    alphabet (str | list): Los caracteres del alfabeto, en orden.
+    Regresa:
+    list: Los caracteres del alfabeto.
+    """
+    symbols = list(alphabet)
+    if any(len(char) != 1 for char in symbols):
+        raise ValueError("El alfabeto solo puede contener caracteres individuales.")
+    if len(set(symbols)) != len(symbols):
+        raise ValueError("El alfabeto contiene caracteres repetidos.")
+    if not 0 < len(symbols) < 2**16 - 1:
+        raise ValueError("El tamaño del alfabeto no es válido.")
+    return symbols
+
+
+class Codec:
+    """
+    Convierte texto a arreglos de NumPy con los índices del alfabeto y viceversa.
+    Cada conversión es una sola indexación sobre una tabla precalculada, en lugar
+    de una búsqueda en diccionario por carácter.
+    """
+
+    def __init__(self, alphabet):
+        """
+        Construye las tablas de conversión para un alfabeto.
+        Argumentos:
+        alphabet (str | list): Los caracteres del alfabeto, en orden.
+        """
+        symbols = check_symbols(alphabet)
+
+        self.alphabet = symbols
+        self.size = len(symbols)
+        # Se usa uint8 siempre que el alfabeto lo permita
+        self.dtype = np.uint8 if self.size < 255 else np.uint16
+        self.sentinel = np.iinfo(self.dtype).max
+
+        # Las minúsculas se pliegan a su mayúscula si no están en el alfabeto
+        positions = {char: i for i, char in enumerate(symbols)}
+        for i, char in enumerate(symbols):
+            lower = char.lower()
+            if len(lower) == 1 and lower not in positions:
+                positions[lower] = i
+
+        # Tabla punto de código -> índice; la última posición siempre es desconocida
+        table_size = max(256, max(map(ord, positions)) + 2)
+        self.encode_table = np.full(table_size, self.sentinel, dtype=self.dtype)
+        self.encode_table[[ord(char) for char in positions]] = list(positions.values())
+
+        # Tabla índice -> punto de código
+        codepoints = [ord(char) for char in symbols]
+        self.wide = max(codepoints) > 255
+        self.decode_table = np.array(
+            codepoints, dtype=np.uint32 if self.wide else np.uint8
+        )
+
+    def codepoints(self, text):
+        """
+        Convierte un texto en el arreglo de sus puntos de código.
+        Argumentos:
+        text (str): El texto a convertir.
+        Regresa:
+        np.array: Arreglo uint8 si el texto es ASCII, uint32 en otro caso.
+        """
+        if text.isascii():
+            return np.frombuffer(text.encode("ascii"), dtype=np.uint8)
+        return np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+
+    def encode(self, text, unknown=DROP):
+        """
+        Convierte un texto a los índices del alfabeto con una sola indexación.
+        Argumentos:
+        text (str): El texto a convertir.
+        unknown (str): Política para caracteres fuera del alfabeto: "drop", "keep" o "error".
+        Regresa:
+        tuple: El arreglo de índices de los caracteres válidos y la disposición
+        necesaria para reconstruir el texto con la política "keep" (None en otro caso).
+        """
+        if unknown not in UNKNOWN_POLICIES:
+            raise ValueError(f"Política desconocida: {unknown!r}.")
+        codes = self.codepoints(text)
+        if codes.dtype == np.uint8:
+            values = self.encode_table[codes]
+        else:
+            values = self.encode_table[np.minimum(codes, len(self.encode_table) - 1)]
+        valid = values != self.sentinel
+        if valid.all():
+            return values, None
+        if unknown == ERROR:
+            char = chr(codes[np.argmin(valid)])
+            raise ValueError(f"Carácter '{char}' no está en el alfabeto.")
+        layout = (codes, valid) if unknown == KEEP else None
+        return values[valid], layout
+
+    def decode(self, values, layout=None):
+        """
+        Convierte un arreglo de índices del alfabeto de nuevo a texto.
+        Argumentos:
+        values (np.array): Los índices a convertir.
+        layout (tuple, optional): La disposición devuelta por encode con la política "keep".
+        Regresa:
+        str: El texto correspondiente.
+        """
+        codepoints = self.decode_table[values]
+        if layout is not None:
+            codes, valid = layout
+            wide = self.wide or codes.dtype != np.uint8
+            merged = codes.astype(np.uint32 if wide else np.uint8)
+            merged[valid] = codepoints
+            codepoints = merged
+        if codepoints.dtype == np.uint8:
+            return codepoints.tobytes().decode("latin-1")
+        return codepoints.astype(np.uint32).tobytes().decode("utf-32-le")
+
+
+def affine_map(values, a, b, modulus):
+    """
+    Aplica la transformación (a * x + b) mod m a un arreglo de índices,
+    usando una tabla de m entradas para evitar desbordamientos.
+    Argumentos:
+    values (np.array): Los índices a transformar.
+    a (int): El multiplicador.
+    b (int): El desplazamiento.
+    modulus (int): El tamaño del alfabeto.
+    Regresa:
+    np.array: Los índices transformados, con el mismo tipo que la entrada.
+    """
+    table = (np.arange(modulus, dtype=np.int64) * (a % modulus) + b) % modulus
+    return table.astype(values.dtype)[values]
@@ -1,147 +1,90 @@
-# Se hace un listado del afabetico clasico de 26 letras
-alphabet = list("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+from .alphabets import STANDARD, Alphabet
+from .codec import affine_map
+from .profiling import ARITHMETIC, stage
 
-# Diccionarios para facil transformación del alfabeto a su equivalente númerico
-alphabetical_decimal = {char: i for i, char in enumerate(alphabet)}
-decimal_alphabetical = {i: char for char, i in alphabetical_decimal.items()}
 
-# Se calcula el modulo para las operaciones de cifrado
-module = len(alphabet)
-
-
-def set_custom_alphabet(new_alphabet):
+def from_alphabetical_to_decimal(string, unknown="drop", alphabet=STANDARD):
     """
-    Actualiza los diccionarios y módulo según un nuevo alfabeto personalizado.
+    Convierte una cadena de texto al valor numérico correspondiente del alfabeto.
+    Cada letra se convierte en su posición en el alfabeto (A=0, B=1, ..., Z=25).
 
     Argumentos:
-    new_alphabet (list): Lista de caracteres que forman el nuevo alfabeto.
-    """
-    global alphabet, alphabetical_decimal, decimal_alphabetical, module
-
-    alphabet = new_alphabet
-    alphabetical_decimal = {char: i for i, char in enumerate(alphabet)}
-    decimal_alphabetical = {i: char for i, char in enumerate(alphabet)}
-    module = len(alphabet)
-
+    string (str): La cadena de texto a convertir.
+    unknown (str): Política para caracteres fuera del alfabeto ("drop" o "error").
+    alphabet (Alphabet): El alfabeto del cifrado.
 
-def generate_alphabet(filename, separator=None):
+    Retorna:
+    np.array: Arreglo de números que representan las posiciones de las letras en el alfabeto.
     """
-    Extrae los caracteres de un archivo de texto y los devuelve como una lista,
-    en orden para hacer un alfabeto extendido. Permite definir un separador del contenido.
+    return alphabet.encode(string, unknown)[0]
 
-    Parametros:
-    filename (str): El nombre del archivo de texto desde donde se extraerán los caracteres.
-    separator (str, optional): El separador que se usa en el archivo, por defecto es None si no hay separador.
 
-    Regresa:
-    list: Una lista con los caracteres válidos que pueden usarse como alfabeto.
+def from_decimal_to_alphabetical(numbers, alphabet=STANDARD):
     """
-    try:
-        # Abrir el archivo y leer su contenido
-        with open(filename, "r", encoding="utf-8") as file:
-            content = file.read()  # Se almacena el contenido del archivo
-
-        # Si hay un separador, separar el contenido
-        if separator:
-            content = content.split(separator)
-        # Si no hay separador, tomar todos los caracteres
-        else:
-            content = list(content)
-
-        seen = set()  # Almacena los elementos ya vistos
-        characters = []  # Almacena los caracteres
-        # Se lee el archivo y se almacenan los caracteres en orden
-        for char in content:
-            if char not in seen:
-                characters.append(char)
-                seen.add(char)
-        # Regresa los caracteres para el diccionario extendido
-        return characters
-    # Excepcion por si no se encuentra el archivo
-    except FileNotFoundError:
-        print(f"El archivo {filename} no se encontró.")
-        return []
-
-
-def from_alphabetical_to_decimal(string):
-    """
-    Convierte una cadena de texto al valor numérico correspondiente del alfabeto.
-    Cada letra se convierte en su posición en el alfabeto (A=0, B=1, ..., Z=25).
+    Convierte un arreglo de valores numéricos a sus correspondientes letras del alfabeto.
+    Cada número se mapea a la letra correspondiente en el alfabeto (0=A, 1=B, ..., 25=Z).
 
     Argumentos:
-    string (str): La cadena de texto a convertir.
+    numbers (np.array): Arreglo de números que representan las posiciones de las letras en el alfabeto.
+    alphabet (Alphabet): El alfabeto del cifrado.
 
     Retorna:
-    list: Lista de números que representan las posiciones de las letras en el alfabeto.
+    str: Texto con las letras que corresponden a los valores numéricos proporcionados.
     """
-    return [
-        alphabetical_decimal[char.upper()]
-        for char in string
-        if char.upper() in alphabetical_decimal
-    ]
+    return alphabet.decode(numbers)
 
 
-def from_decimal_to_alphabetical(numbers):
+def shift_values(values, displacement, alphabet=STANDARD):
     """
-    Convierte una lista de valores numéricos a sus correspondientes letras del alfabeto.
-    Cada número en la lista se mapea a la letra correspondiente en el alfabeto (0=A, 1=B, ..., 25=Z).
+    Aplica un desplazamiento a un arreglo de índices del alfabeto.
 
     Argumentos:
-    numbers (list): Lista de números que representan las posiciones de las letras en el alfabeto.
+    values (np.array): Índices del alfabeto.
+    displacement (int): Desplazamiento a aplicar (negativo para descifrar).
+    alphabet (Alphabet): El alfabeto del cifrado.
 
     Retorna:
-    list: Lista de letras que corresponden a los valores numéricos proporcionados
+    np.array: Índices desplazados.
     """
-    return [decimal_alphabetical[num] for num in numbers]
+    return affine_map(values, 1, displacement, alphabet.modulus)
 
 
-def caesar_encrypt(string):
+def caesar_encrypt(string, unknown="drop", alphabet=STANDARD):
     """
     Cifra una cadena de texto usando el cifrado César con un desplazamiento de 3 posiciones.
 
     Argumentos:
     string (str): Texto a cifrar.
+    unknown (str): Política para caracteres fuera del alfabeto ("drop", "keep" o "error").
+    alphabet (Alphabet): El alfabeto del cifrado.
 
     Retorna:
     str: Texto cifrado.
     """
-    # Convierte el texto a sus valores numéricos correspondientes
-    numerical_value = from_alphabetical_to_decimal(string)
-    cipher_values = []  # Lista para almacenar los valores cifrados
+    # Desplazamiento de 3 posiciones compilado como tabla de traducción
+    with stage("caesar_encrypt", ARITHMETIC, len(string)):
+        return alphabet.substitution(1, 3).encrypt(string, unknown)
 
-    # Itera sobre los valores numéricos y aplica el desplazamiento
-    for i in numerical_value:
-        cipher_values.append((i + 3) % module)  # Desplazamiento de 3 posiciones
 
-    # Convierte los valores numéricos cifrados de nuevo a letras y devuelve el texto cifrado
-    return "".join(from_decimal_to_alphabetical(cipher_values))
-
-
-def caesar_decrypt(string):
+def caesar_decrypt(string, unknown="drop", alphabet=STANDARD):
     """
     Descifra una cadena de texto utilizando el cifrado César con un desplazamiento de 3 posiciones.
 
     Paramteros:
     string (str): Texto a descifrar.
+    unknown (str): Política para caracteres fuera del alfabeto ("drop", "keep" o "error").
+    alphabet (Alphabet): El alfabeto del cifrado.
 
     Retorna:
     str: Texto descifrado.
     """
-    # Convierte el texto cifrado a sus valores numéricos correspondientes
-    numerical_value = from_alphabetical_to_decimal(string)
-    decrypted_values = []  # Lista para almacenar los valores numéricos descifrados
-
-    # Itera sobre los valores numéricos y aplica el desplazamiento inverso
-    for i in numerical_value:
-        decrypted_values.append(
-            (i - 3) % module
-        )  # Desplazamiento inverso de 3 posiciones
-
-    # Convierte los valores numéricos descifrados de nuevo a letras y devuelve el texto descifrado
-    return "".join(from_decimal_to_alphabetical(decrypted_values))
+    # Desplazamiento inverso de 3 posiciones usando la tabla compilada
+    with stage("caesar_decrypt", ARITHMETIC, len(string)):
+        return alphabet.substitution(1, 3).decrypt(string, unknown)
 
 
 if __name__ == "__main__":
+    alfabeto = STANDARD
     while True:
         print("\n=== Cifrado Cesar ===")
         print("1. Cifrar texto")
@@ -153,24 +96,25 @@ if __name__ == "__main__":
 
         if opcion == "1":
             texto = input("Ingresa el texto a cifrar: ")
-            cifrado = caesar_encrypt(texto)
+            cifrado = caesar_encrypt(texto, alphabet=alfabeto)
             print(f"Texto cifrado: {cifrado}")
 
         elif opcion == "2":
             texto = input("Ingresa el texto a descifrar: ")
-            descifrado = caesar_decrypt(texto)
+            descifrado = caesar_decrypt(texto, alphabet=alfabeto)
             print(f"Texto descifrado: {descifrado}")
 
         elif opcion == "3":
             file = input("Nombre del archivo de texto: ")
             sep = input("Separador (presiona Enter si no hay): ")
             sep = sep if sep else None
-            new_alphabet = generate_alphabet(file, separator=sep)
-            if new_alphabet:
-                set_custom_alphabet(new_alphabet)
+            try:
+                alfabeto = Alphabet.from_file(file, separator=sep)
                 print("Alfabeto generado correctamente.")
-            else:
-                print("No se pudo cargar el alfabeto.")
+            except FileNotFoundError:
+                print(f"El archivo {file} no se encontró.")
+            except ValueError as error:
+                print(f"No se pudo cargar el alfabeto: {error}")
 
         elif opcion == "4":
             print("Saliendo del programa...")
@@ -1,159 +1,429 @@
-import numpy as np
+import os
+from itertools import permutations
 
-# Especificacion del alfabeto
-alphabet = list("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
-# alphabet = generate_alphabet("alfabeto.txt", separator="")
+from .alphabets import STANDARD
+from .analysis import (
+    as_profile,
+    chi_squared,
+    digraph_index_of_coincidence,
+    expected_frequencies,
+    index_of_coincidence,
+)
+from .lazy import numpy as np
+from .modular import (
+    SingularMatrixError,
+    cached_inverse_mod,
+    factorize,
+    independent_rows,
+    matrix_inverse_mod,
+    matrix_product_mod,
+)
+from .profiling import ARITHMETIC, MAP, NORMALIZE, OUTPUT, stage
 
-# Diccionarios para facil transformación del alfabeto a su equivalente númerico
-alphabetical_decimal = {char: i for i, char in enumerate(alphabet)}
-decimal_alphabetical = {i: char for char, i in alphabetical_decimal.items()}
+# Elementos por trozo al multiplicar bloques; acota la memoria intermedia
+CHUNK_ELEMENTS = 1 << 20
 
-modulus = len(alphabet)
+# Letras descifradas por tarea en el barrido de columnas del ataque sin texto conocido
+SWEEP_ELEMENTS = 1 << 22
 
 
-def generate_alphabet(filename, separator=None):
+def modular_product(blocks, matrix, modulus):
     """
-    Extrae los caracteres de un archivo de texto y los devuelve como una lista,
-    en orden para hacer un alfabeto extendido. Permite definir un separador del contenido.
+    Multiplica una matriz de bloques por la matriz clave módulo el tamaño del alfabeto.
     Argumentos:
-    filename (str): El nombre del archivo de texto desde donde se extraerán los caracteres.
-    separator (str, optional): El separador que se usa en el archivo, por defecto es None si no hay separador.
+    blocks (np.array): Matriz (bloques x n) de índices.
+    matrix (np.array): La matriz clave n x n.
+    modulus (int): El tamaño del alfabeto.
     Regresa:
-    list: Una lista con los caracteres válidos que pueden usarse como alfabeto.
+    np.array: Matriz (bloques x n) int64 con valores en [0, m).
     """
-    try:
-        # Abrir el archivo y leer su contenido
-        with open(filename, "r", encoding="utf-8") as file:
-            content = file.read()  # Se almacena el contenido del archivo
+    return matrix_product_mod(blocks, matrix, modulus)
+
+
+def hill_transform(values, matrix, modulus, chunk_elements=CHUNK_ELEMENTS):
+    """
+    Aplica la matriz a todo el mensaje de una vez: los índices se ven como una matriz
+    (bloques x n) y se multiplican por trozos de tamaño acotado.
+    Argumentos:
+    values (np.array): Índices del mensaje; su longitud debe ser múltiplo de n.
+    matrix (np.array): La matriz de transformación n x n.
+    modulus (int): El tamaño del alfabeto.
+    chunk_elements (int): Número aproximado de índices por trozo.
+    Regresa:
+    np.array: Los índices transformados, con el mismo tipo que la entrada.
+    """
+    size = matrix.shape[0]
+    blocks = values.reshape(-1, size)
+    result = np.empty_like(blocks)
+    rows = max(1, chunk_elements // size)
+    for start in range(0, blocks.shape[0], rows):
+        chunk = blocks[start : start + rows]
+        result[start : start + rows] = modular_product(chunk, matrix, modulus)
+    return result.reshape(-1)
 
-        # Si hay un separador, separar el contenido
-        if separator:
-            content = content.split(separator)
-        # Si no hay separador, tomar todos los caracteres
-        else:
-            content = list(content)
 
-        seen = set()  # Almacena los elementos ya vistos
-        characters = []  # Almacena los caracteres
-        # Se lee el archivo y se almacenan los caracteres en orden
-        for char in content:
-            if char not in seen:
-                characters.append(char)
-                seen.add(char)
-        # Regresa los caracteres para el diccionario extendido
-        return characters
-    # Excepcion por si no se encuentra el archivo
-    except FileNotFoundError:
-        print(f"El archivo {filename} no se encontró.")
-        return []
+def pad_values(values, size, alphabet=STANDARD, pad="X"):
+    """
+    Completa los índices de un mensaje con la letra de relleno hasta un múltiplo del
+    tamaño de la matriz.
+    Argumentos:
+    values (np.array): Índices del mensaje.
+    size (int): El tamaño n de la matriz.
+    alphabet (Alphabet): El alfabeto del cifrado.
+    pad (str): La letra de relleno; solo se busca en el alfabeto si hace falta rellenar.
+    Regresa:
+    np.array: Los índices con longitud múltiplo de n (el mismo arreglo si ya lo era).
+    """
+    missing = -len(values) % size
+    if missing == 0:
+        return values
+    if pad not in alphabet.positions:
+        raise ValueError(f"La letra de relleno {pad!r} no está en el alfabeto.")
+    padded = np.full(len(values) + missing, alphabet.positions[pad], dtype=values.dtype)
+    padded[: len(values)] = values
+    return padded
 
 
-def hill_encrypt(plain_message, matrix):
+def hill_encrypt(plain_message, matrix, alphabet=STANDARD, pad="X"):
     """
     Cifra un mensaje usando el cifrado Hill. Si el mensaje no tiene el mismo tamaño
-    que la matriz, se usa X para completar el mensaje.
+    que la matriz, se usa la letra de relleno para completar el mensaje.
     Argumentos:
     plain_message (str): El mensaje a cifrar.
     matrix (np.array): La matriz de transformación para el cifrado afín.
+    alphabet (Alphabet): El alfabeto del cifrado.
+    pad (str): Letra de relleno del último bloque, por defecto X.
     Regresa:
     str: El mensaje cifrado.
     """
-    plain_message = plain_message.upper()
-    # Verificar que el mensaje contenga solo caracteres válidos
-    if not all(c in alphabetical_decimal for c in plain_message):
-        raise ValueError("El mensaje contiene caracteres no válidos.")
-    size = matrix.shape[0]
-    encrypted_message = []
-    # Asegurarse de que el mensaje tenga el tamaño adecuado
-    while len(plain_message) % size != 0:
-        plain_message += "X"  # Agregar 'X' para completar el mensaje
-    # Recorrer el mensaje en bloques del tamaño de la matriz
-    for i in range(0, len(plain_message), size):
-        block = plain_message[i : i + size]
-        # Multiplicar el bloque por la matriz
-        block_vector = np.array([alphabetical_decimal[char] for char in block])
-        encrypted_vector = block_vector @ matrix % modulus
-        # Convertir el vector cifrado de nuevo a caracteres
-        encrypted_block = [decimal_alphabetical[int(num)] for num in encrypted_vector]
-        # Agregar los caracteres cifrados al mensaje cifrado
-        encrypted_message.extend(encrypted_block)
-    return "".join(encrypted_message)
-
-
-def adjugate_matrix(matrix):
-    """
-    Calcula la matriz adjunta de una matriz dada en el contexto del cifrado Hill.
-    Argumentos:
-    matrix (np.array): La matriz para la cual se calculará la adjunta.
-    Regresa:
-    np.array: La matriz adjunta.
-    """
-    # Calcular la matriz de cofactores
-    cofactor_matrix = np.zeros(matrix.shape, dtype=int)
-    for i in range(matrix.shape[0]):
-        for j in range(matrix.shape[1]):
-            minor = np.delete(np.delete(matrix, i, axis=0), j, axis=1)
-            cofactor_matrix[i, j] = (
-                ((-1) ** (i + j)) * int(round(np.linalg.det(minor))) % modulus
-            )
-    # Transponer la matriz de cofactores para obtener la adjunta
-    return cofactor_matrix.T % modulus
+    # Convertir el mensaje a índices, verificando que solo tenga caracteres válidos
+    with stage("hill_encrypt", MAP, len(plain_message)):
+        try:
+            values, _ = alphabet.encode(plain_message, "error")
+        except ValueError:
+            raise ValueError("El mensaje contiene caracteres no válidos.") from None
+    # Completar el mensaje hasta un múltiplo del tamaño de la matriz
+    with stage("hill_encrypt", NORMALIZE, len(values)):
+        padded = pad_values(values, matrix.shape[0], alphabet, pad)
+    with stage("hill_encrypt", ARITHMETIC, len(padded)):
+        result = hill_transform(padded, matrix, alphabet.modulus)
+    with stage("hill_encrypt", OUTPUT, len(result)):
+        return alphabet.decode(result)
 
 
-def inverse_matrix(matrix):
+def inverse_matrix(matrix, alphabet=STANDARD):
     """
-    Calcula la matriz inversa de una matriz dada en el contexto del cifrado Hill.
+    Calcula la matriz inversa de una matriz dada en el contexto del cifrado Hill,
+    usando eliminación de Gauss-Jordan exacta sobre los enteros módulo el tamaño del alfabeto.
     Argumentos:
     matrix (np.array): La matriz a invertir.
+    alphabet (Alphabet): El alfabeto del cifrado.
     Regresa:
     np.array: La matriz inversa.
     """
-    det = int(round(np.linalg.det(matrix)))  # Determinante de la matriz
-    # Asegurarse que la matriz sea invertible
-    if det % modulus == 0:
-        raise ValueError("La matriz no es invertible.")
-    # Inverso del determinante módulo el tamaño del alfabeto
-    det_inv = pow(det, -1, modulus)
-    # Asegurarse de que el determinante sea invertible
-    if det_inv is None:
-        raise ValueError(f"El determinante no tiene inverso en el módulo {modulus}.")
-    matrix_mod_inv = det_inv * adjugate_matrix(matrix) % modulus
-    return matrix_mod_inv
+    # Lanza SingularMatrixError (un ValueError) si la matriz no es invertible; las
+    # inversas ya calculadas se toman de la caché de claves
+    return cached_inverse_mod(matrix, alphabet.modulus)
 
 
-def hill_decrypt(encrypted_message, matrix):
+def hill_decrypt(encrypted_message, matrix, alphabet=STANDARD):
     """
-    Descifra un mensaje usando el cifrado Hill. Si el mensaje no tiene el mismo tamaño
-    que la matriz, se usa X para completar el mensaje.
+    Descifra un mensaje cifrado con el cifrado Hill usando la inversa de la matriz
+    módulo el tamaño del alfabeto. El relleno del cifrado se conserva en el resultado.
     Argumentos:
-    plain_message (str): El mensaje a cifrar.
-    matrix (np.array): La matriz de transformación para el cifrado afín.
+    encrypted_message (str): El mensaje a descifrar; su longitud debe ser múltiplo
+    del tamaño de la matriz.
+    matrix (np.array): La matriz de transformación con la que se cifró.
+    alphabet (Alphabet): El alfabeto del cifrado.
     Regresa:
-    str: El mensaje cifrado.
+    str: El mensaje descifrado.
     """
-    encrypted_message = encrypted_message.upper()
-    # Verificar que el mensaje contenga solo caracteres válidos
-    if not all(c in alphabetical_decimal for c in encrypted_message):
-        raise ValueError("El mensaje contiene caracteres no válidos.")
+    # Convertir el mensaje a índices, verificando que solo tenga caracteres válidos
+    with stage("hill_decrypt", MAP, len(encrypted_message)):
+        try:
+            values, _ = alphabet.encode(encrypted_message, "error")
+        except ValueError:
+            raise ValueError("El mensaje contiene caracteres no válidos.") from None
     #  Calcular la matriz inversa
-    inv_matrix = inverse_matrix(matrix)
-    size = inv_matrix.shape[0]
-    decrypted_message = []
-    # Recorrer el mensaje en bloques del tamaño de la matriz
-    for i in range(0, len(encrypted_message), size):
-        block = encrypted_message[i : i + size]
-        # Multiplicar el bloque por la matriz inversa
-        block_vector = np.array([alphabetical_decimal[char] for char in block])
-        decrypted_vector = block_vector @ inv_matrix % modulus
-        # Convertir el vector cifrado de nuevo a caracteres
-        decrypted_block = [decimal_alphabetical[int(num)] for num in decrypted_vector]
-        # Agregar los caracteres cifrados al mensaje cifrado
-        decrypted_message.extend(decrypted_block)
-    return "".join(decrypted_message)
-
-
-A = np.array([[17, 17, 5], [21, 18, 21], [2, 2, 19]])  # Matriz de transformación|
-encrypted = hill_encrypt("PAYMOREMONEY", A)
-print(f"Mensaje cifrado: {encrypted}")
-decrypted = hill_decrypt(encrypted, A)
-print(f"Mensaje descifrado: {decrypted}")
+    with stage("hill_decrypt", ARITHMETIC, len(values)):
+        inv_matrix = inverse_matrix(matrix, alphabet)
+        if len(values) % inv_matrix.shape[0] != 0:
+            raise ValueError("La longitud del mensaje no es múltiplo del tamaño de la matriz.")
+        result = hill_transform(values, inv_matrix, alphabet.modulus)
+    with stage("hill_decrypt", OUTPUT, len(result)):
+        return alphabet.decode(result)
+
+
+def key_solvers(plain_blocks, modulus):
+    """
+    Prepara la resolución de claves a partir de bloques de texto plano conocidos.
+    Para cada potencia de primo q del módulo se eligen n bloques independientes
+    y se invierte su matriz módulo q; así un módulo compuesto no necesita un
+    único conjunto de bloques invertible módulo m.
+    Argumentos:
+    plain_blocks (np.array): Matriz (bloques x n) del texto plano conocido.
+    modulus (int): El tamaño del alfabeto.
+    Regresa:
+    list: Tripletas (q, filas elegidas, inversa módulo q), o None si los bloques
+    no determinan la clave.
+    """
+    size = plain_blocks.shape[1]
+    solvers = []
+    for p, k in factorize(modulus).items():
+        rows = independent_rows(plain_blocks, p)
+        if len(rows) < size:
+            return None
+        q = p**k
+        solvers.append((q, rows, matrix_inverse_mod(plain_blocks[rows], q)))
+    return solvers
+
+
+def solve_keys(solvers, cipher_blocks, modulus):
+    """
+    Calcula a la vez las claves K con P @ K = C para una pila de bloques cifrados,
+    combinando las soluciones módulo cada potencia de primo con el teorema chino del resto.
+    Argumentos:
+    solvers (list): El resultado de key_solvers.
+    cipher_blocks (np.array): Arreglo (candidatos x bloques x n) de bloques cifrados.
+    modulus (int): El tamaño del alfabeto.
+    Regresa:
+    np.array: Arreglo (candidatos x n x n) de claves.
+    """
+    size = cipher_blocks.shape[-1]
+    keys = np.zeros((cipher_blocks.shape[0], size, size), dtype=np.int64)
+    for q, rows, inverse in solvers:
+        partial = np.matmul(inverse, cipher_blocks[:, rows].astype(np.int64)) % q
+        rest = modulus // q
+        keys = (keys + partial * (rest * pow(rest, -1, q) % modulus)) % modulus
+    return keys
+
+
+def recover_key(plain_message, encrypted_message, size, alphabet=STANDARD):
+    """
+    Recupera la matriz clave a partir de un texto plano y su cifrado, alineados
+    desde el inicio de un bloque.
+    Argumentos:
+    plain_message (str): El texto plano conocido.
+    encrypted_message (str): El texto cifrado correspondiente.
+    size (int): El tamaño n de la matriz clave.
+    alphabet (Alphabet): El alfabeto del cifrado.
+    Regresa:
+    np.array: La matriz clave.
+    """
+    modulus = alphabet.modulus
+    plain, _ = alphabet.encode(plain_message, "error")
+    cipher = as_profile(encrypted_message, alphabet, "error").values
+    blocks = min(len(plain), len(cipher)) // size
+    plain_blocks = plain[: blocks * size].reshape(blocks, size)
+    cipher_blocks = cipher[: blocks * size].reshape(1, blocks, size)
+    solvers = key_solvers(plain_blocks, modulus)
+    if solvers is None:
+        raise ValueError("Los bloques conocidos no determinan la clave.")
+    key = solve_keys(solvers, cipher_blocks, modulus)[0]
+    # Todos los bloques conocidos deben ser consistentes con la clave
+    if not (modular_product(plain_blocks, key, modulus) == cipher_blocks[0]).all():
+        raise ValueError("El texto plano y el cifrado no son consistentes con ninguna clave.")
+    return key
+
+
+def known_plaintext_attack(
+    encrypted_message, crib, size, sample_blocks=512, top=5, alphabet=STANDARD
+):
+    """
+    Busca la matriz clave probando un fragmento de texto plano conocido (crib) en
+    todas las posiciones del texto cifrado. Las posiciones con la misma fase respecto
+    a los bloques comparten la matriz de texto plano, así que sus claves se resuelven
+    en una sola operación. Cada clave consistente con el crib se evalúa descifrando
+    el inicio del mensaje y midiendo su índice de coincidencia.
+    Argumentos:
+    encrypted_message (str | CiphertextProfile): El texto cifrado o su perfil.
+    crib (str): El fragmento de texto plano conocido.
+    size (int): El tamaño n de la matriz clave.
+    sample_blocks (int): Número de bloques del mensaje usados para evaluar cada clave.
+    top (int): Número de resultados a devolver.
+    alphabet (Alphabet): El alfabeto del cifrado.
+    Regresa:
+    list: Tuplas (clave, índice de coincidencia, posición del crib), de mejor a peor.
+    """
+    modulus = alphabet.modulus
+    with stage("known_plaintext_attack", NORMALIZE, len(encrypted_message)):
+        cipher = as_profile(encrypted_message, alphabet, "error").values
+        crib_values, _ = alphabet.encode(crib, "error")
+    cipher_blocks = cipher[: len(cipher) // size * size].reshape(-1, size)
+    sample = cipher_blocks[:sample_blocks]
+
+    with stage("known_plaintext_attack", ARITHMETIC, len(cipher)):
+        candidates = {}
+        for offset in range(size):
+            # Bloques completos del crib cuando empieza 'offset' posiciones antes de un bloque
+            count = (len(crib_values) - offset) // size
+            if count < size:
+                continue
+            plain_blocks = crib_values[offset : offset + count * size].reshape(count, size)
+            solvers = key_solvers(plain_blocks, modulus)
+            if solvers is None:
+                continue
+            windows = np.lib.stride_tricks.sliding_window_view(cipher_blocks, (count, size))[:, 0]
+            # Índices de bloque j tales que el crib empieza en j * n - offset y cabe en el mensaje
+            first = 1 if offset else 0
+            last = (len(cipher) - len(crib_values) + offset) // size
+            if last < first:
+                continue
+            windows = windows[first : last + 1]
+            keys = solve_keys(solvers, windows, modulus)
+            consistent = (np.matmul(plain_blocks, keys) % modulus == windows).all(axis=(1, 2))
+            # Índices de Python: la posición se regresa como int y no como np.int64
+            for j in np.flatnonzero(consistent).tolist():
+                candidates.setdefault(keys[j].tobytes(), (keys[j], (first + j) * size - offset))
+
+        results = []
+        for key, position in candidates.values():
+            try:
+                inverse = matrix_inverse_mod(key, modulus)
+            except SingularMatrixError:
+                continue  # Una clave sin inversa no puede ser la clave real
+            plain = modular_product(sample, inverse, modulus).reshape(-1)
+            results.append((key, index_of_coincidence(plain, modulus), position))
+    with stage("known_plaintext_attack", OUTPUT):
+        results.sort(key=lambda result: result[1], reverse=True)
+        return results[:top]
+
+
+def column_vectors(indices, size, modulus):
+    """
+    Convierte números de candidato en vectores columna de la matriz de descifrado,
+    escribiendo cada número en base m.
+    Argumentos:
+    indices (np.array): Números de candidato en [0, m^n).
+    size (int): El tamaño n de la matriz.
+    modulus (int): El tamaño del alfabeto.
+    Regresa:
+    np.array: Matriz (candidatos x n) con un vector por fila.
+    """
+    powers = modulus ** np.arange(size, dtype=np.int64)
+    return np.asarray(indices, dtype=np.int64)[:, None] // powers % modulus
+
+
+def column_streams(blocks, vectors, modulus):
+    """
+    Descifra la misma posición de todos los bloques para varios vectores columna a la vez.
+    Argumentos:
+    blocks (np.array): Matriz (bloques x n) del texto cifrado.
+    vectors (np.array): Matriz (candidatos x n) de vectores columna.
+    modulus (int): El tamaño del alfabeto.
+    Regresa:
+    np.array: Matriz (bloques x candidatos) con la letra descifrada por cada vector.
+    """
+    product = blocks.astype(np.float64) @ vectors.T.astype(np.float64)
+    return np.fmod(product, modulus).astype(np.int64)
+
+
+def score_column_range(blocks, start, stop, expected, modulus, keep):
+    """
+    Evalúa los vectores columna con número en [start, stop) comparando la frecuencia
+    de las letras que producen contra la del idioma. Se ejecuta en los procesos del pool.
+    Argumentos:
+    blocks (np.array): Matriz (bloques x n) del texto cifrado.
+    start (int): Primer número de candidato.
+    stop (int): Número de candidato final (excluido).
+    expected (np.array): Probabilidades de las letras del idioma.
+    modulus (int): El tamaño del alfabeto.
+    keep (int): Número de mejores candidatos a conservar.
+    Regresa:
+    tuple: Los números de los mejores candidatos y su chi-cuadrado.
+    """
+    vectors = column_vectors(np.arange(start, stop), blocks.shape[1], modulus)
+    streams = column_streams(blocks, vectors, modulus)
+    # Conteo de letras de todos los candidatos con un solo bincount
+    count = stop - start
+    offsets = streams + modulus * np.arange(count)
+    counts = np.bincount(offsets.ravel(), minlength=count * modulus).reshape(count, modulus)
+    scores = chi_squared(counts, expected)
+    # Las entradas de una columna de una matriz invertible no comparten factor con m
+    scores[np.gcd(np.gcd.reduce(vectors, axis=1), modulus) != 1] = np.inf
+    best = np.argsort(scores, kind="stable")[:keep]
+    return best + start, scores[best]
+
+
+def ciphertext_only_attack(
+    encrypted_message,
+    size,
+    language="english",
+    top=5,
+    beam=None,
+    sample_blocks=2000,
+    workers=None,
+    alphabet=STANDARD,
+):
+    """
+    Ataca el cifrado Hill sin texto plano conocido. Cada letra descifrada depende solo de
+    una columna de la matriz inversa, así que se evalúan las m^n columnas posibles por
+    separado (en lugar de las m^(n²) matrices) con un chi-cuadrado contra el idioma. Las
+    mejores columnas se combinan en matrices invertibles, que se ordenan por el índice de
+    coincidencia de digramas del texto descifrado, sensible al orden de las columnas.
+    Argumentos:
+    encrypted_message (str | CiphertextProfile): El texto cifrado o su perfil.
+    size (int): El tamaño n de la matriz clave.
+    language (str | list): "english", "spanish" o una tabla de frecuencias propia.
+    top (int): Número de claves a devolver.
+    beam (int, optional): Columnas candidatas a combinar; por defecto n + 2.
+    sample_blocks (int): Número de bloques del mensaje usados en el barrido.
+    workers (int, optional): Procesos del pool; por defecto uno por núcleo.
+    alphabet (Alphabet): El alfabeto del cifrado.
+    Regresa:
+    list: Tuplas (clave, índice de coincidencia de digramas), de mejor a peor. Cada clave
+    sirve directamente para hill_decrypt.
+    """
+    modulus = alphabet.modulus
+    with stage("ciphertext_only_attack", NORMALIZE, len(encrypted_message)):
+        cipher = as_profile(encrypted_message, alphabet, "error").values
+        blocks = cipher[: len(cipher) // size * size].reshape(-1, size)[:sample_blocks]
+    expected = expected_frequencies(language, modulus)
+    beam = size + 2 if beam is None else beam
+    workers = (os.cpu_count() or 1) if workers is None else workers
+
+    with stage("ciphertext_only_attack", ARITHMETIC, len(blocks) * size):
+        # Barrido de todas las columnas en tareas de tamaño acotado
+        total = modulus**size
+        step = max(1, SWEEP_ELEMENTS // max(len(blocks), 1))
+        tasks = [(start, min(start + step, total)) for start in range(0, total, step)]
+        arguments = [(blocks, start, stop, expected, modulus, beam) for start, stop in tasks]
+        if workers > 1 and len(tasks) > 1:
+            # Se importa aquí porque multiprocessing domina el tiempo de importar el módulo
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                partial = list(executor.map(score_column_range, *zip(*arguments)))
+        else:
+            partial = [score_column_range(*args) for args in arguments]
+        indices = np.concatenate([best for best, _ in partial])
+        scores = np.concatenate([score for _, score in partial])
+        best = indices[np.argsort(scores, kind="stable")[:beam]]
+
+        # Combinar las mejores columnas en matrices de descifrado invertibles
+        vectors = column_vectors(best, size, modulus)
+        streams = column_streams(blocks, vectors, modulus)
+        results = []
+        for order in permutations(range(len(best)), size):
+            order = list(order)
+            try:
+                key = matrix_inverse_mod(vectors[order].T, modulus)
+            except SingularMatrixError:
+                continue
+            plain = streams[:, order].reshape(-1)
+            results.append((key, digraph_index_of_coincidence(plain, modulus)))
+    with stage("ciphertext_only_attack", OUTPUT):
+        results.sort(key=lambda result: result[1], reverse=True)
+        return results[:top]
+
+
+def demo():
+    A = np.array([[17, 17, 5], [21, 18, 21], [2, 2, 19]])  # Matriz de transformación|
+    encrypted = hill_encrypt("PAYMOREMONEY", A)
+    print(f"Mensaje cifrado: {encrypted}")
+    decrypted = hill_decrypt(encrypted, A)
+    print(f"Mensaje descifrado: {decrypted}")
+
+
+if __name__ == "__main__":
+    demo()
@@ -0,0 +1,144 @@
+"""
+Cifrado sin copias sobre buffers de bytes. Las funciones reciben un bytearray, un
+memoryview escribible o un mmap y lo modifican en su lugar a través de una vista de
+NumPy, así que cifrar un archivo mapeado en memoria no necesita otra copia de los datos.
+Con el alfabeto BYTES se cifran los 256 valores de un byte; con un alfabeto de
+caracteres latin-1 (como STANDARD) solo cambian los bytes de sus letras y el resto se
+conserva, igual que la política "keep".
+"""
+
+import mmap
+import sys
+
+from .alphabets import BYTES
+from .lazy import numpy as np
+
+# Bytes procesados a la vez en Vigenère; acota la memoria temporal
+INPLACE_CHUNK = 1 << 20
+
+
+def byte_view(buffer):
+    """
+    Crea una vista uint8 escribible sobre un buffer, sin copiarlo.
+    Argumentos:
+    buffer (bytearray | memoryview | mmap): El buffer a modificar.
+    Regresa:
+    np.array: La vista sobre los mismos bytes.
+    """
+    view = np.frombuffer(buffer, dtype=np.uint8)
+    if not view.flags.writeable:
+        raise ValueError("El buffer es de solo lectura; use bytearray, memoryview o mmap escribible.")
+    return view
+
+
+def byte_tables(alphabet):
+    """
+    Tablas de 256 entradas entre bytes e índices del alfabeto.
+    Argumentos:
+    alphabet (Alphabet): Un alfabeto cuyos caracteres caben en un byte.
+    Regresa:
+    tuple: Índice de cada byte (el centinela si no pertenece al alfabeto), el
+    centinela y el byte de cada índice.
+    """
+    codec = alphabet.codec
+    if codec.wide:
+        raise ValueError("El alfabeto tiene caracteres que no caben en un byte.")
+    return codec.encode_table[:256], codec.sentinel, codec.decode_table
+
+
+def affine_inplace(buffer, a, b, decrypt=False, alphabet=BYTES):
+    """
+    Cifra o descifra un buffer con el cifrado afín, en su lugar. Cada byte pasa por la
+    tabla de 256 entradas de la clave compilada con una sola indexación.
+    Argumentos:
+    buffer (bytearray | memoryview | mmap): Los datos a transformar.
+    a (int): El multiplicador.
+    b (int): El desplazamiento.
+    decrypt (bool): True para descifrar.
+    alphabet (Alphabet): BYTES o un alfabeto de caracteres latin-1.
+    """
+    byte_tables(alphabet)
+    key = alphabet.substitution(a, b)
+    table = (key.decryption if decrypt else key.encryption).bytes_table
+    view = byte_view(buffer)
+    # Con mode="clip" NumPy escribe directamente sobre la vista, sin buffer intermedio
+    np.take(np.frombuffer(table, dtype=np.uint8), view, out=view, mode="clip")
+
+
+def shift_inplace(buffer, shift, decrypt=False, alphabet=BYTES):
+    """
+    Cifra o descifra un buffer con un desplazamiento, en su lugar (a = 1 en el cifrado afín).
+    """
+    affine_inplace(buffer, 1, shift, decrypt, alphabet)
+
+
+def vigenere_inplace(buffer, key, decrypt=False, alphabet=BYTES, phase=0):
+    """
+    Cifra o descifra un buffer con Vigenère, en su lugar. La clave solo avanza sobre
+    los bytes del alfabeto. Se procesa por trozos para acotar la memoria temporal.
+    Argumentos:
+    buffer (bytearray | memoryview | mmap): Los datos a transformar.
+    key (str | bytes): La clave.
+    decrypt (bool): True para descifrar.
+    alphabet (Alphabet): BYTES o un alfabeto de caracteres latin-1.
+    phase (int): Posición de la clave con la que empieza el buffer.
+    Regresa:
+    int: La fase con la que continúa el siguiente buffer del mismo mensaje.
+    """
+    encode, sentinel, decode = byte_tables(alphabet)
+    if isinstance(key, (bytes, bytearray)):
+        key = bytes(key).decode("latin-1")
+    key_values = alphabet.encode(key, "error")[0].astype(np.int32)
+    if len(key_values) == 0:
+        raise ValueError("La clave no puede estar vacía.")
+    if decrypt:
+        key_values = -key_values
+    length = len(key_values)
+    modulus = alphabet.modulus
+    view = byte_view(buffer)
+    for start in range(0, len(view), INPLACE_CHUNK):
+        chunk = view[start : start + INPLACE_CHUNK]
+        if alphabet == BYTES:
+            # Todos los bytes son letras y la suma en uint8 ya es módulo 256
+            shifts = np.resize(np.roll(key_values, -phase) % 256, len(chunk))
+            np.add(chunk, shifts.astype(np.uint8), out=chunk)
+            phase = (phase + len(chunk)) % length
+            continue
+        values = encode[chunk]
+        letters = np.flatnonzero(values != sentinel)
+        shifts = np.resize(np.roll(key_values, -phase), len(letters))
+        chunk[letters] = decode[(values[letters] + shifts) % modulus]
+        phase = (phase + len(letters)) % length
+    return phase
+
+
+def encrypt_file_inplace(path, cipher, *key, decrypt=False, alphabet=BYTES):
+    """
+    Cifra o descifra un archivo en su lugar mapeándolo en memoria.
+    Argumentos:
+    path (str): La ruta del archivo.
+    cipher (str): "shift", "affine" o "vigenere".
+    key: Los argumentos de la clave: (desplazamiento), (a, b) o (clave).
+    decrypt (bool): True para descifrar.
+    alphabet (Alphabet): BYTES o un alfabeto de caracteres latin-1.
+    """
+    functions = {"shift": shift_inplace, "affine": affine_inplace, "vigenere": vigenere_inplace}
+    if cipher not in functions:
+        raise ValueError(f"Cifrado desconocido: {cipher!r}.")
+    with open(path, "r+b") as file:
+        file.seek(0, 2)
+        if file.tell() == 0:
+            return
+        with mmap.mmap(file.fileno(), 0) as mapped:
+            functions[cipher](mapped, *key, decrypt=decrypt, alphabet=alphabet)
+            mapped.flush()
+
+
+if __name__ == "__main__":
+    # Uso: python -m cifrados.inplace shift|affine|vigenere encrypt|decrypt clave archivo
+    # Claves: shift "3", affine "7,2", vigenere "LEMON"; se usa el alfabeto de 256 bytes
+    if len(sys.argv) != 5 or sys.argv[2] not in ("encrypt", "decrypt"):
+        sys.exit("Uso: python -m cifrados.inplace shift|affine|vigenere encrypt|decrypt clave archivo")
+    cipher, mode, key, path = sys.argv[1:]
+    arguments = (key,) if cipher == "vigenere" else tuple(int(x) for x in key.split(","))
+    encrypt_file_inplace(path, cipher, *arguments, decrypt=mode == "decrypt")
@@ -0,0 +1,160 @@
+"""
+Ejecutor de trabajos por lotes. Lee un archivo JSONL con un trabajo por línea,
+
+    {"id": 7, "cipher": "vigenere", "operation": "decrypt", "key": "LEMON", "text": "..."}
+
+agrupa los trabajos por cifrado, operación, clave e idioma y manda los grupos en trozos
+a un pool de procesos cuyos trabajadores preparan alfabetos y tablas una sola vez. Los
+resultados se escriben en otro JSONL en el mismo orden que la entrada. La entrada se
+procesa por ventanas de WINDOW_JOBS trabajos, con a lo más dos ventanas en memoria,
+así que la memoria no depende del tamaño del archivo.
+Uso: python -m cifrados.jobrunner entrada.jsonl salida.jsonl [procesos] [tablas.ngrams]
+"""
+
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from .operations import HEAVY_CRACKS, error_message, json_line, normalize_key, run_batch, warm_worker
+
+# Trabajos leídos y agrupados a la vez
+WINDOW_JOBS = 1 << 16
+
+# Trabajos de un mismo grupo enviados juntos a un proceso
+CHUNK_JOBS = 2048
+
+
+def read_jobs(source):
+    """
+    Lee las líneas no vacías de un archivo JSONL sin cargarlo completo.
+    Regresa:
+    generator: Pares (número de línea, línea).
+    """
+    with open(source, "r", encoding="utf-8") as file:
+        for number, line in enumerate(file, 1):
+            if line.strip():
+                yield number, line
+
+
+def parse_job(line):
+    """
+    Interpreta un trabajo.
+    Regresa:
+    tuple: (id, grupo, texto), donde el grupo es (cifrado, operación, clave, idioma).
+    """
+    job = json.loads(line)
+    if not isinstance(job, dict):
+        raise ValueError("El trabajo debe ser un objeto JSON.")
+    cipher, operation = job.get("cipher"), job.get("operation")
+    text = job.get("text", "")
+    if not isinstance(text, str):
+        raise ValueError("El texto debe ser una cadena.")
+    language = job.get("language")
+    if language is not None and not isinstance(language, str):
+        raise ValueError("El idioma debe ser una cadena.")
+    key = normalize_key(cipher, operation, job.get("key"))
+    return job.get("id"), (cipher, operation, key, language), text
+
+
+def submit_window(executor, lines, chunk, ngrams):
+    """
+    Agrupa una ventana de trabajos y envía sus trozos al pool.
+    Regresa:
+    tuple: (encabezados de salida, resultados ya conocidos, [(posiciones, futuro)]).
+    """
+    heads = []
+    results = [None] * len(lines)
+    groups = defaultdict(list)
+    for position, (number, line) in enumerate(lines):
+        try:
+            job_id, group, text = parse_job(line)
+        except Exception as error:
+            # Los trabajos inválidos se responden sin pasar por el pool
+            heads.append({"line": number})
+            results[position] = {"error": error_message(error)}
+            continue
+        heads.append({"line": number} if job_id is None else {"line": number, "id": job_id})
+        groups[group].append((position, text))
+
+    pending = []
+    for (cipher, operation, key, language), members in groups.items():
+        # Los ataques pesados van de uno en uno para repartirse entre los procesos
+        size = 1 if operation == "crack" and cipher in HEAVY_CRACKS else chunk
+        for start in range(0, len(members), size):
+            part = members[start : start + size]
+            texts = [text for _, text in part]
+            future = executor.submit(run_batch, cipher, operation, key, texts, language, ngrams=ngrams)
+            pending.append(([position for position, _ in part], future))
+    return heads, results, pending
+
+
+def write_window(output, window):
+    """
+    Espera los resultados de una ventana y los escribe en el orden de la entrada.
+    Regresa:
+    tuple: (trabajos escritos, trabajos con error).
+    """
+    heads, results, pending = window
+    for positions, future in pending:
+        try:
+            batch = future.result()
+        except Exception as error:
+            # Un proceso caído o un resultado que no se pudo transferir solo afecta a su trozo
+            batch = [{"error": error_message(error)}] * len(positions)
+        for position, result in zip(positions, batch):
+            results[position] = result
+    errors = 0
+    for head, result in zip(heads, results):
+        errors += "error" in result
+        output.write(json_line({**head, **result}))
+    return len(heads), errors
+
+
+def run_jobs(source, destination, workers=None, ngrams=None, window=WINDOW_JOBS, chunk=CHUNK_JOBS):
+    """
+    Ejecuta todos los trabajos de un archivo JSONL y escribe los resultados en orden.
+    Mientras el pool procesa una ventana se escriben los resultados de la anterior.
+    Argumentos:
+    source (str): El archivo JSONL de trabajos.
+    destination (str): El archivo JSONL de resultados; cada línea lleva el número de
+    línea del trabajo ("line"), su "id" si tenía, y "result" o "error".
+    workers (int, optional): Número de procesos; por defecto uno por núcleo.
+    ngrams (str, optional): Ruta de las tablas de n-gramas para atacar Playfair.
+    window (int): Trabajos leídos y agrupados a la vez.
+    chunk (int): Trabajos de un mismo grupo por tarea del pool.
+    Regresa:
+    tuple: (trabajos procesados, trabajos con error).
+    """
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    jobs = errors = 0
+    lines = read_jobs(source)
+    with (
+        ProcessPoolExecutor(max_workers=workers, initializer=warm_worker, initargs=(ngrams,)) as executor,
+        open(destination, "w", encoding="utf-8") as output,
+    ):
+        previous = None
+        while part := list(islice(lines, window)):
+            current = submit_window(executor, part, chunk, ngrams)
+            if previous is not None:
+                written, failed = write_window(output, previous)
+                jobs, errors = jobs + written, errors + failed
+            previous = current
+        if previous is not None:
+            written, failed = write_window(output, previous)
+            jobs, errors = jobs + written, errors + failed
+    return jobs, errors
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        sys.exit("Uso: python -m cifrados.jobrunner entrada.jsonl salida.jsonl [procesos] [tablas.ngrams]")
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    ngrams = sys.argv[4] if len(sys.argv) > 4 else None
+    start = time.perf_counter()
+    jobs, errors = run_jobs(sys.argv[1], sys.argv[2], workers, ngrams)
+    elapsed = time.perf_counter() - start
+    print(f"{jobs} trabajos ({errors} con error) en {elapsed:.2f} s: {jobs / max(elapsed, 1e-9):.0f} trabajos/s")
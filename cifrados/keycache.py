@@ -0,0 +1,101 @@
+"""
+Caché LRU de claves compiladas, compartida por todos los cifrados: sustituciones
+afines, cuadros Playfair e inversas de matrices Hill. Cuando se descifran muchos
+mensajes cortos con pocas claves, una clave repetida se toma de la caché y se omite
+toda la preparación. Los valores guardados no se modifican después de construirse
+(sus arreglos de NumPy se marcan de solo lectura), así que varios hilos pueden
+usarlos a la vez.
+"""
+
+import threading
+from collections import OrderedDict, namedtuple
+
+# Claves compiladas que se conservan por defecto
+KEY_CACHE_SIZE = 1024
+
+CacheStats = namedtuple("CacheStats", ["hits", "misses", "evictions", "size", "maxsize"])
+
+
+class KeyCache:
+    """
+    Caché LRU acotada con contadores de aciertos, fallos y desalojos. Las entradas se
+    identifican con una tupla cuyo primer elemento es el tipo de clave ("affine",
+    "playfair", "hill"), así que cifrados distintos comparten el mismo límite.
+    """
+
+    def __init__(self, maxsize=KEY_CACHE_SIZE):
+        """
+        Argumentos:
+        maxsize (int): Número máximo de claves guardadas; 0 desactiva la caché.
+        """
+        if maxsize < 0:
+            raise ValueError("El tamaño de la caché no puede ser negativo.")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, build):
+        """
+        Regresa la clave compilada guardada o la construye y la guarda.
+        Argumentos:
+        key (tuple): El identificador de la clave; debe ser hashable.
+        build (callable): Función sin argumentos que compila la clave si no está.
+        Regresa:
+        object: La clave compilada.
+        """
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self.misses += 1
+        # La compilación se hace fuera del candado; si lanza un error no se guarda nada
+        value = build()
+        with self._lock:
+            if self.maxsize and key not in self._entries:
+                self._entries[key] = value
+                self._evict()
+        return value
+
+    def resize(self, maxsize):
+        """
+        Cambia el número máximo de claves, desalojando las menos usadas si sobran.
+        Argumentos:
+        maxsize (int): El nuevo tamaño; 0 desactiva la caché.
+        """
+        if maxsize < 0:
+            raise ValueError("El tamaño de la caché no puede ser negativo.")
+        with self._lock:
+            self.maxsize = maxsize
+            self._evict()
+
+    def clear(self):
+        """
+        Vacía la caché y reinicia los contadores.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """
+        Regresa:
+        CacheStats: Aciertos, fallos, desalojos, claves guardadas y tamaño máximo.
+        """
+        with self._lock:
+            return CacheStats(self.hits, self.misses, self.evictions, len(self._entries), self.maxsize)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _evict(self):
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+
+# La caché compartida por los cifrados
+KEY_CACHE = KeyCache()
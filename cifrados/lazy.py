@@ -0,0 +1,34 @@
+"""
+Importación diferida de módulos pesados. NumPy tarda más en importarse que todo el
+paquete, así que los módulos lo reciben de aquí y solo se carga la primera vez que se
+usa uno de sus atributos; cifrar con Playfair o con un desplazamiento sobre texto no
+necesita cargarlo al importar.
+"""
+
+import importlib.util
+import sys
+
+
+def lazy_import(name):
+    """
+    Regresa un módulo que se ejecuta la primera vez que se accede a uno de sus
+    atributos. Si el módulo ya estaba importado se regresa tal cual.
+    Argumentos:
+    name (str): El nombre completo del módulo.
+    Regresa:
+    module: El módulo, registrado en sys.modules para que los demás imports lo compartan.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No se encontró el módulo {name!r}.", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+numpy = lazy_import("numpy")
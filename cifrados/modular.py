@@ -0,0 +1,258 @@
+from .keycache import KEY_CACHE
+from .lazy import numpy as np
+
+
+class SingularMatrixError(ValueError):
+    """
+    La matriz no tiene inversa en el módulo indicado. Guarda el factor primo
+    del módulo respecto al cual la matriz es singular.
+    """
+
+    def __init__(self, modulus, factor, column):
+        self.modulus = modulus
+        self.factor = factor
+        self.column = column
+        super().__init__(
+            f"La matriz no es invertible módulo {modulus}: su determinante es "
+            f"divisible por {factor} (sin pivote en la columna {column})."
+        )
+
+
+def factorize(n):
+    """
+    Descompone un entero en sus factores primos por división de prueba.
+    Argumentos:
+    n (int): El número a descomponer, mayor que 1.
+    Regresa:
+    dict: Diccionario {primo: exponente}.
+    """
+    factors = {}
+    p = 2
+    while p * p <= n:
+        while n % p == 0:
+            factors[p] = factors.get(p, 0) + 1
+            n //= p
+        p += 1
+    if n > 1:
+        factors[n] = factors.get(n, 0) + 1
+    return factors
+
+
+def _work_dtype(modulus):
+    """
+    Tipo de dato para operar módulo m sin desbordar: int64 mientras m² quepa,
+    enteros de Python en otro caso.
+    """
+    return np.int64 if modulus < 2**31 else object
+
+
+def _inverse_prime_power(matrix, p, q):
+    """
+    Invierte una matriz módulo q = p^k por Gauss-Jordan. En Z_q los elementos no
+    divisibles por p son unidades, así que basta con buscar un pivote así en cada columna.
+    """
+    n = matrix.shape[0]
+    dtype = _work_dtype(q)
+    augmented = np.concatenate(
+        [np.asarray(matrix % q, dtype=dtype), np.eye(n, dtype=np.int64).astype(dtype)],
+        axis=1,
+    )
+    for col in range(n):
+        candidates = np.flatnonzero(augmented[col:, col] % p)
+        if candidates.size == 0:
+            raise SingularMatrixError(None, p, col)
+        pivot = col + int(candidates[0])
+        if pivot != col:
+            augmented[[col, pivot]] = augmented[[pivot, col]]
+        # Normalizar la fila del pivote para que el pivote sea 1
+        augmented[col] = augmented[col] * pow(int(augmented[col, col]), -1, q) % q
+        # Eliminar la columna en el resto de filas con un solo producto exterior
+        factors = augmented[:, col].copy()
+        factors[col] = 0
+        augmented -= np.outer(factors, augmented[col])
+        augmented %= q
+    return augmented[:, n:]
+
+
+def matrix_inverse_mod(matrix, modulus):
+    """
+    Calcula la inversa exacta de una matriz cuadrada módulo m usando solo
+    aritmética entera, en O(n³). Para módulos compuestos se invierte la matriz
+    módulo cada potencia de primo y se combinan los resultados con el teorema
+    chino del resto.
+    Argumentos:
+    matrix (np.array): La matriz cuadrada a invertir.
+    modulus (int): El módulo, normalmente el tamaño del alfabeto.
+    Regresa:
+    np.array: La matriz inversa con valores en [0, m).
+    """
+    matrix = np.asarray(matrix)
+    if matrix.ndim != 2 or matrix.shape[0] != matrix.shape[1]:
+        raise ValueError("La matriz debe ser cuadrada.")
+    dtype = _work_dtype(modulus)
+    matrix = np.asarray(matrix, dtype=dtype) % modulus
+
+    inverse = np.zeros(matrix.shape, dtype=dtype)
+    for p, k in factorize(modulus).items():
+        q = p**k
+        try:
+            partial = _inverse_prime_power(matrix, p, q)
+        except SingularMatrixError as error:
+            raise SingularMatrixError(modulus, error.factor, error.column) from None
+        # Coeficiente del teorema chino del resto: ≡ 1 (mod q) y ≡ 0 (mod m / q)
+        rest = modulus // q
+        coefficient = rest * pow(rest, -1, q) % modulus
+        inverse = (inverse + partial * coefficient) % modulus
+    return inverse
+
+
+def cached_inverse_mod(matrix, modulus):
+    """
+    Regresa la inversa de una matriz clave módulo m, tomándola de la caché de claves
+    si la misma matriz ya se invirtió. La inversa se guarda como solo lectura.
+    Argumentos:
+    matrix (np.array): La matriz cuadrada a invertir.
+    modulus (int): El módulo.
+    Regresa:
+    np.array: La matriz inversa con valores en [0, m).
+    """
+    matrix = np.asarray(matrix, dtype=np.int64) % modulus
+
+    def build():
+        inverse = matrix_inverse_mod(matrix, modulus)
+        inverse.flags.writeable = False
+        return inverse
+
+    return KEY_CACHE.get(("hill", modulus, matrix.shape, matrix.tobytes()), build)
+
+
+def is_invertible_mod(matrix, modulus):
+    """
+    Indica si una matriz cuadrada tiene inversa módulo m.
+    Argumentos:
+    matrix (np.array): La matriz cuadrada.
+    modulus (int): El módulo.
+    Regresa:
+    bool: True si la matriz es invertible.
+    """
+    try:
+        matrix_inverse_mod(matrix, modulus)
+    except SingularMatrixError:
+        return False
+    return True
+
+
+def extended_gcd_mod(values, modulus):
+    """
+    Algoritmo de Euclides extendido sobre un arreglo completo: todas las entradas
+    avanzan a la vez y las que ya terminaron se quedan fijas.
+    Argumentos:
+    values (np.array): Enteros en [0, m).
+    modulus (int): El módulo.
+    Regresa:
+    tuple: Arreglo g = mcd(v, m) y arreglo s con s * v ≡ g (mod m); si v = 0,
+    g = m y s = 0.
+    """
+    dtype = _work_dtype(modulus)
+    previous = np.full(values.shape, modulus, dtype=dtype)
+    remainder = np.asarray(values, dtype=dtype).copy()
+    previous_s = np.zeros(values.shape, dtype=dtype)
+    s = np.ones(values.shape, dtype=dtype)
+    active = remainder != 0
+    while active.any():
+        quotient = previous[active] // remainder[active]
+        previous[active], remainder[active] = (
+            remainder[active],
+            previous[active] - quotient * remainder[active],
+        )
+        previous_s[active], s[active] = s[active], previous_s[active] - quotient * s[active]
+        active = remainder != 0
+    return previous, previous_s % modulus
+
+
+def solve_linear_congruences(x1, y1, x2, y2, modulus):
+    """
+    Resuelve a la vez muchos sistemas
+        y1 ≡ a * x1 + b (mod m)
+        y2 ≡ a * x2 + b (mod m)
+    Restando, a * (x2 - x1) ≡ y2 - y1 (mod m). Si g = mcd(x2 - x1, m) divide a
+    y2 - y1, dividiendo entre g queda una congruencia con solución única a0 módulo
+    m / g, y las g soluciones son a0 + k * m / g; si no, el sistema no tiene solución.
+    Argumentos:
+    x1, y1, x2, y2 (np.array): Los coeficientes de cada sistema, arreglos del mismo tamaño.
+    modulus (int): El módulo.
+    Regresa:
+    tuple: Tres arreglos (sistema, a, b) con una entrada por solución, agrupadas
+    por sistema en el orden de la entrada y con 'a' creciente dentro de cada uno.
+    """
+    dtype = _work_dtype(modulus)
+    x1, y1, x2, y2 = (np.asarray(v, dtype=dtype).ravel() % modulus for v in (x1, y1, x2, y2))
+    difference = (x2 - x1) % modulus
+    target = (y2 - y1) % modulus
+    g, s = extended_gcd_mod(difference, modulus)
+    solvable = target % g == 0
+    reduced = modulus // g
+    # s * (x2 - x1) / g ≡ 1 (mod m / g)
+    base = s * (target // g) % reduced
+
+    counts = np.where(solvable, g, 0).astype(np.int64)
+    systems = np.repeat(np.arange(len(counts)), counts)
+    k = np.arange(len(systems)) - np.repeat(np.cumsum(counts) - counts, counts)
+    a = (base[systems] + k.astype(dtype) * reduced[systems]) % modulus
+    b = (y1[systems] - a * x1[systems]) % modulus
+    return systems, a, b
+
+
+def matrix_product_mod(blocks, matrix, modulus):
+    """
+    Multiplica una matriz de bloques por una matriz clave módulo m sin desbordamientos.
+    Si todos los productos escalares caben exactamente en un float64 se usa BLAS; si
+    no, se multiplica en int64 por grupos de columnas, reduciendo módulo m entre grupos.
+    Argumentos:
+    blocks (np.array): Matriz (bloques x n) de índices.
+    matrix (np.array): La matriz clave n x n.
+    modulus (int): El módulo, normalmente el tamaño del alfabeto.
+    Regresa:
+    np.array: Matriz (bloques x n) int64 con valores en [0, m).
+    """
+    size = matrix.shape[0]
+    matrix = np.asarray(matrix, dtype=np.int64) % modulus
+    largest_term = (modulus - 1) ** 2
+    if size * largest_term < 2**53:
+        product = blocks.astype(np.float64) @ matrix.astype(np.float64)
+        return np.fmod(product, modulus).astype(np.int64)
+    # Cantidad de términos que se pueden sumar sin desbordar int64
+    step = max(1, (2**63 - 1 - modulus) // max(largest_term, 1))
+    result = np.zeros((blocks.shape[0], size), dtype=np.int64)
+    for k in range(0, size, step):
+        result += blocks[:, k : k + step].astype(np.int64) @ matrix[k : k + step]
+        result %= modulus
+    return result
+
+
+def independent_rows(matrix, p, limit=None):
+    """
+    Elige, en orden, las filas de una matriz que son linealmente independientes
+    módulo un primo p, por eliminación gaussiana incremental.
+    Argumentos:
+    matrix (np.array): Matriz (filas x n) de enteros.
+    p (int): El primo.
+    limit (int, optional): Número máximo de filas a elegir; por defecto n.
+    Regresa:
+    list: Los índices de las filas elegidas.
+    """
+    limit = matrix.shape[1] if limit is None else limit
+    basis = []  # Pares (columna pivote, fila normalizada)
+    chosen = []
+    for i, row in enumerate(np.asarray(matrix, dtype=np.int64) % p):
+        for col, vector in basis:
+            if row[col]:
+                row = (row - row[col] * vector) % p
+        nonzero = np.flatnonzero(row)
+        if nonzero.size:
+            col = int(nonzero[0])
+            basis.append((col, row * pow(int(row[col]), -1, p) % p))
+            chosen.append(i)
+            if len(chosen) == limit:
+                break
+    return chosen
@@ -1,208 +1,197 @@
-from collections import Counter
+from .alphabets import STANDARD
+from .analysis import as_profile, chi_squared, expected_frequencies
+from .lazy import numpy as np
+from .profiling import ARITHMETIC, NORMALIZE, OUTPUT, stage
 
-# Se hace un listado del afabetico clasico de 26 letras
-alphabet = list("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
 
-# Diccionarios para facil transformación del alfabeto a su equivalente númerico
-alphabetical_decimal = {char: i for i, char in enumerate(alphabet)}
-decimal_alphabetical = {i: char for char, i in alphabetical_decimal.items()}
-
-# Se calcula el modulo para las operaciones de cifrado
-module = len(alphabet)
-common_letters = ['E', 'A', 'O']  # Letras más comunes del español
-
-
-def from_alphabetical_to_decimal(string):
+def from_alphabetical_to_decimal(string, unknown="drop", alphabet=STANDARD):
     """
     Convierte una cadena de texto al valor numérico correspondiente del alfabeto.
     Cada letra se convierte en su posición en el alfabeto (A=0, B=1, ..., Z=25).
 
     Argumentos:
     string (str): La cadena de texto a convertir.
+    unknown (str): Política para caracteres fuera del alfabeto ("drop" o "error").
+    alphabet (Alphabet): El alfabeto del cifrado.
 
     Retorna:
-    list: Lista de números que representan las posiciones de las letras en el alfabeto.
+    np.array: Arreglo de números que representan las posiciones de las letras en el alfabeto.
     """
-    return [
-        alphabetical_decimal[char.upper()]
-        for char in string
-        if char.upper() in alphabetical_decimal
-    ]
+    return alphabet.encode("".join(string), unknown)[0]
 
 
-def from_decimal_to_alphabetical(numbers):
+def from_decimal_to_alphabetical(numbers, alphabet=STANDARD):
     """
-    Convierte una lista de valores numéricos a sus correspondientes letras del alfabeto.
-    Cada número en la lista se mapea a la letra correspondiente en el alfabeto (0=A, 1=B, ..., 25=Z).
+    Convierte un arreglo de valores numéricos a sus correspondientes letras del alfabeto.
+    Cada número se mapea a la letra correspondiente en el alfabeto (0=A, 1=B, ..., 25=Z).
 
     Argumentos:
-    numbers (list): Lista de números que representan las posiciones de las letras en el alfabeto.
+    numbers (np.array): Arreglo de números que representan las posiciones de las letras en el alfabeto.
+    alphabet (Alphabet): El alfabeto del cifrado.
 
     Retorna:
-    list: Lista de letras que corresponden a los valores numéricos proporcionados
+    str: Texto con las letras que corresponden a los valores numéricos proporcionados.
     """
-    return [decimal_alphabetical[num] for num in numbers]
+    return alphabet.decode(numbers)
 
 
-def displacement_encrypt(string, displacement):
+def displacement_encrypt(string, displacement, unknown="drop", alphabet=STANDARD):
     """
     Cifra una cadena de texto usando el cifrado por desplazamiento
 
     Argumentos:
     string (str): Texto a cifrar.
+    displacement (int): Desplazamiento a aplicar.
+    unknown (str): Política para caracteres fuera del alfabeto ("drop", "keep" o "error").
+    alphabet (Alphabet): El alfabeto del cifrado.
 
     Retorna:
     str: Texto cifrado.
     """
-    # Convierte el texto a sus valores numéricos correspondientes
-    numerical_value = from_alphabetical_to_decimal(string)
-    cipher_values = []  # Lista para almacenar los valores cifrados
-
-    # Itera sobre los valores numéricos y aplica el desplazamiento
-    for i in numerical_value:
-        cipher_values.append((i + displacement) % module)  # Desplazamiento
-
-    # Convierte los valores numéricos cifrados de nuevo a letras y devuelve el texto cifrado
-    return "".join(from_decimal_to_alphabetical(cipher_values))
+    # Un desplazamiento es la clave afín (1, displacement)
+    with stage("displacement_encrypt", ARITHMETIC, len(string)):
+        return alphabet.substitution(1, displacement).encrypt(string, unknown)
 
 
-def displacement_decrypt(string, displacement):
+def displacement_decrypt(string, displacement, unknown="drop", alphabet=STANDARD):
     """
     Descifra una cadena de texto utilizando el cifrado por desplazamiento
 
     Paramteros:
     string (str): Texto a descifrar.
+    displacement (int): Desplazamiento usado para cifrar.
+    unknown (str): Política para caracteres fuera del alfabeto ("drop", "keep" o "error").
+    alphabet (Alphabet): El alfabeto del cifrado.
 
     Retorna:
     str: Texto descifrado.
     """
-    # Convierte el texto cifrado a sus valores numéricos correspondientes
-    numerical_value = from_alphabetical_to_decimal(string)
-    decrypted_values = []  # Lista para almacenar los valores numéricos descifrados
+    # Un desplazamiento es la clave afín (1, displacement)
+    with stage("displacement_decrypt", ARITHMETIC, len(string)):
+        return alphabet.substitution(1, displacement).decrypt(string, unknown)
 
-    # Itera sobre los valores numéricos y aplica el desplazamiento inverso
-    for i in numerical_value:
-        decrypted_values.append((i - displacement) % module)  # Desplazamiento inverso
 
-    # Convierte los valores numéricos descifrados de nuevo a letras y devuelve el texto descifrado
-    return "".join(from_decimal_to_alphabetical(decrypted_values))
-
-
-def multiplicative_encrypt(text, key):
+def multiplicative_encrypt(text, key, unknown="drop", alphabet=STANDARD):
     """
     Cifra un texto utilizando el cifrado multiplicativo.
 
     Parámetros:
     text (str): Texto a cifrar.
-    key (int): Clave de cifrado (debe ser coprima con 26).
+    key (int): Clave de cifrado (debe ser coprima con el tamaño del alfabeto).
+    unknown (str): Política para caracteres fuera del alfabeto ("drop", "keep" o "error").
+    alphabet (Alphabet): El alfabeto del cifrado.
 
     Retorna:
     str: Texto cifrado.
     """
 
-    numbers = from_alphabetical_to_decimal(text)
-    encrypted = [(n * key) % module for n in numbers]
-    return "".join(from_decimal_to_alphabetical(encrypted))
+    # Un cifrado multiplicativo es la clave afín (key, 0)
+    with stage("multiplicative_encrypt", ARITHMETIC, len(text)):
+        return alphabet.substitution(key, 0).encrypt(text, unknown)
 
 
-def multiplicative_decrypt(ciphertext, key):
+def multiplicative_decrypt(ciphertext, key, unknown="drop", alphabet=STANDARD):
     """
     Descifra un texto cifrado con cifrado multiplicativo.
 
     Parámetros:
     ciphertext (str): Texto cifrado.
     key (int): Clave usada para cifrar (debe ser la misma).
+    unknown (str): Política para caracteres fuera del alfabeto ("drop", "keep" o "error").
+    alphabet (Alphabet): El alfabeto del cifrado.
 
     Retorna:
     str: Texto descifrado.
     """
 
-    key_inv = pow(key, -1, module)
-    numbers = from_alphabetical_to_decimal(ciphertext)
-    decrypted = [(n * key_inv) % module for n in numbers]
-    return "".join(from_decimal_to_alphabetical(decrypted))
+    with stage("multiplicative_decrypt", ARITHMETIC, len(ciphertext)):
+        return alphabet.substitution(key, 0).decrypt(ciphertext, unknown)
 
 
-
-def frenquence_analysis(text):
+def frenquence_analysis(text, alphabet=STANDARD):
     """
     Cuenta las tres letras más frecuentes en un texto.
 
     Parámetros:
-    text (str): Texto en el que se va a contar.
+    text (str | CiphertextProfile): Texto en el que se va a contar, o su perfil.
+    alphabet (Alphabet): El alfabeto del cifrado.
 
     Retorna:
-    list: Lista de tuplas con las tres letras más frecuentes y sus conteos. Ejemplo: [('A', 10), ('E', 8), ('O', 7)]
+    list: Lista con las tres letras más frecuentes. Ejemplo: ['A', 'E', 'O']
     """
-    filtered_text = [char.upper() for char in text if char.upper() in alphabetical_decimal]
-    counter = Counter(filtered_text)
-    return [letter for letter, _ in counter.most_common(3)]
+    return list(as_profile(text, alphabet).most_common(3))
 
 
-def guess_displacement_cipher(ciphertext):
+def rank_keys(ciphertext, key_matrix, keys, language, alphabet=STANDARD, operation="rank_keys"):
     """
-    Adivina la clave de desplazamiento usando análisis de frecuencia.
+    Ordena claves candidatas por el chi-cuadrado de su texto descifrado. Las letras se
+    cuentan una sola vez; key_matrix[i, x] indica qué letra cifrada corresponde a la
+    letra plana x con la clave i, así que los conteos de todos los textos descifrados
+    salen de una sola indexación.
 
     Parámetros:
-    ciphertext (str): Texto cifrado.
+    ciphertext (str | CiphertextProfile): Texto cifrado o su perfil.
+    key_matrix (np.array): Matriz (claves x m) de letras cifradas.
+    keys (list): Las claves, en el orden de las filas de key_matrix.
+    language (str | list): "spanish", "english" o una tabla de frecuencias propia.
+    alphabet (Alphabet): El alfabeto del cifrado.
+    operation (str): Nombre del ataque en la instrumentación por etapas.
 
-    Imprime las claves posibles y los textos descifrados.
+    Retorna:
+    list: Tuplas (clave, chi-cuadrado) de mejor a peor.
     """
-    # Letras más comunes del español
-    spanish_common = from_alphabetical_to_decimal(common_letters)
+    with stage(operation, NORMALIZE, len(ciphertext)):
+        profile = as_profile(ciphertext, alphabet)
+    if len(profile) == 0:
+        raise ValueError("El texto cifrado no contiene letras del alfabeto.")
+    with stage(operation, ARITHMETIC, len(profile)):
+        counts = profile.counts
+        scores = chi_squared(counts[key_matrix], expected_frequencies(language, alphabet.modulus))
+        order = np.argsort(scores, kind="stable")
+    with stage(operation, OUTPUT):
+        return [(keys[i], float(scores[i])) for i in order]
 
-    # Letras más frecuentes en el texto cifrado
-    cipher_common = from_alphabetical_to_decimal(frenquence_analysis(ciphertext))
 
-    # Generar posibles claves comparando todas las diferencias posibles
-    candidates = []
-    for cipher_letter in cipher_common:
-        for spanish_letter in spanish_common:
-            key = (cipher_letter - spanish_letter) % module
-            candidates.append(key)
+def guess_displacement_cipher(ciphertext, language="spanish", alphabet=STANDARD):
+    """
+    Adivina la clave de desplazamiento comparando todos los desplazamientos contra la
+    frecuencia de letras del idioma. Solo cuenta letras; para obtener el texto se
+    descifra la mejor clave con displacement_decrypt.
 
-    for key in set(candidates):
-        decrypted_text = displacement_decrypt(ciphertext, key)
-        print(f"Probando clave de desplazamiento: {key}")
-        print(f"Texto descifrado: {decrypted_text}")
-        print("-" * 40)
+    Parámetros:
+    ciphertext (str | CiphertextProfile): Texto cifrado o su perfil.
+    language (str | list): "spanish", "english" o una tabla de frecuencias propia.
+    alphabet (Alphabet): El alfabeto del cifrado.
 
+    Retorna:
+    list: Tuplas (clave, chi-cuadrado) de mejor a peor.
+    """
+    shifts = np.arange(alphabet.modulus)
+    # La letra plana x se cifra como x + k
+    key_matrix = (shifts[None, :] + shifts[:, None]) % alphabet.modulus
+    return rank_keys(
+        ciphertext, key_matrix, shifts.tolist(), language, alphabet, "guess_displacement_cipher"
+    )
 
-def guess_multiplicative_cipher(ciphertext):
+
+def guess_multiplicative_cipher(ciphertext, language="spanish", alphabet=STANDARD):
     """
-    Adivina posibles claves del cifrado multiplicativo usando análisis de frecuencia.
+    Adivina la clave del cifrado multiplicativo comparando todas las claves válidas
+    contra la frecuencia de letras del idioma. Solo cuenta letras; para obtener el
+    texto se descifra la mejor clave con multiplicative_decrypt.
 
     Parámetros:
-    ciphertext (str): Texto cifrado.
+    ciphertext (str | CiphertextProfile): Texto cifrado o su perfil.
+    language (str | list): "spanish", "english" o una tabla de frecuencias propia.
+    alphabet (Alphabet): El alfabeto del cifrado.
 
-    Si hay claves válidas, imprime las claves y los textos descifrados.
-    """
-    # Letras más comunes en español (E, A, O)
-    spanish_common = from_alphabetical_to_decimal(common_letters)
-    cipher_common = from_alphabetical_to_decimal(frenquence_analysis(ciphertext))
-
-    keys = []
-
-    for c_letter in cipher_common:
-        for s_letter in spanish_common:
-            try:
-                # Resolver c ≡ k * s (mod 26) → k ≡ c * s⁻¹ (mod 26)
-                s_inv = pow(s_letter, -1, module)
-                k = (c_letter * s_inv) % module
-                # Verificamos que k tiene inverso
-                if pow(k, -1, module):
-                    keys.append(k)
-            except ValueError:
-                pass  # No tiene inverso, no es válido
-    keys = sorted(set(keys))
-    if not keys:
-        print("No se encontraron claves multiplicativas válidas.")
-    else:
-        for key in keys:
-            decrypted_text = multiplicative_decrypt(ciphertext, key)
-            print(f"Probando clave multiplicativa: {key}")
-            print(f"Texto descifrado: {decrypted_text}")
-            print("-" * 40)
+    Retorna:
+    list: Tuplas (clave, chi-cuadrado) de mejor a peor.
+    """
+    # La letra plana x se cifra como k * x
+    units = list(alphabet.units)
+    key_matrix = np.outer(units, np.arange(alphabet.modulus)) % alphabet.modulus
+    return rank_keys(ciphertext, key_matrix, units, language, alphabet, "guess_multiplicative_cipher")
 
 
 if __name__ == "__main__":
@@ -218,7 +207,10 @@ if __name__ == "__main__":
     print(f"Texto descifrado:   {displacement_decrypt(encrypted_disp, displacement_key)}")
     
     print("\n--- ATAQUE POR ANÁLISIS DE FRECUENCIA (Desplazamiento) ---")
-    guess_displacement_cipher(encrypted_disp)
+    ranking = guess_displacement_cipher(encrypted_disp)
+    for key, score in ranking[:3]:
+        print(f"Clave de desplazamiento: {key} (chi-cuadrado: {score:.2f})")
+    print(f"Texto descifrado:   {displacement_decrypt(encrypted_disp, ranking[0][0])}")
 
     # ========= CIFRADO MULTIPLICATIVO =========
     print("\n--- CIFRADO MULTIPLICATIVO ---")
@@ -229,5 +221,8 @@ if __name__ == "__main__":
     print(f"Texto descifrado:   {multiplicative_decrypt(encrypted_mult, multiplicative_key)}")
 
     print("\n--- ATAQUE POR ANÁLISIS DE FRECUENCIA (Multiplicación) ---")
-    guess_multiplicative_cipher(encrypted_mult)
+    ranking = guess_multiplicative_cipher(encrypted_mult)
+    for key, score in ranking[:3]:
+        print(f"Clave multiplicativa: {key} (chi-cuadrado: {score:.2f})")
+    print(f"Texto descifrado:   {multiplicative_decrypt(encrypted_mult, ranking[0][0])}")
 
@@ -0,0 +1,253 @@
+import json
+import sys
+from functools import cache
+
+from .codec import Codec
+from .lazy import numpy as np
+from .streaming import read_chunks
+
+# Alfabeto estandar sobre el que se entrenan los modelos
+ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+# Identificador de los archivos de tablas y alineación de los datos tras el encabezado
+MAGIC = b"NGRAMS1\n"
+ALIGNMENT = 64
+
+
+def ngram_indices(values, n, modulus):
+    """
+    Calcula el número de cada n-grama de un texto, leyendo sus n letras como un
+    número en base m, con n sumas desplazadas sobre el arreglo completo.
+    Argumentos:
+    values (np.array): Índices del alfabeto; con varias dimensiones cada fila del
+    último eje es un texto distinto.
+    n (int): El tamaño de los n-gramas.
+    modulus (int): El tamaño del alfabeto.
+    Regresa:
+    np.array: Un número en [0, m^n) por cada n-grama del texto.
+    """
+    count = values.shape[-1] - n + 1
+    if count <= 0:
+        return np.empty(values.shape[:-1] + (0,), dtype=np.intp)
+    indices = values[..., :count].astype(np.intp)
+    for k in range(1, n):
+        indices = indices * modulus + values[..., k : k + count]
+    return indices
+
+
+def log_probabilities(counts):
+    """
+    Convierte conteos de n-gramas en log-probabilidades (base 10). Los n-gramas
+    que no aparecen reciben la probabilidad de 0.01 apariciones.
+    Argumentos:
+    counts (np.array): Conteo de cada n-grama.
+    Regresa:
+    np.array: Arreglo float32 de log-probabilidades.
+    """
+    total = max(int(counts.sum()), 1)
+    return np.log10(np.maximum(counts, 0.01) / total).astype(np.float32)
+
+
+def count_ngrams(chunks, orders=(1, 2, 3, 4), alphabet=ALPHABET):
+    """
+    Cuenta los n-gramas de un corpus en una sola pasada con memoria constante. Las
+    últimas letras de cada bloque se conservan para contar los n-gramas que cruzan
+    la frontera con el siguiente.
+    Argumentos:
+    chunks (iterable): Bloques de texto, por ejemplo de streaming.read_chunks.
+    orders (tuple): Los tamaños de n-grama a contar.
+    alphabet (str): El alfabeto de las tablas.
+    Regresa:
+    dict: {n: arreglo con el conteo de cada uno de los m^n n-gramas}.
+    """
+    codec = Codec(alphabet)
+    modulus = len(alphabet)
+    counts = {n: np.zeros(modulus**n, dtype=np.int64) for n in orders}
+    carry = np.empty(0, dtype=codec.dtype)
+    for chunk in chunks:
+        values = np.concatenate([carry, codec.encode(chunk)[0]])
+        for n in orders:
+            # Los n-gramas que empiezan en el arrastre ya se contaron en el bloque anterior
+            skip = max(len(carry) - n + 1, 0)
+            indices = ngram_indices(values[skip:], n, modulus)
+            counts[n] += np.bincount(indices, minlength=modulus**n)
+        carry = values[max(len(values) - max(orders) + 1, 0) :]
+    return counts
+
+
+def save_tables(path, counts, alphabet=ALPHABET):
+    """
+    Guarda las log-probabilidades de varias tablas de n-gramas en un archivo binario:
+    un encabezado JSON con los desplazamientos seguido de los arreglos float32 planos,
+    listos para abrirse con np.memmap.
+    Argumentos:
+    path (str): La ruta del archivo a escribir.
+    counts (dict): {n: conteos}, como los regresa count_ngrams.
+    alphabet (str): El alfabeto de las tablas.
+    """
+    offsets = {}
+    position = 0
+    for n in sorted(counts):
+        offsets[n] = position
+        position += counts[n].size * 4
+    header = json.dumps({"alphabet": alphabet, "offsets": offsets}).encode("utf-8")
+    # El inicio de los datos queda alineado para que el mapeo sea eficiente
+    start = len(MAGIC) + 4 + len(header)
+    header += b" " * (-start % ALIGNMENT)
+    with open(path, "wb") as file:
+        file.write(MAGIC)
+        file.write(len(header).to_bytes(4, "little"))
+        file.write(header)
+        for n in sorted(counts):
+            file.write(log_probabilities(counts[n]).tobytes())
+
+
+class NgramTables:
+    """
+    Tablas de n-gramas abiertas desde un archivo de save_tables. Los datos no se
+    leen al abrir: cada tabla es una vista de np.memmap, así que cargar es inmediato
+    y los procesos que abren el mismo archivo comparten sus páginas en memoria.
+    """
+
+    def __init__(self, path):
+        """
+        Argumentos:
+        path (str): La ruta del archivo de tablas.
+        """
+        with open(path, "rb") as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} no es un archivo de tablas de n-gramas.")
+            size = int.from_bytes(file.read(4), "little")
+            header = json.loads(file.read(size))
+        self.path = path
+        self.alphabet = header["alphabet"]
+        modulus = len(self.alphabet)
+        data = np.memmap(path, dtype=np.float32, mode="r", offset=len(MAGIC) + 4 + size)
+        self.tables = {
+            int(n): data[offset // 4 : offset // 4 + modulus ** int(n)]
+            for n, offset in header["offsets"].items()
+        }
+        self._models = {}
+
+    def model(self, n=4):
+        """
+        Regresa el modelo de un tamaño de n-grama, sin copiar la tabla.
+        Argumentos:
+        n (int): El tamaño de los n-gramas.
+        Regresa:
+        NgramModel: El modelo respaldado por el archivo.
+        """
+        if n not in self.tables:
+            raise ValueError(f"El archivo no contiene tablas de {n}-gramas.")
+        if n not in self._models:
+            model = NgramModel(self.tables[n], n, self.alphabet)
+            model.path = self.path
+            self._models[n] = model
+        return self._models[n]
+
+
+@cache
+def open_tables(path):
+    """
+    Abre una sola vez por proceso un archivo de tablas de n-gramas.
+    """
+    return NgramTables(path)
+
+
+def open_model(path, n=4):
+    """
+    Regresa el modelo de n-gramas de un archivo de tablas, abriendo el archivo una
+    sola vez por proceso.
+    Argumentos:
+    path (str): La ruta del archivo de tablas.
+    n (int): El tamaño de los n-gramas.
+    Regresa:
+    NgramModel: El modelo respaldado por el archivo.
+    """
+    return open_tables(path).model(n)
+
+
+class NgramModel:
+    """
+    Modelo de lenguaje con las log-probabilidades (base 10) de todos los n-gramas
+    de un alfabeto en un arreglo plano. Evaluar un texto es una sola indexación.
+    """
+
+    def __init__(self, log_probs, n, alphabet=ALPHABET):
+        """
+        Argumentos:
+        log_probs (np.array): Log-probabilidad de cada n-grama, de longitud m^n.
+        n (int): El tamaño de los n-gramas.
+        alphabet (str): El alfabeto del modelo.
+        """
+        self.n = n
+        self.alphabet = alphabet
+        self.modulus = len(alphabet)
+        self.log_probs = np.asarray(log_probs, dtype=np.float32)
+        if self.log_probs.shape != (self.modulus**n,):
+            raise ValueError("La tabla no corresponde al tamaño de n-grama y alfabeto.")
+        self.codec = Codec(alphabet)
+        # Archivo de tablas del que se abrió el modelo, si se abrió de uno
+        self.path = None
+
+    def __reduce_ex__(self, protocol):
+        # Un modelo abierto de un archivo viaja a otros procesos como su ruta, y cada
+        # proceso abre el memmap en lugar de recibir una copia de la tabla
+        if self.path is not None:
+            return open_model, (self.path, self.n)
+        return super().__reduce_ex__(protocol)
+
+    @classmethod
+    def from_text(cls, text, n=4, alphabet=ALPHABET):
+        """
+        Entrena un modelo contando los n-gramas de un texto. Los n-gramas que no
+        aparecen reciben la probabilidad de 0.01 apariciones.
+        Argumentos:
+        text (str): El texto de entrenamiento.
+        n (int): El tamaño de los n-gramas.
+        alphabet (str): El alfabeto del modelo.
+        Regresa:
+        NgramModel: El modelo entrenado.
+        """
+        counts = count_ngrams([text], (n,), alphabet)[n]
+        return cls(log_probabilities(counts), n, alphabet)
+
+    def score_values(self, values):
+        """
+        Evalúa un arreglo de índices del alfabeto del modelo.
+        Argumentos:
+        values (np.array): Índices del alfabeto.
+        Regresa:
+        float: La suma de las log-probabilidades de sus n-gramas.
+        """
+        return float(self.log_probs[ngram_indices(values, self.n, self.modulus)].sum())
+
+    def score_rows(self, values):
+        """
+        Evalúa muchos candidatos del mismo largo con una sola indexación.
+        Argumentos:
+        values (np.array): Matriz (candidatos x L) de índices del alfabeto.
+        Regresa:
+        np.array: La suma de las log-probabilidades de cada candidato.
+        """
+        return self.log_probs[ngram_indices(values, self.n, self.modulus)].sum(axis=-1)
+
+    def score(self, text):
+        """
+        Evalúa qué tan parecido es un texto al idioma del modelo; mayor es mejor.
+        Argumentos:
+        text (str): El texto a evaluar.
+        Regresa:
+        float: La suma de las log-probabilidades de sus n-gramas.
+        """
+        return self.score_values(self.codec.encode(text)[0])
+
+
+if __name__ == "__main__":
+    # Uso: python -m cifrados.ngrams salida.ngrams corpus1.txt [corpus2.txt ...]
+    if len(sys.argv) < 3:
+        sys.exit("Uso: python -m cifrados.ngrams salida.ngrams corpus.txt [corpus.txt ...]")
+    output, *sources = sys.argv[1:]
+    counts = count_ngrams(chunk for source in sources for chunk in read_chunks(source))
+    save_tables(output, counts)
+    print(f"{output}: {int(counts[1].sum())} letras, tablas de 1 a 4-gramas.")
@@ -0,0 +1,330 @@
+"""
+Operaciones por lotes para el servicio y el ejecutor de trabajos. Un lote es un
+grupo de textos con el mismo cifrado, operación y clave: la clave se compila una sola
+vez (con la caché de claves) y los cifrados Vigenère y Hill transforman todos los
+textos del lote con una sola operación de NumPy. Cada resultado es un diccionario
+listo para JSON, {"result": ...} o {"error": ...}, así que un texto inválido no hace
+fallar a los demás.
+"""
+
+import json
+import math
+
+from .affine import affine_sweep
+from .alphabets import STANDARD
+from .codec import ERROR
+from .hill import ciphertext_only_attack, hill_transform, pad_values
+from .lazy import numpy as np
+from .modular import cached_inverse_mod
+from .multiplication import guess_displacement_cipher, guess_multiplicative_cipher
+from .ngrams import open_model
+from .playfair import compilar_clave, descifrar_playfair, romper_playfair
+from .profiling import ARITHMETIC, MAP, NORMALIZE, OUTPUT, stage
+from .vigenere import crack_vigenere, vigenere_decrypt
+
+CIPHERS = ("shift", "multiplicative", "affine", "vigenere", "hill", "playfair")
+OPERATIONS = ("encrypt", "decrypt", "crack")
+
+# Ataques que tardan segundos por texto y conviene mandar a un pool de procesos
+HEAVY_CRACKS = frozenset({"vigenere", "hill", "playfair"})
+
+# Tiempo de búsqueda por texto del ataque a Playfair
+PLAYFAIR_SECONDS = 30
+
+
+def normalize_key(cipher, operation, key):
+    """
+    Convierte la clave de un trabajo (de JSON o de la línea de comandos) a una forma
+    hashable, para agrupar los trabajos que comparten clave.
+    Argumentos:
+    cipher (str): El nombre del cifrado.
+    operation (str): "encrypt", "decrypt" o "crack".
+    key: Entero, lista, texto como "7,2" o matriz como lista de filas.
+    Regresa:
+    int | tuple | str | None: La clave normalizada; None si el ataque no la necesita.
+    """
+    if cipher not in CIPHERS:
+        raise ValueError(f"Cifrado desconocido: {cipher!r}.")
+    if operation not in OPERATIONS:
+        raise ValueError(f"Operación desconocida: {operation!r}.")
+    if operation == "crack":
+        # Solo el ataque a Hill necesita un dato: el tamaño de la matriz
+        if cipher != "hill":
+            return None
+        size = integer(key, "El tamaño de la matriz Hill")
+        if size < 1:
+            raise ValueError("El tamaño de la matriz Hill debe ser positivo.")
+        return size
+    if key is None:
+        raise ValueError("Falta la clave.")
+    if cipher in ("vigenere", "playfair"):
+        return str(key)
+    if isinstance(key, str):
+        key = key.split(",")
+    if cipher in ("shift", "multiplicative"):
+        if isinstance(key, (list, tuple)):
+            if len(key) != 1:
+                raise ValueError(f"La clave de {cipher} debe ser un solo número.")
+            key = key[0]
+        return integer(key, "La clave")
+    if cipher == "affine":
+        if not isinstance(key, (list, tuple)) or len(key) != 2:
+            raise ValueError("La clave afín debe tener dos números, a y b.")
+        return integer(key[0], "La clave a"), integer(key[1], "La clave b")
+    try:
+        numbers = np.asarray(key, dtype=np.int64)
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError("La matriz Hill debe ser una lista de filas de enteros.") from None
+    size = int(round(numbers.size**0.5))
+    if numbers.size == 0 or size * size != numbers.size:
+        raise ValueError("La matriz Hill debe tener n x n números.")
+    return tuple(map(tuple, numbers.reshape(size, size).tolist()))
+
+
+def integer(value, name):
+    """
+    Convierte una parte de la clave a entero, con un ValueError si no lo es.
+    """
+    if isinstance(value, bool) or isinstance(value, float) and not value.is_integer():
+        raise ValueError(f"{name} debe ser un entero.")
+    try:
+        return int(value)
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError(f"{name} debe ser un entero.") from None
+
+
+def first_candidate(results):
+    """
+    Regresa el mejor candidato de un ataque, o un ValueError si no encontró ninguno.
+    """
+    if not results:
+        raise ValueError("El ataque no encontró ninguna clave candidata.")
+    return results[0]
+
+
+def error_message(error):
+    """
+    Texto del error de un trabajo: el mensaje de los ValueError y, para cualquier otra
+    excepción, también su tipo.
+    """
+    return str(error) if isinstance(error, ValueError) else f"{type(error).__name__}: {error}"
+
+
+def each(function, texts):
+    """
+    Aplica una función a cada texto, guardando los errores de cada uno.
+    """
+    results = []
+    for text in texts:
+        try:
+            results.append({"result": function(text)})
+        except Exception as error:
+            results.append({"error": error_message(error)})
+    return results
+
+
+def finite(value):
+    """
+    Reemplaza recursivamente los float no finitos por None, que JSON sí admite.
+    """
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [finite(item) for item in value]
+    return value
+
+
+def json_line(data):
+    """
+    Serializa una respuesta como una línea de JSON estricto: un NaN o un infinito
+    se escribe como null en lugar de NaN o Infinity, que no son JSON válido.
+    """
+    try:
+        text = json.dumps(data, ensure_ascii=False, allow_nan=False)
+    except ValueError:
+        text = json.dumps(finite(data), ensure_ascii=False, allow_nan=False)
+    return text + "\n"
+
+
+def substitution_batch(texts, a, b, decrypt, alphabet):
+    with stage("substitution_batch", MAP):
+        key = alphabet.substitution(a, b)
+    with stage("substitution_batch", ARITHMETIC, sum(map(len, texts))):
+        return each(key.decrypt if decrypt else key.encrypt, texts)
+
+
+def vigenere_batch(texts, key, decrypt, alphabet):
+    """
+    Cifra o descifra un lote con Vigenère. Los textos se concatenan y la fase de la
+    clave de cada letra es su posición dentro de su propio texto.
+    """
+    with stage("vigenere_batch", NORMALIZE, len(key)):
+        key_values = alphabet.encode(key, ERROR)[0].astype(np.int64)
+        if len(key_values) == 0:
+            raise ValueError("La clave no puede estar vacía.")
+        if decrypt:
+            key_values = -key_values
+    with stage("vigenere_batch", MAP, sum(map(len, texts))):
+        encoded = [alphabet.encode(text)[0] for text in texts]
+        lengths = np.array([len(values) for values in encoded], dtype=np.int64)
+        values = np.concatenate(encoded) if encoded else np.empty(0, dtype=alphabet.codec.dtype)
+    with stage("vigenere_batch", ARITHMETIC, len(values)):
+        starts = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        positions = np.arange(len(values)) - starts
+        result = ((values + key_values[positions % len(key_values)]) % alphabet.modulus).astype(values.dtype)
+    with stage("vigenere_batch", OUTPUT, len(result)):
+        pieces = np.split(result, np.cumsum(lengths)[:-1])
+        return [{"result": alphabet.decode(piece)} for piece in pieces]
+
+
+def hill_batch(texts, key, decrypt, alphabet, pad="X"):
+    """
+    Cifra o descifra un lote con Hill. Cada texto se valida y se rellena por separado
+    con 'pad' y todos los bloques se multiplican juntos por la matriz.
+    """
+    with stage("hill_batch", MAP):
+        matrix = np.array(key, dtype=np.int64)
+        size = matrix.shape[0]
+        matrix = cached_inverse_mod(matrix, alphabet.modulus) if decrypt else matrix % alphabet.modulus
+    results = [None] * len(texts)
+    valid, encoded = [], []
+    with stage("hill_batch", NORMALIZE, sum(map(len, texts))):
+        for i, text in enumerate(texts):
+            try:
+                values = alphabet.encode(text, ERROR)[0]
+            except ValueError:
+                results[i] = {"error": "El mensaje contiene caracteres no válidos."}
+                continue
+            if decrypt and len(values) % size:
+                results[i] = {"error": "La longitud del mensaje no es múltiplo del tamaño de la matriz."}
+                continue
+            try:
+                values = pad_values(values, size, alphabet, pad)
+            except ValueError as error:
+                results[i] = {"error": str(error)}
+                continue
+            valid.append(i)
+            encoded.append(values)
+    if encoded:
+        lengths = [len(values) for values in encoded]
+        with stage("hill_batch", ARITHMETIC, sum(lengths)):
+            transformed = hill_transform(np.concatenate(encoded), matrix, alphabet.modulus)
+        with stage("hill_batch", OUTPUT, len(transformed)):
+            for i, piece in zip(valid, np.split(transformed, np.cumsum(lengths)[:-1])):
+                results[i] = {"result": alphabet.decode(piece)}
+    return results
+
+
+def playfair_batch(texts, key, decrypt):
+    compiled = compilar_clave(key)
+    return each(compiled.descifrar if decrypt else compiled.cifrar, texts)
+
+
+def playfair_model(path):
+    """
+    Abre una sola vez por proceso las tablas de n-gramas usadas contra Playfair.
+    """
+    return open_model(path)
+
+
+def crack_batch(cipher, key, texts, language, alphabet, ngrams):
+    """
+    Ataca cada texto de un lote y regresa la mejor clave con el texto descifrado.
+    """
+    options = {} if language is None else {"language": language}
+    if cipher in ("shift", "multiplicative"):
+        guess = guess_displacement_cipher if cipher == "shift" else guess_multiplicative_cipher
+
+        def crack(text):
+            best, score = first_candidate(guess(text, alphabet=alphabet, **options))
+            a, b = (1, best) if cipher == "shift" else (best, 0)
+            return {"key": best, "score": score, "plaintext": alphabet.substitution(a, b).decrypt(text)}
+
+        return each(crack, texts)
+    if cipher == "affine":
+        # Todo el lote se evalúa con un producto de matrices
+        keys, scores = affine_sweep(texts, top=1, alphabet=alphabet, **options)
+        results = []
+        for text, (a, b), score in zip(texts, keys[:, 0].tolist(), scores[:, 0].tolist()):
+            if not math.isfinite(score):
+                results.append({"error": "El texto cifrado no contiene letras del alfabeto."})
+                continue
+            plaintext = alphabet.substitution(a, b).decrypt(text)
+            results.append({"result": {"key": [a, b], "score": score, "plaintext": plaintext}})
+        return results
+    if cipher == "vigenere":
+
+        def crack(text):
+            best, score, _ = first_candidate(crack_vigenere(text, alphabet=alphabet, **options))
+            return {"key": best, "score": score, "plaintext": vigenere_decrypt(text, best, alphabet=alphabet)}
+
+        return each(crack, texts)
+    if cipher == "hill":
+
+        def crack(text):
+            values = alphabet.encode(text, ERROR)[0]
+            candidates = ciphertext_only_attack(text, key, top=1, workers=1, alphabet=alphabet, **options)
+            matrix, score = first_candidate(candidates)
+            plain = hill_transform(values[: len(values) // key * key], matrix, alphabet.modulus)
+            return {"key": matrix.tolist(), "score": float(score), "plaintext": alphabet.decode(plain)}
+
+        return each(crack, texts)
+    if ngrams is None:
+        raise ValueError("El ataque a Playfair necesita tablas de n-gramas.")
+
+    def crack(text):
+        best, score = first_candidate(romper_playfair(text, playfair_model(ngrams), PLAYFAIR_SECONDS, procesos=1))
+        return {"key": best, "score": score, "plaintext": descifrar_playfair(text, best)}
+
+    return each(crack, texts)
+
+
+def run_batch(cipher, operation, key, texts, language=None, alphabet=STANDARD, ngrams=None):
+    """
+    Ejecuta una operación sobre un lote de textos que comparten cifrado y clave.
+    Argumentos:
+    cipher (str): El nombre del cifrado, uno de CIPHERS.
+    operation (str): "encrypt", "decrypt" o "crack".
+    key: La clave normalizada con normalize_key.
+    texts (list): Los textos del lote.
+    language (str, optional): El idioma esperado en los ataques; por defecto el de cada ataque.
+    alphabet (Alphabet): El alfabeto del cifrado (Playfair usa siempre su cuadro).
+    ngrams (str, optional): Ruta de las tablas de n-gramas para atacar Playfair.
+    Regresa:
+    list: Un diccionario {"result": ...} o {"error": ...} por texto, en orden.
+    """
+    decrypt = operation == "decrypt"
+    try:
+        if operation == "crack":
+            return crack_batch(cipher, key, texts, language, alphabet, ngrams)
+        if cipher == "shift":
+            return substitution_batch(texts, 1, key, decrypt, alphabet)
+        if cipher == "multiplicative":
+            return substitution_batch(texts, key, 0, decrypt, alphabet)
+        if cipher == "affine":
+            return substitution_batch(texts, *key, decrypt, alphabet)
+        if cipher == "vigenere":
+            return vigenere_batch(texts, key, decrypt, alphabet)
+        if cipher == "hill":
+            return hill_batch(texts, key, decrypt, alphabet)
+        return playfair_batch(texts, key, decrypt)
+    except Exception as error:
+        # Un error de la clave afecta a todo el lote
+        return [{"error": error_message(error)}] * len(texts)
+
+
+def warm_worker(ngrams=None):
+    """
+    Inicializador de los procesos del pool: construye una vez las tablas del alfabeto
+    y, si hay, abre las tablas de n-gramas, para que la primera tarea no pague la
+    preparación.
+    Argumentos:
+    ngrams (str, optional): Ruta de las tablas de n-gramas para atacar Playfair.
+    """
+    # Las propiedades construyen las tablas de NumPy la primera vez que se leen
+    STANDARD.codec
+    STANDARD.inverses
+    if ngrams is not None:
+        playfair_model(ngrams)
@@ -0,0 +1,160 @@
+"""
+Cifrado en paralelo con hilos. El texto se divide en segmentos independientes que se
+procesan en un ThreadPoolExecutor sin estado mutable compartido: el alfabeto y las
+claves compiladas son inmutables y cada hilo escribe solo su segmento. En el CPython
+sin GIL (3.13t) los hilos corren a la vez; con GIL solo escalan las partes de NumPy.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from .alphabets import STANDARD
+from .codec import DROP, ERROR
+from .hill import pad_values
+from .lazy import numpy as np
+from .modular import cached_inverse_mod, matrix_product_mod
+
+# Caracteres mínimos por segmento; segmentos más pequeños no compensan el reparto
+SEGMENT_CHARS = 1 << 18
+
+# Letras multiplicadas a la vez dentro de un segmento Hill; acota la memoria intermedia
+CHUNK_ELEMENTS = 1 << 20
+
+
+def split_points(length, workers, align=1, minimum=None):
+    """
+    Divide un rango en segmentos de tamaño parecido, con fronteras múltiplos de 'align'.
+    Argumentos:
+    length (int): La longitud total.
+    workers (int): El número de hilos.
+    align (int): Múltiplo al que se alinean las fronteras (n en el cifrado Hill).
+    minimum (int, optional): Tamaño mínimo de cada segmento; por defecto SEGMENT_CHARS.
+    Regresa:
+    list: Pares (inicio, fin) que cubren [0, length).
+    """
+    minimum = SEGMENT_CHARS if minimum is None else minimum
+    count = max(1, min(workers, length // max(minimum, 1)))
+    size = max(-(-length // count), 1)
+    size += -size % align
+    return [(start, min(start + size, length)) for start in range(0, length, size)] or [(0, 0)]
+
+
+def run_segments(function, arguments, workers):
+    """
+    Ejecuta una función sobre cada segmento, en hilos si hay más de uno.
+    Argumentos:
+    function (callable): La función a aplicar.
+    arguments (list): Un argumento por segmento.
+    workers (int): El número de hilos.
+    Regresa:
+    list: Los resultados, en el orden de los segmentos.
+    """
+    if workers <= 1 or len(arguments) <= 1:
+        return [function(argument) for argument in arguments]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(function, arguments))
+
+
+def parallel_affine(text, a, b, decrypt=False, alphabet=STANDARD, unknown=DROP, workers=None):
+    """
+    Cifra o descifra con el cifrado afín en paralelo. Cada carácter se transforma por
+    separado, así que el texto se corta en cualquier posición.
+    Argumentos:
+    text (str): El texto.
+    a (int): El multiplicador.
+    b (int): El desplazamiento.
+    decrypt (bool): True para descifrar.
+    alphabet (Alphabet): El alfabeto del cifrado.
+    unknown (str): Política para caracteres fuera del alfabeto ("drop", "keep" o "error").
+    workers (int, optional): Número de hilos; por defecto uno por núcleo.
+    Regresa:
+    str: El texto transformado.
+    """
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    key = alphabet.substitution(a, b)
+    transform = key.decrypt if decrypt else key.encrypt
+    pieces = [text[start:stop] for start, stop in split_points(len(text), workers)]
+    return "".join(run_segments(lambda piece: transform(piece, unknown), pieces, workers))
+
+
+def parallel_shift(text, shift, decrypt=False, alphabet=STANDARD, unknown=DROP, workers=None):
+    """
+    Cifra o descifra con un desplazamiento en paralelo (a = 1 en el cifrado afín).
+    """
+    return parallel_affine(text, 1, shift, decrypt, alphabet, unknown, workers)
+
+
+def parallel_vigenere(text, key, decrypt=False, alphabet=STANDARD, unknown=DROP, workers=None):
+    """
+    Cifra o descifra con Vigenère en paralelo. Cada segmento se convierte a índices por
+    separado; con la cantidad de letras válidas de los segmentos anteriores se calcula
+    la fase de la clave con la que empieza cada uno.
+    Argumentos:
+    text (str): El texto.
+    key (str): La clave.
+    decrypt (bool): True para descifrar.
+    alphabet (Alphabet): El alfabeto del cifrado.
+    unknown (str): Política para caracteres fuera del alfabeto ("drop", "keep" o "error").
+    workers (int, optional): Número de hilos; por defecto uno por núcleo.
+    Regresa:
+    str: El texto transformado.
+    """
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    key_values = alphabet.encode(key, ERROR)[0].astype(np.int32)
+    if len(key_values) == 0:
+        raise ValueError("La clave no puede estar vacía.")
+    if decrypt:
+        key_values = -key_values
+    pieces = [text[start:stop] for start, stop in split_points(len(text), workers)]
+    encoded = run_segments(lambda piece: alphabet.encode(piece, unknown), pieces, workers)
+    lengths = [len(values) for values, _ in encoded]
+    phases = (np.cumsum([0] + lengths[:-1]) % len(key_values)).tolist()
+
+    def transform(segment):
+        (values, layout), phase = segment
+        shifts = np.resize(np.roll(key_values, -phase), len(values))
+        result = (values + shifts) % alphabet.modulus
+        return alphabet.decode(result.astype(values.dtype), layout)
+
+    return "".join(run_segments(transform, list(zip(encoded, phases)), workers))
+
+
+def parallel_hill(text, matrix, decrypt=False, alphabet=STANDARD, workers=None, pad="X"):
+    """
+    Cifra o descifra con el cifrado Hill en paralelo. El texto se convierte a índices
+    por segmentos y luego se reparte en segmentos alineados a bloques de n letras, que
+    cada hilo multiplica sobre su parte del arreglo de salida.
+    Argumentos:
+    text (str): El texto; solo puede contener caracteres del alfabeto.
+    matrix (np.array): La matriz clave n x n.
+    decrypt (bool): True para descifrar con la inversa de la matriz.
+    alphabet (Alphabet): El alfabeto del cifrado.
+    workers (int, optional): Número de hilos; por defecto uno por núcleo.
+    pad (str): Letra de relleno del último bloque al cifrar.
+    Regresa:
+    str: El texto transformado.
+    """
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    matrix = np.asarray(matrix, dtype=np.int64)
+    size = matrix.shape[0]
+    if decrypt:
+        matrix = cached_inverse_mod(matrix, alphabet.modulus)
+    pieces = [text[start:stop] for start, stop in split_points(len(text), workers)]
+    encoded = run_segments(lambda piece: alphabet.encode(piece, ERROR)[0], pieces, workers)
+    values = np.concatenate(encoded)
+    if decrypt and len(values) % size:
+        raise ValueError("La longitud del mensaje no es múltiplo del tamaño de la matriz.")
+    values = pad_values(values, size, alphabet, pad)
+
+    result = np.empty_like(values)
+
+    def transform(bounds):
+        start, stop = bounds
+        step = max(size, CHUNK_ELEMENTS - CHUNK_ELEMENTS % size)
+        for chunk in range(start, stop, step):
+            blocks = values[chunk : min(chunk + step, stop)].reshape(-1, size)
+            product = matrix_product_mod(blocks, matrix, alphabet.modulus)
+            result[chunk : chunk + product.size] = product.ravel()
+        return alphabet.decode(result[start:stop])
+
+    return "".join(run_segments(transform, split_points(len(values), workers, size), workers))
@@ -1,4 +1,19 @@
+import math
+import os
+import random
 import string
+import time
+from functools import cache
+from types import SimpleNamespace
+
+from .analysis import CiphertextProfile
+from .keycache import KEY_CACHE
+from .lazy import numpy as np
+from .ngrams import ngram_indices, open_model
+from .profiling import ARITHMETIC, MAP, NORMALIZE, OUTPUT, stage
+
+# Alfabeto de 25 letras del cuadro (la J se trata como I)
+ALFABETO = string.ascii_uppercase.replace("J", "")
 
 
 def crear_matriz_clave(clave):
@@ -15,22 +30,27 @@ def crear_matriz_clave(clave):
     return [matriz[i : i + 5] for i in range(0, 25, 5)]
 
 
-def preparar_pares(texto):
+def preparar_texto(texto):
     texto = texto.upper().replace("J", "I")
     texto = "".join(filter(str.isalpha, texto))
-    pares = []
+    letras = []
     i = 0
 
     while i < len(texto):
         a = texto[i]
         b = texto[i + 1] if i + 1 < len(texto) else "X"
         if a == b:
-            pares.append((a, "X"))
+            letras += (a, "X")
             i += 1
         else:
-            pares.append((a, b))
+            letras += (a, b)
             i += 2
-    return pares
+    return "".join(letras)
+
+
+def preparar_pares(texto):
+    texto = preparar_texto(texto)
+    return list(zip(texto[0::2], texto[1::2]))
 
 
 def buscar_posicion(matriz, letra):
@@ -64,33 +84,273 @@ def descifrar_par(matriz, a, b):
         return matriz[fila_a][col_b], matriz[fila_b][col_a]
 
 
+def tabla_casillas(paso):
+    # Para cada par de casillas (pa * 25 + pb) del cuadro, las casillas donde quedan
+    # sus letras al cifrar (paso 1) o descifrar (paso -1); no depende de la clave
+    casilla_a, casilla_b = np.divmod(np.arange(625), 25)
+    fila_a, col_a = np.divmod(casilla_a, 5)
+    fila_b, col_b = np.divmod(casilla_b, 5)
+    misma_fila = fila_a == fila_b
+    misma_col = (col_a == col_b) & ~misma_fila
+
+    nueva_col_a = np.where(misma_fila, (col_a + paso) % 5, np.where(misma_col, col_a, col_b))
+    nueva_col_b = np.where(misma_fila, (col_b + paso) % 5, np.where(misma_col, col_b, col_a))
+    nueva_fila_a = np.where(misma_col, (fila_a + paso) % 5, fila_a)
+    nueva_fila_b = np.where(misma_col, (fila_b + paso) % 5, fila_b)
+    return np.column_stack([nueva_fila_a * 5 + nueva_col_a, nueva_fila_b * 5 + nueva_col_b])
+
+
+@cache
+def tablas():
+    # Tablas fijas del cuadro; se construyen en el primer uso para que importar el
+    # módulo no cargue NumPy
+    indices = np.full(256, 255, dtype=np.uint8)
+    indices[[ord(c) for c in ALFABETO]] = np.arange(25)
+    return SimpleNamespace(
+        # Código ASCII -> índice en ALFABETO; 255 para caracteres fuera del cuadro
+        indices=indices,
+        codigos=np.frombuffer(ALFABETO.encode("ascii"), dtype=np.uint8).astype(np.uint16),
+        # Las dos letras de cada uno de los 625 digramas, en el orden a * 25 + b
+        digrama_a=np.repeat(np.arange(25), 25),
+        digrama_b=np.tile(np.arange(25), 25),
+        casillas={1: tabla_casillas(1), -1: tabla_casillas(-1)},
+    )
+
+
+def transformar_digramas(cuadro, a, b, paso):
+    # Versión vectorizada de cifrar_par (paso 1) y descifrar_par (paso -1) sobre
+    # arreglos de índices de letra; cuadro[casilla] es la letra en esa casilla.
+    # Regresa una matriz (pares x 2) con las letras resultantes
+    posicion = np.empty(25, dtype=np.intp)
+    posicion[cuadro] = np.arange(25)
+    return cuadro[tablas().casillas[paso][posicion[a] * 25 + posicion[b]]]
+
+
+class ClavePlayfair:
+    """
+    Clave Playfair compilada: tablas de 625 digramas (25 x 25) para cifrar y descifrar,
+    indexadas por el número de par a * 25 + b.
+    """
+
+    def __init__(self, clave):
+        self.matriz = crear_matriz_clave(clave)
+        t = tablas()
+        cuadro = t.indices[np.frombuffer("".join(sum(self.matriz, [])).encode(), dtype=np.uint8)]
+        # Cada entrada guarda los dos caracteres ASCII de salida en un uint16 little-endian
+        # explícito, así que tobytes() da primero la primera letra en cualquier máquina
+        cifrado = t.codigos[transformar_digramas(cuadro, t.digrama_a, t.digrama_b, 1)]
+        self.tabla_cifrado = (cifrado[:, 0] | cifrado[:, 1] << 8).astype("<u2")
+        descifrado = t.codigos[transformar_digramas(cuadro, t.digrama_a, t.digrama_b, -1)]
+        self.tabla_descifrado = (descifrado[:, 0] | descifrado[:, 1] << 8).astype("<u2")
+        # La clave compilada se comparte desde la caché de claves: tablas de solo lectura
+        self.tabla_cifrado.flags.writeable = False
+        self.tabla_descifrado.flags.writeable = False
+
+    def cifrar(self, texto):
+        return self._aplicar(self.tabla_cifrado, texto, "cifrar_playfair")
+
+    def descifrar(self, texto):
+        return self._aplicar(self.tabla_descifrado, texto, "descifrar_playfair")
+
+    def _aplicar(self, tabla, texto, operacion):
+        with stage(operacion, NORMALIZE, len(texto)):
+            texto = preparar_texto(texto)
+        with stage(operacion, MAP, len(texto)):
+            if not texto.isascii():
+                raise ValueError("El texto contiene letras fuera del cuadro Playfair.")
+            indices = tablas().indices[np.frombuffer(texto.encode("ascii"), dtype=np.uint8)]
+            if (indices == 255).any():
+                raise ValueError("El texto contiene letras fuera del cuadro Playfair.")
+        # Todo el mensaje se sustituye con una sola indexación sobre la tabla
+        with stage(operacion, ARITHMETIC, len(indices)):
+            resultado = tabla[indices[0::2].astype(np.intp) * 25 + indices[1::2]]
+        with stage(operacion, OUTPUT, len(indices)):
+            return resultado.tobytes().decode("ascii")
+
+
+def compilar_clave(clave):
+    # El cuadro depende solo de las letras de la clave normalizadas
+    clave = clave.upper().replace("J", "I")
+    return KEY_CACHE.get(("playfair", clave), lambda: ClavePlayfair(clave))
+
+
 def cifrar_playfair(texto, clave):
-    matriz = crear_matriz_clave(clave)
-    pares = preparar_pares(texto)
-    resultado = ""
-    for a, b in pares:
-        c1, c2 = cifrar_par(matriz, a, b)
-        resultado += c1 + c2
-    return resultado
+    return compilar_clave(clave).cifrar(texto)
 
 
 def descifrar_playfair(texto, clave):
-    matriz = crear_matriz_clave(clave)
-    pares = preparar_pares(texto)
-    resultado = ""
-    for a, b in pares:
-        d1, d2 = descifrar_par(matriz, a, b)
-        resultado += d1 + d2
-    return resultado
+    return compilar_clave(clave).descifrar(texto)
+
+
+def mover_cuadro(cuadro, rng):
+    # Vecino aleatorio del cuadro: casi siempre un intercambio de dos letras y a
+    # veces un intercambio de filas o columnas o una inversión
+    nuevo = cuadro.copy()
+    filas = nuevo.reshape(5, 5)
+    movimiento = rng.random()
+    if movimiento < 0.9:
+        i, j = rng.randrange(25), rng.randrange(25)
+        nuevo[i], nuevo[j] = cuadro[j], cuadro[i]
+    elif movimiento < 0.92:
+        i, j = rng.randrange(5), rng.randrange(5)
+        filas[[i, j]] = filas[[j, i]]
+    elif movimiento < 0.94:
+        i, j = rng.randrange(5), rng.randrange(5)
+        filas[:, [i, j]] = filas[:, [j, i]]
+    elif movimiento < 0.96:
+        filas[:] = filas[::-1].copy()
+    elif movimiento < 0.98:
+        filas[:] = filas[:, ::-1].copy()
+    else:
+        nuevo = nuevo[::-1].copy()
+    return nuevo
+
+
+class EvaluadorPlayfair:
+    """
+    Evalúa cuadros candidatos contra un texto cifrado fijo. Las casillas resultantes de
+    cada par de casillas ya están precalculadas (tablas().casillas) y la tabla del modelo se
+    reordena una vez al alfabeto del cuadro, así que cada candidato cuesta unas pocas
+    indexaciones sobre el texto.
+    """
+
+    def __init__(self, texto_cifrado, modelo):
+        texto = texto_cifrado.upper().replace("J", "I")
+        indices = tablas().indices[np.frombuffer(texto.encode("ascii", "ignore"), dtype=np.uint8)]
+        indices = indices[indices != 255].astype(np.intp)
+        if len(indices) % 2:
+            raise ValueError("El texto cifrado debe tener un número par de letras.")
+        self.a, self.b = indices[0::2], indices[1::2]
+        # Log-probabilidades del modelo indexadas por n-gramas del alfabeto del cuadro
+        conversion = np.array([modelo.alphabet.index(c) for c in ALFABETO])
+        tabla = conversion
+        for _ in range(modelo.n - 1):
+            tabla = (tabla[:, None] * modelo.modulus + conversion).ravel()
+        self.log_probs = modelo.log_probs[tabla]
+        self.n = modelo.n
+        self.casillas = tablas().casillas[-1]
+
+    def descifrar(self, cuadro):
+        posicion = np.empty(25, dtype=np.intp)
+        posicion[cuadro] = np.arange(25)
+        return cuadro[self.casillas[posicion[self.a] * 25 + posicion[self.b]]].ravel()
+
+    def puntaje(self, cuadro):
+        return float(self.log_probs[ngram_indices(self.descifrar(cuadro), self.n, 25)].sum())
+
+
+def recocido_simulado(evaluador, rng, iteraciones, temperatura, limite):
+    # Un reinicio de recocido simulado a temperatura constante, que en Playfair
+    # funciona mejor que un enfriamiento; se detiene al llegar a 'limite'
+    # (time.monotonic) aunque no termine las iteraciones
+    cuadro = np.array(rng.sample(range(25), 25))
+    puntaje = evaluador.puntaje(cuadro)
+    mejor, mejor_puntaje = cuadro, puntaje
+    for i in range(iteraciones):
+        if i % 1000 == 0 and time.monotonic() > limite:
+            break
+        candidato = mover_cuadro(cuadro, rng)
+        nuevo_puntaje = evaluador.puntaje(candidato)
+        diferencia = nuevo_puntaje - puntaje
+        if diferencia >= 0 or rng.random() < math.exp(diferencia / temperatura):
+            cuadro, puntaje = candidato, nuevo_puntaje
+            if puntaje > mejor_puntaje:
+                mejor, mejor_puntaje = cuadro, puntaje
+    return mejor, mejor_puntaje
+
+
+def reinicios_playfair(texto_cifrado, modelo, segundos, iteraciones, temperatura, semilla):
+    # Tarea de cada proceso: reinicios independientes hasta agotar el tiempo
+    evaluador = EvaluadorPlayfair(texto_cifrado, modelo)
+    rng = random.Random(semilla)
+    limite = time.monotonic() + segundos
+    resultados = []
+    while time.monotonic() < limite:
+        cuadro, puntaje = recocido_simulado(evaluador, rng, iteraciones, temperatura, limite)
+        resultados.append(("".join(ALFABETO[i] for i in cuadro), puntaje))
+    return resultados
+
+
+def romper_playfair(
+    texto_cifrado,
+    modelo,
+    segundos=300,
+    procesos=None,
+    iteraciones=1_000_000,
+    temperatura=None,
+    mejores=5,
+    semilla=None,
+):
+    """
+    Busca la clave de un texto cifrado con Playfair sin conocer texto plano, con
+    recocido simulado sobre los cuadros de 5 x 5 evaluados con un modelo de n-gramas.
+    Los reinicios se reparten en un pool de procesos con un límite de tiempo.
+    Argumentos:
+    texto_cifrado (str | CiphertextProfile): El texto cifrado o su perfil.
+    modelo (NgramModel | str): Modelo de lenguaje del texto plano esperado, o la ruta
+    de un archivo de tablas de n-gramas. Un modelo abierto de un archivo se manda a
+    los procesos como su ruta y cada uno abre las tablas por su cuenta.
+    segundos (float): Límite de tiempo real de la búsqueda; los procesos corren en paralelo.
+    procesos (int, optional): Número de procesos; por defecto uno por núcleo.
+    iteraciones (int): Iteraciones de cada reinicio.
+    temperatura (float, optional): Temperatura positiva del recocido; por defecto depende
+    de la longitud.
+    mejores (int): Número de claves a devolver.
+    semilla (int, optional): Semilla para resultados reproducibles.
+    Regresa:
+    list: Tuplas (clave, puntaje) de mejor a peor; la clave de 25 letras sirve
+    directamente para descifrar_playfair.
+    """
+    with stage("romper_playfair", NORMALIZE, len(texto_cifrado)):
+        if isinstance(texto_cifrado, CiphertextProfile):
+            # Los procesos reciben solo las letras ya normalizadas
+            texto_cifrado = texto_cifrado.codec.decode(texto_cifrado.values)
+    if isinstance(modelo, str):
+        modelo = open_model(modelo)
+    # Se valida aquí para que los procesos no fallen a media búsqueda
+    letras = sum(map(ALFABETO.__contains__, texto_cifrado.upper().replace("J", "I")))
+    minimo = max(modelo.n, 2)
+    if letras < minimo:
+        raise ValueError(f"El texto cifrado necesita al menos {minimo} letras para romperse.")
+    if letras % 2:
+        raise ValueError("El texto cifrado debe tener un número par de letras.")
+    if temperatura is None:
+        # Las diferencias de puntaje crecen con la longitud del texto
+        temperatura = 0.02 * letras
+    elif temperatura <= 0:
+        raise ValueError("La temperatura debe ser positiva.")
+    procesos = (os.cpu_count() or 1) if procesos is None else procesos
+    semillas = np.random.SeedSequence(semilla).generate_state(procesos).tolist()
+    argumentos = [
+        (texto_cifrado, modelo, segundos, iteraciones, temperatura, s) for s in semillas
+    ]
+    with stage("romper_playfair", ARITHMETIC, len(texto_cifrado)):
+        if procesos > 1:
+            # Se importa aquí porque multiprocessing domina el tiempo de importar el módulo
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=procesos) as executor:
+                resultados = sum(executor.map(reinicios_playfair, *zip(*argumentos)), [])
+        else:
+            resultados = reinicios_playfair(*argumentos[0])
+    with stage("romper_playfair", OUTPUT):
+        # Un mismo cuadro puede aparecer en varios reinicios
+        unicos = dict(sorted(resultados, key=lambda r: r[1]))
+        return sorted(unicos.items(), key=lambda r: r[1], reverse=True)[:mejores]
+
+
+def demo():
+    # ====== Prueba del cifrado Playfair ======
+    clave = "KEYWORD"
+    mensaje = "WHYDONTYOU"
 
+    cifrado = cifrar_playfair(mensaje, clave)
+    descifrado = descifrar_playfair(cifrado, clave)
 
-# ====== Prueba del cifrado Playfair ======
-clave = "KEYWORD"
-mensaje = "WHYDONTYOU"
+    print(f"Mensaje original: {mensaje}")
+    print(f"Cifrado: {cifrado}")
+    print(f"Descifrado: {descifrado}")
 
-cifrado = cifrar_playfair(mensaje, clave)
-descifrado = descifrar_playfair(cifrado, clave)
 
-print(f"Mensaje original: {mensaje}")
-print(f"Cifrado: {cifrado}")
-print(f"Descifrado: {descifrado}")
+if __name__ == "__main__":
+    demo()
@@ -0,0 +1,281 @@
+"""
+Instrumentación opcional por etapas. Cada cifrado y cada ataque marca sus etapas
+(normalización, conversión al alfabeto, aritmética y salida) con stage(); mientras la
+instrumentación está activa se acumulan por operación y etapa el tiempo real, los
+caracteres procesados y, si se pide, la memoria pico de tracemalloc, junto con los
+aciertos de la caché de claves:
+
+    from cifrados import profiling
+    profiling.enable(memory=True)
+    vigenere_encrypt(texto, "LEMON")
+    print(profiling.report())
+
+tracemalloc guarda un solo pico para todo el proceso, así que la memoria pico solo se
+mide en etapas que no se solapan con otras: si una etapa se anida en otra o corre a la
+vez en otro hilo (por ejemplo los segmentos de parallel), ninguna de las dos registra
+pico y su columna de memoria queda vacía.
+
+Desactivada (lo predeterminado), stage() solo compara una variable y regresa un
+contexto vacío compartido, así que no reserva memoria ni mide nada; lo que cuesta es
+el propio bloque with, unos cientos de nanosegundos por etapa. Por eso los cifrados
+por sustitución, donde str.translate normaliza, sustituye y une en una sola llamada,
+registran una sola etapa "arithmetic" que incluye tomar la clave de la caché.
+Uso: python -m cifrados.profiling [letras]
+"""
+
+import sys
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+
+from .keycache import KEY_CACHE
+
+# Nombres comunes de las etapas
+NORMALIZE = "normalize"  # Limpieza del texto o de la clave (mayúsculas, filtrado, relleno)
+MAP = "map"  # Conversión entre texto e índices del alfabeto o búsqueda de la clave compilada
+ARITHMETIC = "arithmetic"  # La transformación o la búsqueda de claves
+OUTPUT = "output"  # Conversión del resultado a texto o a la lista de resultados
+
+STAGES = (NORMALIZE, MAP, ARITHMETIC, OUTPUT)
+
+_enabled = False
+_memory = False
+_started_tracing = False
+_lock = threading.Lock()
+# (operación, etapa) -> [llamadas, segundos, caracteres, memoria pico, si se solapó]
+_totals = defaultdict(lambda: [0, 0.0, 0, 0, False])
+# Etapas que miden memoria abiertas ahora, y cuántas veces se abrió una sobre otra
+_open = 0
+_overlaps = 0
+_cache_start = KEY_CACHE.stats()
+
+
+class _Disabled:
+    """
+    Contexto vacío que regresa stage() mientras la instrumentación está apagada.
+    """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        return False
+
+
+_DISABLED = _Disabled()
+
+
+class _Stage:
+    """
+    Mide una etapa y suma el resultado a los totales al salir.
+    """
+
+    __slots__ = ("key", "chars", "start", "memory", "overlaps", "counted")
+
+    def __init__(self, operation, name, chars):
+        self.key = (operation, name)
+        self.chars = chars
+
+    def __enter__(self):
+        global _open, _overlaps
+        self.memory = self.overlaps = None
+        self.counted = _memory and tracemalloc.is_tracing()
+        if self.counted:
+            with _lock:
+                if _open:
+                    # reset_peak() borraría el pico de la etapa que ya está abierta
+                    _overlaps += 1
+                else:
+                    self.memory = tracemalloc.get_traced_memory()[0]
+                    tracemalloc.reset_peak()
+                    self.overlaps = _overlaps
+                _open += 1
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        global _open
+        elapsed = time.perf_counter() - self.start
+        peak = 0
+        overlapped = False
+        if self.counted:
+            with _lock:
+                _open -= 1
+                # Se solapó si se abrió sobre otra o si otra se abrió mientras medía
+                overlapped = self.memory is None or self.overlaps != _overlaps
+            if not overlapped:
+                peak = max(0, tracemalloc.get_traced_memory()[1] - self.memory)
+        with _lock:
+            totals = _totals[self.key]
+            totals[0] += 1
+            totals[1] += elapsed
+            totals[2] += self.chars
+            totals[3] = max(totals[3], peak)
+            totals[4] = totals[4] or overlapped
+        return False
+
+
+def stage(operation, name, chars=0):
+    """
+    Contexto que mide una etapa de una operación.
+    Argumentos:
+    operation (str): La operación, por ejemplo "vigenere_encrypt".
+    name (str): La etapa; normalmente una de STAGES.
+    chars (int): Caracteres que procesa la etapa.
+    Regresa:
+    Un contexto reutilizable vacío si la instrumentación está apagada, o uno que mide.
+    """
+    if not _enabled:
+        return _DISABLED
+    return _Stage(operation, name, chars)
+
+
+def enable(memory=False):
+    """
+    Activa la instrumentación.
+    Argumentos:
+    memory (bool): Si se mide la memoria pico de cada etapa con tracemalloc, que
+    vuelve varias veces más lentas las reservas de memoria.
+    """
+    global _enabled, _memory, _started_tracing
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _started_tracing = True
+    _memory = memory
+    _enabled = True
+
+
+def disable():
+    """
+    Apaga la instrumentación; los totales se conservan hasta reset().
+    """
+    global _enabled, _memory, _started_tracing
+    _enabled = False
+    _memory = False
+    if _started_tracing:
+        tracemalloc.stop()
+        _started_tracing = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def reset():
+    """
+    Borra los totales y toma los contadores actuales de la caché de claves como punto
+    de partida.
+    """
+    global _cache_start
+    with _lock:
+        _totals.clear()
+        _cache_start = KEY_CACHE.stats()
+
+
+def snapshot():
+    """
+    Regresa:
+    dict: {"stages": {operación: {etapa: {calls, seconds, chars, chars_per_s,
+    peak_bytes}}}, "key_cache": {hits, misses, evictions, hit_rate, size, maxsize}},
+    con los aciertos de la caché contados desde el último reset(). peak_bytes es None
+    si alguna llamada de la etapa se solapó con otra etapa.
+    """
+    with _lock:
+        totals = {key: list(values) for key, values in _totals.items()}
+        start = _cache_start
+    stages = {}
+    for (operation, name), (calls, seconds, chars, peak, overlapped) in sorted(totals.items()):
+        stages.setdefault(operation, {})[name] = {
+            "calls": calls,
+            "seconds": seconds,
+            "chars": chars,
+            "chars_per_s": chars / seconds if seconds > 0 and chars else None,
+            "peak_bytes": None if overlapped else peak,
+        }
+    current = KEY_CACHE.stats()
+    hits, misses = current.hits - start.hits, current.misses - start.misses
+    # clear() reinicia los contadores de la caché; en ese caso se cuentan desde cero
+    if hits < 0 or misses < 0:
+        hits, misses = current.hits, current.misses
+    return {
+        "stages": stages,
+        "key_cache": {
+            "hits": hits,
+            "misses": misses,
+            "evictions": max(0, current.evictions - start.evictions),
+            "hit_rate": hits / (hits + misses) if hits + misses else None,
+            "size": current.size,
+            "maxsize": current.maxsize,
+        },
+    }
+
+
+def report(stats=None):
+    """
+    Da formato de tabla a un snapshot.
+    Argumentos:
+    stats (dict, optional): El resultado de snapshot(); por defecto uno nuevo.
+    Regresa:
+    str: Una línea por operación y etapa, en el orden de STAGES.
+    """
+    stats = snapshot() if stats is None else stats
+    order = {name: i for i, name in enumerate(STAGES)}
+    lines = [f"{'operación':<32} {'etapa':<12} {'llamadas':>9} {'ms':>10} {'caracteres/s':>13} {'memoria':>10}"]
+    for operation, stages in stats["stages"].items():
+        for name, values in sorted(stages.items(), key=lambda item: order.get(item[0], len(order))):
+            speed = f"{values['chars_per_s']:.3g}" if values["chars_per_s"] else "-"
+            peak = "-" if values["peak_bytes"] is None else f"{values['peak_bytes'] / 2**10:.1f}KB"
+            lines.append(
+                f"{operation:<32} {name:<12} {values['calls']:>9} {values['seconds'] * 1000:>10.3f} "
+                f"{speed:>13} {peak:>10}"
+            )
+    cache = stats["key_cache"]
+    rate = "-" if cache["hit_rate"] is None else f"{cache['hit_rate']:.1%}"
+    lines.append(f"Caché de claves: {cache['hits']} aciertos, {cache['misses']} fallos ({rate})")
+    return "\n".join(lines)
+
+
+def demo(size=100_000):
+    # Todos los cifrados y ataques sobre el mismo texto, con la instrumentación activa
+    import random
+
+    from . import affine, hill, multiplication, playfair, vigenere
+
+    rng = random.Random(0)
+    text = "".join(rng.choices("ETAOINSHRDLUCMFWYPVBGKQJXZ", k=size))
+    matrix = [[3, 3], [2, 5]]
+    enable(memory=True)
+    try:
+        for _ in range(3):
+            shifted = multiplication.displacement_encrypt(text, 3)
+            multiplication.displacement_decrypt(shifted, 3)
+            multiplication.guess_displacement_cipher(shifted)
+            scaled = multiplication.multiplicative_encrypt(text, 7)
+            multiplication.multiplicative_decrypt(scaled, 7)
+            multiplication.guess_multiplicative_cipher(scaled)
+            encrypted = affine.affine_encrypt(text, 7, 2)
+            affine.affine_decrypt(encrypted, 7, 2)
+            affine.affine_solver(encrypted, affine.english_common)
+            affine.affine_sweep([encrypted])
+            encrypted = vigenere.vigenere_encrypt(text, "LEMON")
+            vigenere.vigenere_decrypt(encrypted, "LEMON")
+            vigenere.crack_vigenere(encrypted)
+            encrypted = hill.hill_encrypt(text, hill.np.array(matrix))
+            hill.hill_decrypt(encrypted, hill.np.array(matrix))
+            hill.known_plaintext_attack(encrypted, text[:16], 2)
+            hill.ciphertext_only_attack(encrypted, 2, workers=1)
+            encrypted = playfair.cifrar_playfair(text, "KEYWORD")
+            playfair.descifrar_playfair(encrypted, "KEYWORD")
+    finally:
+        disable()
+    print(report())
+
+
+if __name__ == "__main__":
+    # Los cifrados consultan el módulo importado, no este __main__
+    from .profiling import demo
+
+    demo(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,285 @@
+"""
+Servicio local de cifrado con asyncio. Cada conexión TCP envía solicitudes JSON, una
+por línea, y recibe una respuesta por línea con el mismo "id" (en el orden en que
+terminan):
+
+    {"id": 1, "cipher": "affine", "operation": "encrypt", "key": [7, 2], "text": "HOLA"}
+    {"id": 1, "result": "ZWBC"}
+
+Las solicitudes concurrentes que comparten cifrado, operación y clave se juntan en
+microlotes que pasan juntos por operations.run_batch; los ataques pesados se mandan a
+un pool de procesos. {"operation": "stats"} regresa la profundidad de la cola y los
+percentiles de latencia.
+Uso: python -m cifrados.service [puerto] [tablas.ngrams]
+"""
+
+import asyncio
+import json
+import multiprocessing
+import os
+import signal
+import sys
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+from .keycache import KEY_CACHE
+from .operations import HEAVY_CRACKS, json_line, normalize_key, run_batch, warm_worker
+
+HOST = "127.0.0.1"
+PORT = 8765
+
+# Solicitudes máximas por microlote y tiempo que se espera a que lleguen más
+BATCH_SIZE = 512
+BATCH_DELAY = 0.002
+
+# Latencias recientes usadas para los percentiles
+LATENCY_WINDOW = 10_000
+
+# Longitud máxima de una línea de solicitud
+MAX_LINE = 1 << 24
+
+
+class EncryptionService:
+    """
+    Recibe solicitudes, las agrupa en microlotes por (cifrado, operación, clave,
+    idioma) y las ejecuta: las operaciones rápidas en un pool de hilos y los ataques
+    pesados en un pool de procesos con los trabajadores ya preparados.
+    """
+
+    def __init__(self, batch_size=BATCH_SIZE, batch_delay=BATCH_DELAY, workers=None, ngrams=None):
+        """
+        Argumentos:
+        batch_size (int): Solicitudes máximas por microlote.
+        batch_delay (float): Segundos que se esperan para completar un microlote.
+        workers (int, optional): Procesos para los ataques; por defecto uno por núcleo.
+        ngrams (str, optional): Ruta de las tablas de n-gramas para atacar Playfair.
+        """
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.ngrams = ngrams
+        self.queue = asyncio.Queue()
+        self.threads = ThreadPoolExecutor(max_workers=os.cpu_count() or 1)
+        # Los procesos no se crean con fork: si un hilo está importando NumPy cuando se
+        # lanza el pool, los hijos heredan el módulo a medio importar
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        self.processes = ProcessPoolExecutor(
+            max_workers=workers or os.cpu_count() or 1,
+            mp_context=context,
+            initializer=warm_worker,
+            initargs=(ngrams,),
+        )
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.in_flight = 0
+        self.requests = 0
+        self.batches = 0
+        self.batched = 0
+        self.server = None
+        self._batcher = None
+        self._running = set()
+        self._clients = {}
+
+    async def start(self, host=HOST, port=PORT):
+        """
+        Empieza a aceptar conexiones.
+        Regresa:
+        tuple: La dirección (host, puerto) en la que escucha.
+        """
+        self._batcher = asyncio.create_task(self._collect())
+        self.server = await asyncio.start_server(self._handle, host, port, limit=MAX_LINE)
+        return self.server.sockets[0].getsockname()[:2]
+
+    async def close(self):
+        """
+        Deja de aceptar conexiones y libera los pools.
+        """
+        if self.server is not None:
+            self.server.close()
+            # Cerrar las conexiones abiertas termina sus lecturas y deja terminar a cada
+            # manejador con las respuestas pendientes
+            for writer in self._clients.values():
+                writer.close()
+            await asyncio.gather(*self._clients, return_exceptions=True)
+            await self.server.wait_closed()
+        if self._batcher is not None:
+            self._batcher.cancel()
+            await asyncio.gather(self._batcher, return_exceptions=True)
+        # Esperar a los pools en un hilo para no bloquear el bucle; los trabajos que no
+        # empezaron se cancelan y los procesos terminan y se recogen
+        for executor in (self.threads, self.processes):
+            await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+        for task in self._running:
+            task.cancel()
+        await asyncio.gather(*self._running, return_exceptions=True)
+
+    async def submit(self, cipher, operation, key, text, language=None):
+        """
+        Encola una solicitud y espera su resultado.
+        Regresa:
+        dict: {"result": ...} o {"error": ...}.
+        """
+        if not isinstance(text, str):
+            raise ValueError("El texto debe ser una cadena.")
+        # El grupo es la llave de un diccionario en _collect, así que debe ser hashable
+        if language is not None and not isinstance(language, str):
+            raise ValueError("El idioma debe ser una cadena.")
+        group = (cipher, operation, normalize_key(cipher, operation, key), language)
+        future = asyncio.get_running_loop().create_future()
+        self.requests += 1
+        self.queue.put_nowait((group, text, future, time.perf_counter()))
+        return await future
+
+    def stats(self):
+        """
+        Regresa:
+        dict: Profundidad de la cola, solicitudes en proceso, tamaño medio de los
+        microlotes, percentiles de latencia en milisegundos y estado de la caché de claves.
+        """
+        latencies = sorted(self.latencies)
+        percentiles = {}
+        if latencies:
+            for q in (50, 90, 99):
+                percentiles[f"p{q}"] = 1000 * latencies[min(len(latencies) - 1, len(latencies) * q // 100)]
+        return {
+            "queue_depth": self.queue.qsize(),
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "batches": self.batches,
+            "mean_batch": self.batched / max(self.batches, 1),
+            "latency_ms": percentiles,
+            "key_cache": KEY_CACHE.stats()._asdict(),
+        }
+
+    async def _collect(self):
+        # Toma lo que haya en la cola (esperando un poco si el lote quedó incompleto),
+        # lo agrupa y lanza cada grupo sin esperar a que termine
+        while True:
+            items = [await self.queue.get()]
+            self._drain(items)
+            if len(items) < self.batch_size and self.batch_delay > 0:
+                await asyncio.sleep(self.batch_delay)
+                self._drain(items)
+            groups = defaultdict(list)
+            for item in items:
+                groups[item[0]].append(item)
+            for group, members in groups.items():
+                self.batches += 1
+                self.batched += len(members)
+                self.in_flight += len(members)
+                task = asyncio.create_task(self._run(group, members))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+
+    def _drain(self, items):
+        while len(items) < self.batch_size and not self.queue.empty():
+            items.append(self.queue.get_nowait())
+
+    async def _run(self, group, members):
+        cipher, operation, key, language = group
+        texts = [text for _, text, _, _ in members]
+        loop = asyncio.get_running_loop()
+        try:
+            if operation == "crack" and cipher in HEAVY_CRACKS:
+                # Un texto por tarea, para repartir los ataques entre los procesos
+                tasks = [
+                    loop.run_in_executor(
+                        self.processes,
+                        partial(run_batch, cipher, operation, key, [text], language, ngrams=self.ngrams),
+                    )
+                    for text in texts
+                ]
+                results = [result for batch in await asyncio.gather(*tasks) for result in batch]
+            else:
+                results = await loop.run_in_executor(
+                    self.threads, partial(run_batch, cipher, operation, key, texts, language, ngrams=self.ngrams)
+                )
+        except Exception as error:
+            # Por ejemplo un proceso del pool que terminó de forma inesperada
+            results = [{"error": f"{type(error).__name__}: {error}"}] * len(texts)
+        now = time.perf_counter()
+        for (_, _, future, start), result in zip(members, results):
+            self.latencies.append(now - start)
+            if not future.done():
+                future.set_result(result)
+        self.in_flight -= len(members)
+
+    async def _handle(self, reader, writer):
+        # Las solicitudes de una conexión se atienden a la vez; cada respuesta lleva su "id"
+        tasks = set()
+        self._clients[asyncio.current_task()] = writer
+        try:
+            while line := await reader.readline():
+                task = asyncio.create_task(self._respond(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except (ValueError, ConnectionError):
+            # Línea demasiado larga o conexión cerrada por el cliente
+            pass
+        finally:
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+            writer.close()
+            del self._clients[asyncio.current_task()]
+
+    async def _respond(self, line, writer):
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("La solicitud debe ser un objeto JSON.")
+        except ValueError as error:
+            response = {"id": None, "error": str(error)}
+        else:
+            response = {"id": request.get("id")}
+            try:
+                if request.get("operation") == "stats":
+                    response["result"] = self.stats()
+                else:
+                    response.update(await self.submit(
+                        request.get("cipher"),
+                        request.get("operation"),
+                        request.get("key"),
+                        request.get("text", ""),
+                        request.get("language"),
+                    ))
+            except ValueError as error:
+                response["error"] = str(error)
+            except Exception as error:
+                # Cualquier otro fallo también se responde, para que el cliente no espere
+                response["error"] = f"{type(error).__name__}: {error}"
+        writer.write(json_line(response).encode())
+        await writer.drain()
+
+
+async def serve(host=HOST, port=PORT, ngrams=None):
+    """
+    Ejecuta el servicio hasta que se interrumpa.
+    """
+    service = EncryptionService(ngrams=ngrams)
+    host, port = await service.start(host, port)
+    # SIGINT y SIGTERM terminan por close(), que cierra y recoge los pools
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, stop.set)
+        except NotImplementedError:
+            # Windows no admite manejadores de señales en el bucle; Ctrl+C cancela la tarea
+            pass
+    # Se anuncia después de instalar los manejadores, para que una señal enviada en
+    # cuanto aparece el mensaje también pase por close()
+    print(f"Escuchando en {host}:{port}", flush=True)
+    try:
+        await stop.wait()
+    finally:
+        await service.close()
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else PORT
+    ngrams = sys.argv[2] if len(sys.argv) > 2 else None
+    try:
+        asyncio.run(serve(HOST, port, ngrams))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,190 @@
+"""
+Cifrado por flujo de archivos de cualquier tamaño con memoria constante. Cada
+función recibe un iterable de bloques de texto (por ejemplo read_chunks) y produce
+los bloques cifrados uno por uno, así que nunca se tiene el archivo completo en memoria.
+"""
+
+import sys
+
+from .alphabets import STANDARD
+from .codec import DROP, ERROR
+from .lazy import numpy as np
+from .modular import cached_inverse_mod, matrix_product_mod
+
+# Caracteres leídos a la vez
+STREAM_CHUNK = 1 << 20
+
+
+def read_chunks(source, size=STREAM_CHUNK, errors="strict"):
+    """
+    Lee un archivo de texto por bloques de tamaño fijo.
+    Argumentos:
+    source (str | file): La ruta del archivo o un archivo de texto ya abierto.
+    size (int): Caracteres por bloque.
+    errors (str): Manejo de bytes que no son UTF-8 válido, como en open(): "strict"
+    lanza UnicodeDecodeError (un ValueError); "replace" o "ignore" los sustituyen o
+    los descartan. Solo se usa si source es una ruta.
+    Regresa:
+    generator: Los bloques de texto.
+    """
+    if isinstance(source, str):
+        with open(source, "r", encoding="utf-8", errors=errors) as file:
+            yield from read_chunks(file, size)
+        return
+    while chunk := source.read(size):
+        yield chunk
+
+
+def write_chunks(chunks, destination):
+    """
+    Escribe los bloques de un flujo conforme se producen.
+    Argumentos:
+    chunks (iterable): Los bloques de texto.
+    destination (str | file): La ruta del archivo o un archivo de texto ya abierto.
+    Regresa:
+    int: El número de caracteres escritos.
+    """
+    if isinstance(destination, str):
+        with open(destination, "w", encoding="utf-8") as file:
+            return write_chunks(chunks, file)
+    written = 0
+    for chunk in chunks:
+        destination.write(chunk)
+        written += len(chunk)
+    return written
+
+
+def affine_stream(chunks, a, b, decrypt=False, alphabet=STANDARD, unknown=DROP):
+    """
+    Cifra o descifra un flujo con el cifrado afín. Cada letra se transforma por
+    separado, así que los bloques son independientes.
+    Argumentos:
+    chunks (iterable): Bloques de texto.
+    a (int): El multiplicador.
+    b (int): El desplazamiento.
+    decrypt (bool): True para descifrar.
+    alphabet (Alphabet): El alfabeto del cifrado.
+    unknown (str): Política para caracteres fuera del alfabeto ("drop", "keep" o "error").
+    Regresa:
+    generator: Los bloques transformados.
+    """
+    key = alphabet.substitution(a, b)
+    transform = key.decrypt if decrypt else key.encrypt
+    for chunk in chunks:
+        yield transform(chunk, unknown)
+
+
+def shift_stream(chunks, shift, decrypt=False, alphabet=STANDARD, unknown=DROP):
+    """
+    Cifra o descifra un flujo con un desplazamiento (a = 1 en el cifrado afín).
+    """
+    return affine_stream(chunks, 1, shift, decrypt, alphabet, unknown)
+
+
+def multiplicative_stream(chunks, key, decrypt=False, alphabet=STANDARD, unknown=DROP):
+    """
+    Cifra o descifra un flujo con el cifrado multiplicativo (b = 0 en el cifrado afín).
+    """
+    return affine_stream(chunks, key, 0, decrypt, alphabet, unknown)
+
+
+def vigenere_stream(chunks, key, decrypt=False, alphabet=STANDARD, unknown=DROP):
+    """
+    Cifra o descifra un flujo con Vigenère. La fase de la clave se conserva entre
+    bloques, así que el resultado es idéntico a cifrar el texto completo.
+    Argumentos:
+    chunks (iterable): Bloques de texto.
+    key (str): La clave.
+    decrypt (bool): True para descifrar.
+    alphabet (Alphabet): El alfabeto del cifrado.
+    unknown (str): Política para caracteres fuera del alfabeto ("drop", "keep" o "error").
+    Regresa:
+    generator: Los bloques transformados.
+    """
+    codec = alphabet.codec
+    key_values = codec.encode(key, ERROR)[0].astype(np.int64)
+    if len(key_values) == 0:
+        raise ValueError("La clave no puede estar vacía.")
+    if decrypt:
+        key_values = -key_values
+    phase = 0
+    for chunk in chunks:
+        values, layout = codec.encode(chunk, unknown)
+        shifts = np.resize(np.roll(key_values, -phase), len(values))
+        result = (values + shifts) % codec.size
+        phase = (phase + len(values)) % len(key_values)
+        yield codec.decode(result.astype(codec.dtype), layout)
+
+
+def hill_stream(chunks, matrix, decrypt=False, alphabet=STANDARD, unknown=ERROR, pad="X"):
+    """
+    Cifra o descifra un flujo con el cifrado Hill. Las letras que no completan un
+    bloque al final de un bloque de texto pasan al siguiente; al cifrar, el último
+    bloque se completa con 'pad' igual que hill_encrypt.
+    Argumentos:
+    chunks (iterable): Bloques de texto.
+    matrix (np.array): La matriz clave n x n.
+    decrypt (bool): True para descifrar con la inversa de la matriz.
+    alphabet (Alphabet): El alfabeto del cifrado.
+    unknown (str): Política para caracteres fuera del alfabeto ("drop" o "error").
+    pad (str): Letra de relleno del último bloque al cifrar.
+    Regresa:
+    generator: Los bloques transformados.
+    """
+    if unknown not in (DROP, ERROR):
+        raise ValueError("El cifrado Hill por flujo solo admite las políticas 'drop' y 'error'.")
+    codec = alphabet.codec
+    matrix = np.asarray(matrix, dtype=np.int64)
+    size = matrix.shape[0]
+    if decrypt:
+        matrix = cached_inverse_mod(matrix, codec.size)
+    carry = np.empty(0, dtype=codec.dtype)
+    for chunk in chunks:
+        values = np.concatenate([carry, codec.encode(chunk, unknown)[0]])
+        complete = len(values) - len(values) % size
+        carry = values[complete:]
+        if complete:
+            product = matrix_product_mod(values[:complete].reshape(-1, size), matrix, codec.size)
+            yield codec.decode(product.astype(codec.dtype).ravel())
+    if len(carry):
+        if decrypt:
+            raise ValueError(
+                "La longitud del mensaje cifrado debe ser múltiplo del tamaño de la matriz."
+            )
+        padding = np.full(size - len(carry), codec.encode(pad, ERROR)[0][0], dtype=codec.dtype)
+        block = np.concatenate([carry, padding]).reshape(1, size)
+        yield codec.decode(matrix_product_mod(block, matrix, codec.size).astype(codec.dtype).ravel())
+
+
+def parse_key(cipher, key):
+    """
+    Interpreta la clave de la línea de comandos según el cifrado.
+    """
+    if cipher == "vigenere":
+        return (key,)
+    if cipher == "hill":
+        numbers = [int(x) for x in key.split(",")]
+        size = int(round(len(numbers) ** 0.5))
+        if size * size != len(numbers):
+            raise ValueError("La matriz Hill debe tener n x n números separados por comas.")
+        return (np.array(numbers).reshape(size, size),)
+    return tuple(int(x) for x in key.split(","))
+
+
+STREAMS = {
+    "shift": shift_stream,
+    "multiplicative": multiplicative_stream,
+    "affine": affine_stream,
+    "vigenere": vigenere_stream,
+    "hill": hill_stream,
+}
+
+
+if __name__ == "__main__":
+    # Uso: python -m cifrados.streaming cifrado encrypt|decrypt clave entrada salida
+    # Claves: shift "3", multiplicative "7", affine "7,2", vigenere "LEMON", hill "3,3,2,5"
+    if len(sys.argv) != 6 or sys.argv[1] not in STREAMS or sys.argv[2] not in ("encrypt", "decrypt"):
+        sys.exit(f"Uso: python -m cifrados.streaming {'|'.join(STREAMS)} encrypt|decrypt clave entrada salida")
+    cipher, mode, key, source, destination = sys.argv[1:]
+    stream = STREAMS[cipher](read_chunks(source), *parse_key(cipher, key), decrypt=mode == "decrypt")
+    print(f"{write_chunks(stream, destination)} caracteres escritos en {destination}.")
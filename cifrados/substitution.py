@@ -0,0 +1,137 @@
+from math import gcd
+
+from .codec import DROP, ERROR, KEEP, UNKNOWN_POLICIES
+from .keycache import KEY_CACHE
+
+
+class _DropMissing(dict):
+    """
+    Tabla para str.translate que elimina los caracteres que no contiene.
+    """
+
+    def __missing__(self, key):
+        return None
+
+
+class TranslationTable:
+    """
+    Tabla de sustitución monoalfabética precompilada para str.translate y
+    bytes.translate. Las minúsculas se pliegan a su mayúscula igual que en el Codec.
+    """
+
+    def __init__(self, source, target):
+        """
+        Argumentos:
+        source (str): Los caracteres del alfabeto de entrada.
+        target (str): El carácter de salida para cada carácter de entrada.
+        """
+        mapping = dict(zip(source, target))
+        for char, out in zip(source, target):
+            lower = char.lower()
+            if len(lower) == 1 and lower not in mapping:
+                mapping[lower] = out
+
+        self.keep_table = str.maketrans(mapping)
+        self.drop_table = _DropMissing(self.keep_table)
+
+        # La ruta de bytes solo aplica si todo el alfabeto cabe en un byte
+        self.bytes_table = None
+        if all(ord(char) < 256 for char in list(mapping) + list(target)):
+            table = bytearray(range(256))
+            for char, out in mapping.items():
+                table[ord(char)] = ord(out)
+            self.bytes_table = bytes(table)
+            known = {ord(char) for char in mapping}
+            self.bytes_delete = bytes(i for i in range(256) if i not in known)
+
+    def apply(self, text, unknown=DROP):
+        """
+        Sustituye cada carácter del texto con una sola llamada a translate.
+        Argumentos:
+        text (str): El texto a sustituir.
+        unknown (str): Política para caracteres fuera del alfabeto: "drop", "keep" o "error".
+        Regresa:
+        str: El texto sustituido.
+        """
+        if unknown not in UNKNOWN_POLICIES:
+            raise ValueError(f"Política desconocida: {unknown!r}.")
+        if unknown == KEEP:
+            return text.translate(self.keep_table)
+        if self.bytes_table is not None and text.isascii():
+            data = text.encode("ascii")
+            result = data.translate(self.bytes_table, self.bytes_delete)
+            if unknown == ERROR and len(result) != len(data):
+                self._raise_unknown(text)
+            return result.decode("latin-1")
+        result = text.translate(self.drop_table)
+        if unknown == ERROR and len(result) != len(text):
+            self._raise_unknown(text)
+        return result
+
+    def _raise_unknown(self, text):
+        char = next(char for char in text if ord(char) not in self.keep_table)
+        raise ValueError(f"Carácter '{char}' no está en el alfabeto.")
+
+
+class AffineSubstitution:
+    """
+    Clave afín (a, b) compilada para un alfabeto: cifra con y = a * x + b (mod m)
+    y descifra con la tabla inversa. Los desplazamientos son a = 1 y los
+    cifrados multiplicativos son b = 0.
+    """
+
+    def __init__(self, a, b, alphabet):
+        """
+        Argumentos:
+        a (int): El multiplicador, debe ser coprimo con el tamaño del alfabeto.
+        b (int): El desplazamiento.
+        alphabet (str): Los caracteres del alfabeto, en orden.
+        """
+        modulus = len(alphabet)
+        if gcd(a, modulus) != 1:
+            raise ValueError(f"'a' = {a} no tiene inverso en el módulo {modulus}.")
+        self.a = a % modulus
+        self.b = b % modulus
+        self.alphabet = alphabet
+        cipher = "".join(alphabet[(self.a * x + self.b) % modulus] for x in range(modulus))
+        self.encryption = TranslationTable(alphabet, cipher)
+        self.decryption = TranslationTable(cipher, alphabet)
+
+    def encrypt(self, text, unknown=DROP):
+        """
+        Cifra un texto con la clave compilada.
+        Argumentos:
+        text (str): El texto a cifrar.
+        unknown (str): Política para caracteres fuera del alfabeto: "drop", "keep" o "error".
+        Regresa:
+        str: El texto cifrado.
+        """
+        return self.encryption.apply(text, unknown)
+
+    def decrypt(self, text, unknown=DROP):
+        """
+        Descifra un texto con la clave compilada.
+        Argumentos:
+        text (str): El texto a descifrar.
+        unknown (str): Política para caracteres fuera del alfabeto: "drop", "keep" o "error".
+        Regresa:
+        str: El texto descifrado.
+        """
+        return self.decryption.apply(text, unknown)
+
+
+def compile_affine(a, b, alphabet):
+    """
+    Compila una clave afín, reutilizando la compilación guardada en la caché de
+    claves para la misma clave y alfabeto.
+    Argumentos:
+    a (int): El multiplicador (1 para un desplazamiento).
+    b (int): El desplazamiento (0 para un cifrado multiplicativo).
+    alphabet (str): Los caracteres del alfabeto, en orden.
+    Regresa:
+    AffineSubstitution: La clave compilada.
+    """
+    modulus = len(alphabet)
+    return KEY_CACHE.get(
+        ("affine", a % modulus, b % modulus, alphabet), lambda: AffineSubstitution(a, b, alphabet)
+    )
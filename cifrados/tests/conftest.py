@@ -0,0 +1,55 @@
+import pytest
+
+# Textos de dominio público usados como muestras de idioma en las pruebas de ataques
+ENGLISH = (
+    "It was the best of times, it was the worst of times, it was the age of wisdom, "
+    "it was the age of foolishness, it was the epoch of belief, it was the epoch of "
+    "incredulity, it was the season of Light, it was the season of Darkness, it was "
+    "the spring of hope, it was the winter of despair, we had everything before us, we "
+    "had nothing before us, we were all going direct to Heaven, we were all going "
+    "direct the other way; in short, the period was so far like the present period, "
+    "that some of its noisiest authorities insisted on its being received, for good or "
+    "for evil, in the superlative degree of comparison only. There were a king with a "
+    "large jaw and a queen with a plain face, on the throne of England; there were a "
+    "king with a large jaw and a queen with a fair face, on the throne of France. In "
+    "both countries it was clearer than crystal to the lords of the State preserves of "
+    "loaves and fishes, that things in general were settled for ever. It was the year "
+    "of Our Lord one thousand seven hundred and seventy-five. Spiritual revelations "
+    "were conceded to England at that favoured period, as at this. Mrs. Southcott had "
+    "recently attained her five-and-twentieth blessed birthday, of whom a prophetic "
+    "private in the Life Guards had heralded the sublime appearance by announcing that "
+    "arrangements were made for the swallowing up of London and Westminster."
+)
+
+SPANISH = (
+    "En un lugar de la Mancha, de cuyo nombre no quiero acordarme, no ha mucho tiempo "
+    "que vivía un hidalgo de los de lanza en astillero, adarga antigua, rocín flaco y "
+    "galgo corredor. Una olla de algo más vaca que carnero, salpicón las más noches, "
+    "duelos y quebrantos los sábados, lentejas los viernes, algún palomino de añadidura "
+    "los domingos, consumían las tres partes de su hacienda. El resto della concluían "
+    "sayo de velarte, calzas de velludo para las fiestas, con sus pantuflos de lo mesmo, "
+    "y los días de entresemana se honraba con su vellorí de lo más fino. Tenía en su "
+    "casa una ama que pasaba de los cuarenta, y una sobrina que no llegaba a los veinte, "
+    "y un mozo de campo y plaza, que así ensillaba el rocín como tomaba la podadera. "
+    "Frisaba la edad de nuestro hidalgo con los cincuenta años; era de complexión recia, "
+    "seco de carnes, enjuto de rostro, gran madrugador y amigo de la caza."
+)
+
+
+def letters(text):
+    return "".join(char for char in text.upper() if "A" <= char <= "Z")
+
+
+@pytest.fixture
+def english_text():
+    return ENGLISH
+
+
+@pytest.fixture
+def english():
+    return letters(ENGLISH)
+
+
+@pytest.fixture
+def spanish():
+    return letters(SPANISH)
@@ -0,0 +1,68 @@
+import pytest
+
+from cifrados.affine import affine_decrypt, affine_encrypt, affine_keys, affine_sweep, message_counts
+from cifrados.analysis import chi_squared, expected_frequencies
+from cifrados.lazy import numpy as np
+
+KEYS = [(1, 0), (3, 7), (5, 8), (7, 2), (25, 25)]
+
+
+def test_affine_keys_enumerates_the_keyspace():
+    a, b = affine_keys()
+    assert len(a) == len(b) == 312
+    assert len(set(zip(a.tolist(), b.tolist()))) == 312
+    assert set(a.tolist()) == {1, 3, 5, 7, 9, 11, 15, 17, 19, 21, 23, 25}
+
+
+def test_each_message_finds_its_key(spanish):
+    messages = [affine_encrypt(spanish[i * 100 :], a, b) for i, (a, b) in enumerate(KEYS)]
+    keys, scores = affine_sweep(messages, top=3)
+    assert keys.shape == (5, 3, 2) and scores.shape == (5, 3)
+    assert [tuple(row) for row in keys[:, 0].tolist()] == KEYS
+    assert (np.diff(scores, axis=1) >= 0).all()
+
+
+def test_scores_match_decrypting_with_each_key(spanish):
+    message = affine_encrypt(spanish[:200], 9, 4)
+    keys, scores = affine_sweep([message], top=312)
+    expected = expected_frequencies("spanish", 26)
+    for (a, b), score in zip(keys[0].tolist()[:20], scores[0][:20]):
+        plain = np.frombuffer(affine_decrypt(message, a, b).encode(), dtype=np.uint8) - 65
+        counts = np.bincount(plain, minlength=26)
+        assert score == pytest.approx(chi_squared(counts, expected))
+
+
+def test_chunking_does_not_change_results(spanish):
+    messages = [affine_encrypt(spanish[i : i + 80], 3, i) for i in range(0, 400, 40)]
+    whole = affine_sweep(messages, top=4)
+    chunked = affine_sweep(messages, top=4, chunk_rows=3)
+    assert np.array_equal(whole[0], chunked[0])
+    assert np.allclose(whole[1], chunked[1])
+
+
+def test_padded_array_matches_list_of_messages(spanish):
+    texts = [affine_encrypt(spanish[:n], 5, 8) for n in (50, 120, 0)]
+    values = [np.frombuffer(text.encode(), dtype=np.uint8) - 65 for text in texts]
+    padded = np.full((3, 120), 255, dtype=np.uint8)
+    for row, array in zip(padded, values):
+        row[: len(array)] = array
+    keys, scores = affine_sweep(padded)
+    list_keys, list_scores = affine_sweep(texts)
+    assert np.array_equal(keys[:2], list_keys[:2])
+    assert np.isinf(scores[2]).all() and np.isinf(list_scores[2]).all()
+
+
+@pytest.mark.parametrize("pad", [-1, -7, 26, 255])
+def test_message_counts_ignores_padding(pad):
+    messages = np.array([[0, 1, 1, pad], [pad, pad, 25, 2]], dtype=np.int64)
+    expected = np.zeros((2, 26), dtype=np.int64)
+    expected[0, 0], expected[0, 1], expected[1, 25], expected[1, 2] = 1, 2, 1, 1
+    assert np.array_equal(message_counts(messages), expected)
+    assert np.array_equal(message_counts(list(messages)), expected)
+
+
+def test_message_counts_of_texts():
+    counts = message_counts(["ABBA", "zz!", ""])
+    assert counts[0, 0] == 2 and counts[0, 1] == 2
+    assert counts[1, 25] == 2 and counts[1].sum() == 2
+    assert counts[2].sum() == 0
@@ -0,0 +1,81 @@
+import pickle
+
+import pytest
+
+from cifrados.affine import affine_encrypt
+from cifrados.alphabets import BYTES, STANDARD, Alphabet
+from cifrados.vigenere import vigenere_encrypt
+
+
+def test_standard_and_bytes_alphabets():
+    assert STANDARD.symbols == "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    assert STANDARD.modulus == len(STANDARD) == 26
+    assert STANDARD.positions["C"] == 2
+    assert STANDARD.units == (1, 3, 5, 7, 9, 11, 15, 17, 19, 21, 23, 25)
+    assert BYTES.modulus == 256
+    assert BYTES[255] == "\xff"
+
+
+def test_alphabets_are_immutable():
+    alphabet = Alphabet("ABC")
+    with pytest.raises(AttributeError):
+        alphabet.symbols = "XYZ"
+    with pytest.raises(AttributeError):
+        alphabet.extra = 1
+    with pytest.raises(AttributeError):
+        del alphabet.modulus
+    with pytest.raises(TypeError):
+        alphabet.positions["D"] = 3
+    with pytest.raises(ValueError):
+        alphabet.codec.encode_table[0] = 1
+    with pytest.raises(ValueError):
+        alphabet.inverses[1] = 0
+
+
+def test_equality_hash_and_pickle():
+    alphabet = Alphabet("ABCDE")
+    assert alphabet == Alphabet(list("ABCDE"))
+    assert alphabet != Alphabet("ABCDF")
+    assert len({alphabet, Alphabet("ABCDE")}) == 1
+    assert pickle.loads(pickle.dumps(alphabet)) == alphabet
+    assert list(alphabet) == list("ABCDE")
+
+
+def test_inverses():
+    alphabet = Alphabet("ABCDEFGHIJ")
+    assert alphabet.inverse(3) == 7
+    assert alphabet.inverse(13) == 7
+    with pytest.raises(ValueError):
+        alphabet.inverse(5)
+
+
+def test_several_alphabets_at_once():
+    spanish = Alphabet("ABCDEFGHIJKLMNÑOPQRSTUVWXYZ")
+    assert spanish.modulus == 27
+    assert affine_encrypt("ÑA", 1, 1, alphabet=spanish) == "OB"
+    assert affine_encrypt("ÑA", 1, 1) == "B"
+    assert vigenere_encrypt("ÑANDU", "B", alphabet=spanish) == "OBÑEV"
+
+
+def test_from_file(tmp_path):
+    path = tmp_path / "alfabeto.txt"
+    path.write_text("ABCABD", encoding="utf-8")
+    assert Alphabet.from_file(str(path)) == Alphabet("ABCD")
+    path.write_text("A,B,C,A", encoding="utf-8")
+    assert Alphabet.from_file(str(path), separator=",") == Alphabet("ABC")
+    with pytest.raises(FileNotFoundError):
+        Alphabet.from_file(str(tmp_path / "missing.txt"))
+    path.write_text("AB,CD", encoding="utf-8")
+    with pytest.raises(ValueError):
+        Alphabet.from_file(str(path), separator=",")
+
+
+def test_normalize():
+    assert STANDARD.normalize("Hola, mundo") == "HOLAMUNDO"
+    assert STANDARD.normalize("Hola, mundo", "keep") == "HOLA, MUNDO"
+    with pytest.raises(ValueError):
+        STANDARD.normalize("Hola, mundo", "error")
+
+
+def test_substitution_is_compiled_once():
+    assert STANDARD.substitution(3, 7) is STANDARD.substitution(3, 7)
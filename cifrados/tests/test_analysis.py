@@ -0,0 +1,86 @@
+from collections import Counter
+
+import pytest
+
+from cifrados.alphabets import BYTES, STANDARD
+from cifrados.analysis import (
+    CiphertextProfile,
+    as_profile,
+    digraph_index_of_coincidence,
+    index_of_coincidence,
+)
+from cifrados.lazy import numpy as np
+
+
+def test_statistics_are_memoized():
+    profile = CiphertextProfile("ABRACADABRA")
+    assert profile.ngram_counts(2) is profile.ngram_counts(2)
+    assert profile.counts is profile.ngram_counts(1)
+    assert profile.repeat_distances(3) is profile.repeat_distances(3)
+    assert profile.prefix(4) is profile.prefix(4)
+    assert profile.prefix(100) is profile
+
+
+def test_counts_and_most_common():
+    profile = CiphertextProfile("abracadabra!")
+    assert profile.dropped == 1
+    assert len(profile) == 11
+    assert profile.counts[:5].tolist() == [5, 2, 1, 1, 0]
+    assert profile.bigram_counts.sum() == 10
+    assert profile.trigram_counts.sum() == 9
+    # Los empates se resuelven por primera aparición: B antes que R, C antes que D
+    assert profile.most_common() == "ABRCD"
+    assert profile.most_common(2) == "AB"
+
+
+def test_indices_of_coincidence(english):
+    profile = CiphertextProfile(english)
+    counts = Counter(english)
+    n = len(english)
+    expected = sum(c * (c - 1) for c in counts.values()) / (n * (n - 1))
+    assert profile.index_of_coincidence == pytest.approx(expected)
+    pairs = Counter(english[i : i + 2] for i in range(n - 1))
+    expected = sum(c * (c - 1) for c in pairs.values()) / ((n - 1) * (n - 2))
+    assert profile.digraph_index_of_coincidence == pytest.approx(expected)
+    assert index_of_coincidence(np.array([3]), 26) == 0.0
+    assert digraph_index_of_coincidence(np.array([1, 2]), 26) == 0.0
+
+
+def test_repeated_sequences():
+    profile = CiphertextProfile("THEXTHEYTHE")
+    assert profile.repeated_sequences(3) == {"THE": [0, 4, 8]}
+    _, positions, distances = profile.repeat_distances(3)
+    assert positions.tolist() == [0, 4]
+    assert distances.tolist() == [4, 4]
+
+
+def test_prefix_shares_values():
+    profile = CiphertextProfile("AB-CDEF")
+    prefix = profile.prefix(3)
+    assert prefix.values.tolist() == [0, 1, 2]
+    assert prefix.text is None
+    assert prefix.dropped == 1
+
+
+def test_as_profile_reuses_profiles():
+    profile = CiphertextProfile("HELLO")
+    assert as_profile(profile) is profile
+    assert as_profile("HELLO").values.tolist() == profile.values.tolist()
+    with pytest.raises(ValueError):
+        as_profile(profile, BYTES)
+
+
+def test_as_profile_with_error_policy():
+    with pytest.raises(ValueError):
+        as_profile("HELLO WORLD", STANDARD, "error")
+    dropped = CiphertextProfile("HELLO WORLD")
+    with pytest.raises(ValueError):
+        as_profile(dropped, STANDARD, "error")
+    clean = CiphertextProfile("HELLOWORLD")
+    assert as_profile(clean, STANDARD, "error") is clean
+
+
+def test_from_values():
+    profile = CiphertextProfile.from_values(np.array([7, 4, 11, 11, 14], dtype=np.uint8))
+    assert profile.most_common(1) == "L"
+    assert profile.dropped == 0
@@ -0,0 +1,89 @@
+import json
+
+import pytest
+
+from cifrados import bench_suite
+from cifrados.bench_suite import compare, measure, parse_size, random_hill_key, random_text, run_suite
+from cifrados.lazy import numpy as np
+from cifrados.modular import is_invertible_mod
+
+
+@pytest.fixture
+def quick(monkeypatch):
+    # Una sola llamada por caso: las pruebas revisan el formato, no los tiempos
+    monkeypatch.setattr(bench_suite, "measure", lambda function, size: measure(function, size, 1e-9, 1))
+
+
+@pytest.mark.parametrize(
+    "text, size",
+    [("100B", 100), ("10KB", 10_000), ("1mb", 10**6), (" 2.5 MB ", 2_500_000), ("1GB", 10**9)],
+)
+def test_parse_size(text, size):
+    assert parse_size(text) == size
+
+
+@pytest.mark.parametrize("text", ["100", "10 KiB", "MB", "-1KB"])
+def test_parse_size_errors(text):
+    with pytest.raises(ValueError):
+        parse_size(text)
+
+
+def test_random_text_and_keys(monkeypatch):
+    rng = np.random.default_rng(0)
+    text = random_text(5000, rng)
+    assert len(text) == 5000 and text.isalpha() and text.isupper()
+    assert text.count("E") > text.count("Z")
+    monkeypatch.setattr(bench_suite, "SAMPLE_SIZE", 10)
+    repeated = random_text(25, rng)
+    assert repeated == (repeated[:10] * 3)[:25]
+    for n in (2, 3, 4):
+        assert is_invertible_mod(random_hill_key(n, rng), 26)
+
+
+def test_measure_reports_throughput():
+    result = measure(lambda: sum(range(1000)), 1000, min_time=0.01, max_calls=5)
+    assert set(result) == {"size", "calls", "latency_s", "best_s", "chars_per_s", "peak_bytes"}
+    assert 1 <= result["calls"] <= 5
+    assert result["best_s"] <= result["latency_s"]
+    assert result["chars_per_s"] == pytest.approx(1000 / result["latency_s"])
+
+
+def test_compare_flags_only_slower_cases():
+    baseline = {"a@1": {"best_s": 1.0}, "b@1": {"best_s": 1.0}, "c@1": {"best_s": 1.0}}
+    results = {
+        "a@1": {"best_s": 1.05},
+        "b@1": {"best_s": 2.0},
+        "c@1": {"best_s": 0.5},
+        "d@1": {"best_s": 9.0},
+    }
+    assert compare(results, baseline, 0.10) == [("b@1", 0.5)]
+
+
+def test_every_case_runs(quick, capsys):
+    results = run_suite([100])
+    assert "affine/encrypt@100" in results
+    assert "hill16/decrypt@100" in results
+    assert "playfair/decrypt@100" in results
+    assert "crack/hill3_known_plaintext_attack@100" in results
+    assert "crack/hill2_ciphertext_only_attack@100" in results
+    assert all(result["size"] == 100 for result in results.values())
+    assert "affine/encrypt" in capsys.readouterr().out
+
+
+def test_main_detects_regressions(quick, tmp_path, capsys):
+    output, baseline = tmp_path / "now.json", tmp_path / "before.json"
+    bench_suite.main(["--sizes", "100B", "--only", "affine/", "--output", str(output)])
+    report = json.loads(output.read_text(encoding="utf-8"))
+    assert set(report["results"]) == {"affine/encrypt@100", "affine/decrypt@100"}
+    assert {"python", "numpy", "cpus"} <= set(report["meta"])
+
+    # Una ejecución anterior mil veces más rápida marca ambos casos como regresión
+    for result in report["results"].values():
+        result["best_s"] /= 1000
+    baseline.write_text(json.dumps(report), encoding="utf-8")
+    with pytest.raises(SystemExit) as exit_info:
+        bench_suite.main(
+            ["--sizes", "100B", "--only", "affine/", "--output", str(output), "--baseline", str(baseline)]
+        )
+    assert exit_info.value.code == 1
+    assert capsys.readouterr().out.count("REGRESIÓN") == 2
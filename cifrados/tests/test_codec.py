@@ -0,0 +1,74 @@
+import pytest
+
+from cifrados.codec import DROP, ERROR, KEEP, Codec
+from cifrados.lazy import numpy as np
+
+LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+def reference_encode(text, alphabet=LETTERS):
+    positions = {char: i for i, char in enumerate(alphabet)}
+    return [positions[char] for char in text.upper() if char in positions]
+
+
+def test_encode_matches_dict_lookup():
+    codec = Codec(LETTERS)
+    text = "Hola, Mundo! ATAQUE al amanecer."
+    values, layout = codec.encode(text, DROP)
+    assert values.tolist() == reference_encode(text)
+    assert values.dtype == np.uint8
+    assert layout is None
+
+
+@pytest.mark.parametrize("text", ["", "ABC", "ataque al amanecer", "x-y_z 123"])
+def test_drop_round_trip_keeps_only_letters(text):
+    codec = Codec(LETTERS)
+    values, layout = codec.encode(text, DROP)
+    assert codec.decode(values, layout) == "".join(
+        char for char in text.upper() if char in LETTERS
+    )
+
+
+@pytest.mark.parametrize("text", ["ATAQUE AL AMANECER!", "Ñandú 42 ünïcode", "sin.espacios"])
+def test_keep_round_trip_restores_unknown_characters(text):
+    codec = Codec(LETTERS)
+    values, layout = codec.encode(text, KEEP)
+    decoded = codec.decode(values, layout)
+    assert len(decoded) == len(text)
+    for original, char in zip(text, decoded):
+        if original.upper() in LETTERS:
+            assert char == original.upper()
+        else:
+            assert char == original
+
+
+def test_error_policy_names_the_character():
+    codec = Codec(LETTERS)
+    assert codec.encode("ABC", ERROR)[0].tolist() == [0, 1, 2]
+    with pytest.raises(ValueError, match="'!'"):
+        codec.encode("AB!C", ERROR)
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        Codec(LETTERS).encode("ABC", "ignore")
+
+
+def test_non_latin_alphabet_round_trip():
+    codec = Codec("ΑΒΓΔΕ")
+    values, layout = codec.encode("αβ γδε", KEEP)
+    assert values.tolist() == [0, 1, 2, 3, 4]
+    assert codec.decode(values, layout) == "ΑΒ ΓΔΕ"
+
+
+def test_wide_alphabet_uses_uint16():
+    codec = Codec([chr(i) for i in range(300)])
+    values, _ = codec.encode(chr(299) + chr(0), ERROR)
+    assert values.dtype == np.uint16
+    assert values.tolist() == [299, 0]
+
+
+@pytest.mark.parametrize("alphabet", ["", "AAB", ["AB", "C"]])
+def test_invalid_alphabets_are_rejected(alphabet):
+    with pytest.raises(ValueError):
+        Codec(alphabet)
@@ -0,0 +1,84 @@
+import pytest
+
+from cifrados.affine import affine_encrypt, affine_solver, solve_affine_equations, spanish_common
+from cifrados.lazy import numpy as np
+from cifrados.modular import solve_linear_congruences
+
+
+def brute_force(x1, y1, x2, y2, modulus):
+    return [
+        (a, b)
+        for a in range(modulus)
+        for b in range(modulus)
+        if (a * x1 + b - y1) % modulus == 0 and (a * x2 + b - y2) % modulus == 0
+    ]
+
+
+@pytest.mark.parametrize("modulus", [26, 27, 29, 36])
+def test_matches_brute_force(modulus):
+    rng = np.random.default_rng(modulus)
+    x1, y1, x2, y2 = rng.integers(0, modulus, size=(4, 200))
+    systems, a, b = solve_linear_congruences(x1, y1, x2, y2, modulus)
+    found = {}
+    for system, ai, bi in zip(systems.tolist(), a.tolist(), b.tolist()):
+        found.setdefault(system, []).append((ai, bi))
+    for i in range(200):
+        expected = brute_force(int(x1[i]), int(y1[i]), int(x2[i]), int(y2[i]), modulus)
+        # Las soluciones de cada sistema salen con 'a' creciente
+        assert found.get(i, []) == expected
+
+
+def test_multiple_and_missing_solutions():
+    # 24 - 4 = 20 y mcd(20, 26) = 2 divide a 18 - 4: dos soluciones
+    systems, a, b = solve_linear_congruences([4, 4, 0], [4, 4, 0], [24, 24, 13], [18, 17, 0], 26)
+    assert systems.tolist() == [0, 0, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2]
+    assert list(zip(a[:2].tolist(), b[:2].tolist())) == brute_force(4, 4, 24, 18, 26)
+    # 13a ≡ 0 (mod 26): 'a' par, trece soluciones
+    assert a[2:].tolist() == list(range(0, 26, 2))
+    assert (b[2:] == 0).all()
+
+
+def test_systems_are_grouped_in_input_order():
+    systems, _, _ = solve_linear_congruences([0, 4, 0], [0, 4, 1], [1, 24, 3], [1, 18, 4], 26)
+    assert systems.tolist() == [0, 1, 1, 2]
+
+
+def test_equal_points():
+    # Las dos ecuaciones son la misma: cualquier 'a' sirve
+    systems, a, b = solve_linear_congruences([3], [5], [3], [5], 26)
+    assert len(systems) == 26
+    assert ((a * 3 + b) % 26 == 5).all()
+    # Mismo x con distinto y: no hay solución
+    assert len(solve_linear_congruences([3], [5], [3], [6], 26)[0]) == 0
+
+
+def test_empty_input():
+    systems, a, b = solve_linear_congruences([], [], [], [], 26)
+    assert len(systems) == len(a) == len(b) == 0
+
+
+def test_large_modulus():
+    modulus = 3 * 2**33
+    rng = np.random.default_rng(1)
+    a_true = int(rng.integers(1, modulus))
+    b_true = int(rng.integers(0, modulus))
+    x1, x2 = 12345, 12346
+    y1, y2 = (a_true * x1 + b_true) % modulus, (a_true * x2 + b_true) % modulus
+    systems, a, b = solve_linear_congruences([x1], [y1], [x2], [y2], modulus)
+    assert systems.tolist() == [0]
+    assert (int(a[0]), int(b[0])) == (a_true, b_true)
+
+
+def test_solve_affine_equations():
+    # A -> C, B -> J con la clave (7, 2)
+    assert solve_affine_equations((0, 2), (1, 9)) == (7, 2)
+    # Sin solución única
+    assert solve_affine_equations((4, 4), (24, 18)) == (None, None)
+    assert solve_affine_equations((3, 5), (3, 6)) == (None, None)
+
+
+def test_affine_solver_recovers_key(spanish):
+    solutions = affine_solver(affine_encrypt(spanish, 7, 2), spanish_common)
+    assert (7, 2) in solutions
+    assert len(solutions) == len(set(solutions))
+    assert all(np.gcd(a, 26) == 1 for a, _ in solutions)
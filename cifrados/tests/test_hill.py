@@ -0,0 +1,92 @@
+import pytest
+
+from cifrados.alphabets import BYTES, STANDARD
+from cifrados.hill import hill_decrypt, hill_encrypt, hill_transform, pad_values
+from cifrados.lazy import numpy as np
+from cifrados.modular import SingularMatrixError, is_invertible_mod, matrix_product_mod
+
+LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+KEY = np.array([[3, 3], [2, 5]])
+
+
+def reference_hill(text, matrix, letters=LETTERS, pad="X"):
+    """Cifrado Hill bloque por bloque, como lo hacía la función original."""
+    size = matrix.shape[0]
+    text = text.upper()
+    while len(text) % size:
+        text += pad
+    result = []
+    for i in range(0, len(text), size):
+        block = np.array([letters.index(char) for char in text[i : i + size]])
+        result.extend(letters[int(x)] for x in block @ matrix % len(letters))
+    return "".join(result)
+
+
+def random_key(rng, size, modulus):
+    while True:
+        matrix = rng.integers(0, modulus, size=(size, size))
+        if is_invertible_mod(matrix, modulus):
+            return matrix
+
+
+@pytest.mark.parametrize("text", ["HELP", "ataque", "ATAQUEALAMANECER", "A"])
+def test_encrypt_matches_block_loop(text):
+    assert hill_encrypt(text, KEY) == reference_hill(text, KEY)
+
+
+@pytest.mark.parametrize("size", [2, 3, 4, 7])
+def test_round_trip_keeps_padding(size):
+    rng = np.random.default_rng(size)
+    matrix = random_key(rng, size, 26)
+    text = "".join(rng.choice(list(LETTERS), size=101))
+    encrypted = hill_encrypt(text, matrix)
+    assert encrypted == reference_hill(text, matrix)
+    decrypted = hill_decrypt(encrypted, matrix)
+    assert decrypted[: len(text)] == text
+    assert set(decrypted[len(text) :]) <= {"X"}
+
+
+def test_bytes_alphabet_round_trip():
+    rng = np.random.default_rng(0)
+    matrix = random_key(rng, 4, 256)
+    text = bytes(range(256)).decode("latin-1")
+    assert hill_decrypt(hill_encrypt(text, matrix, BYTES), matrix, BYTES) == text
+
+
+def test_chunked_transform_equals_single_product():
+    rng = np.random.default_rng(1)
+    values = rng.integers(0, 26, size=3000).astype(np.uint8)
+    matrix = random_key(rng, 3, 26)
+    whole = hill_transform(values, matrix, 26)
+    assert np.array_equal(hill_transform(values, matrix, 26, chunk_elements=7), whole)
+    assert whole.dtype == values.dtype
+
+
+def test_integer_product_for_large_moduli():
+    rng = np.random.default_rng(2)
+    modulus = 2**31 - 1
+    blocks = rng.integers(0, modulus, size=(50, 4))
+    matrix = rng.integers(0, modulus, size=(4, 4))
+    expected = blocks.astype(object).dot(matrix.astype(object)) % modulus
+    assert matrix_product_mod(blocks, matrix, modulus).tolist() == expected.tolist()
+
+
+def test_custom_pad_letter():
+    assert hill_encrypt("ABC", KEY, pad="Q") == reference_hill("ABC", KEY, pad="Q")
+    assert hill_encrypt("ABCD", KEY, pad="?") == reference_hill("ABCD", KEY)
+
+
+def test_pad_letter_outside_alphabet_is_rejected():
+    with pytest.raises(ValueError, match="relleno"):
+        hill_encrypt("ABC", KEY, pad="?")
+    with pytest.raises(ValueError, match="relleno"):
+        pad_values(np.zeros(3, dtype=np.uint8), 2, STANDARD, "xx")
+
+
+def test_invalid_input_is_rejected():
+    with pytest.raises(ValueError, match="caracteres no válidos"):
+        hill_encrypt("HOLA MUNDO", KEY)
+    with pytest.raises(ValueError, match="múltiplo"):
+        hill_decrypt("ABC", KEY)
+    with pytest.raises(SingularMatrixError):
+        hill_decrypt("ABCD", np.array([[2, 0], [0, 1]]))
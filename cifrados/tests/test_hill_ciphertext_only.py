@@ -0,0 +1,49 @@
+import pytest
+
+from cifrados.analysis import expected_frequencies
+from cifrados.hill import ciphertext_only_attack, hill_decrypt, hill_encrypt, score_column_range
+from cifrados.lazy import numpy as np
+
+
+def test_recovers_2x2_key_from_english_text(english):
+    key = np.array([[3, 3], [2, 5]])
+    encrypted = hill_encrypt(english, key)
+    results = ciphertext_only_attack(encrypted, 2, workers=1)
+    best, _ = results[0]
+    assert hill_decrypt(encrypted, best) == hill_decrypt(encrypted, key)
+
+
+def test_results_are_sorted_and_limited(english):
+    encrypted = hill_encrypt(english, np.array([[5, 8], [17, 3]]))
+    results = ciphertext_only_attack(encrypted, 2, top=3, workers=1)
+    assert 0 < len(results) <= 3
+    scores = [score for _, score in results]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_split_sweep_matches_single_range(english):
+    encrypted = hill_encrypt(english, np.array([[3, 3], [2, 5]]))
+    blocks = np.frombuffer(encrypted.encode(), dtype=np.uint8).reshape(-1, 2) - 65
+    expected = expected_frequencies("english", 26)
+    whole, whole_scores = score_column_range(blocks, 0, 676, expected, 26, 676)
+    parts = [
+        score_column_range(blocks, start, min(start + 100, 676), expected, 26, 100)
+        for start in range(0, 676, 100)
+    ]
+    indices = np.concatenate([best for best, _ in parts])
+    scores = np.concatenate([score for _, score in parts])
+    order = np.argsort(scores, kind="stable")
+    assert np.allclose(np.sort(scores), whole_scores)
+    assert set(indices[order][:5].tolist()) == set(whole[:5].tolist())
+
+
+def test_non_invertible_columns_are_discarded(english):
+    blocks = np.zeros((10, 2), dtype=np.uint8)
+    _, scores = score_column_range(blocks, 0, 676, expected_frequencies("english", 26), 26, 676)
+    # Columnas con ambas entradas pares (169) o múltiplos de 13 (4), con (0, 0) en las dos
+    assert np.isinf(scores).sum() == 169 + 4 - 1
+
+
+def test_invalid_characters_are_rejected():
+    with pytest.raises(ValueError):
+        ciphertext_only_attack("AB CD", 2, workers=1)
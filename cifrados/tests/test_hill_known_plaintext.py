@@ -0,0 +1,54 @@
+import pytest
+
+from cifrados.alphabets import Alphabet
+from cifrados.hill import hill_encrypt, known_plaintext_attack, recover_key
+from cifrados.lazy import numpy as np
+
+KEYS = [
+    np.array([[3, 3], [2, 5]]),
+    np.array([[6, 24, 1], [13, 16, 10], [20, 17, 15]]),
+]
+
+
+def test_recover_key_from_aligned_text(english):
+    for key in KEYS:
+        encrypted = hill_encrypt(english[:60], key)
+        assert np.array_equal(recover_key(english[:60], encrypted, len(key)), key)
+
+
+def test_recover_key_needs_independent_blocks():
+    key = KEYS[0]
+    with pytest.raises(ValueError):
+        recover_key("AAAA", hill_encrypt("AAAA", key), 2)
+
+
+@pytest.mark.parametrize("key", KEYS)
+@pytest.mark.parametrize("position", [0, 37, 101, 250])
+def test_crib_at_any_position_recovers_key(english, key, position):
+    encrypted = hill_encrypt(english, key)
+    crib = english[position : position + 30]
+    results = known_plaintext_attack(encrypted, crib, len(key), top=1)
+    assert len(results) == 1
+    found, score, where = results[0]
+    assert np.array_equal(found, key)
+    assert where == position
+    assert type(where) is int
+    assert score > 0
+
+
+def test_results_are_sorted_and_limited(english):
+    encrypted = hill_encrypt(english, KEYS[0])
+    results = known_plaintext_attack(encrypted, "THE", 2, top=3)
+    assert len(results) <= 3
+    scores = [score for _, score, _ in results]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_composite_alphabet_modulus():
+    # Módulo 30 = 2 * 3 * 5: los bloques se eligen por separado para cada primo
+    alphabet = Alphabet("ABCDEFGHIJKLMNOPQRSTUVWXYZ .,;")
+    key = np.array([[1, 2], [3, 7]])
+    text = "IT WAS THE BEST OF TIMES, IT WAS THE WORST OF TIMES; IT WAS THE AGE OF WISDOM."
+    encrypted = hill_encrypt(text + " ", key, alphabet)
+    results = known_plaintext_attack(encrypted, text[10:40], 2, alphabet=alphabet)
+    assert any(np.array_equal(found, key) and where == 10 for found, _, where in results)
@@ -0,0 +1,89 @@
+import mmap
+
+import pytest
+
+from cifrados import inplace
+from cifrados.affine import affine_decrypt, affine_encrypt
+from cifrados.alphabets import BYTES, STANDARD
+from cifrados.inplace import affine_inplace, encrypt_file_inplace, shift_inplace, vigenere_inplace
+from cifrados.vigenere import vigenere_decrypt, vigenere_encrypt
+
+DATA = bytes(range(256)) * 5
+
+
+def latin1(data):
+    return bytes(data).decode("latin-1")
+
+
+@pytest.mark.parametrize("alphabet, unknown", [(BYTES, "error"), (STANDARD, "keep")])
+def test_affine_equals_whole_text(english_text, alphabet, unknown):
+    data = DATA if alphabet is BYTES else english_text.encode("latin-1")
+    buffer = bytearray(data)
+    affine_inplace(buffer, 7, 2, alphabet=alphabet)
+    encrypted = affine_encrypt(latin1(data), 7, 2, unknown, alphabet)
+    assert latin1(buffer) == encrypted
+    affine_inplace(buffer, 7, 2, decrypt=True, alphabet=alphabet)
+    assert latin1(buffer) == affine_decrypt(encrypted, 7, 2, unknown, alphabet)
+
+
+def test_shift_on_memoryview_slice():
+    buffer = bytearray(b"..HELLO..")
+    shift_inplace(memoryview(buffer)[2:7], 3, alphabet=STANDARD)
+    assert buffer == bytearray(b"..KHOOR..")
+
+
+@pytest.mark.parametrize("chunk", [1, 3, 1 << 20])
+@pytest.mark.parametrize("alphabet, unknown", [(BYTES, "error"), (STANDARD, "keep")])
+def test_vigenere_equals_whole_text(monkeypatch, english_text, chunk, alphabet, unknown):
+    monkeypatch.setattr(inplace, "INPLACE_CHUNK", chunk)
+    data = DATA if alphabet is BYTES else english_text.encode("latin-1")
+    buffer = bytearray(data)
+    vigenere_inplace(buffer, "LEMON", alphabet=alphabet)
+    encrypted = vigenere_encrypt(latin1(data), "LEMON", unknown, alphabet)
+    assert latin1(buffer) == encrypted
+    vigenere_inplace(buffer, b"LEMON", decrypt=True, alphabet=alphabet)
+    assert latin1(buffer) == vigenere_decrypt(encrypted, "LEMON", unknown, alphabet)
+
+
+def test_vigenere_phase_continues_across_buffers():
+    text = b"ATTACK AT DAWN"
+    first, second = bytearray(text[:8]), bytearray(text[8:])
+    phase = vigenere_inplace(first, "LEMON", alphabet=STANDARD)
+    assert phase == 7 % 5
+    vigenere_inplace(second, "LEMON", alphabet=STANDARD, phase=phase)
+    assert latin1(first + second) == vigenere_encrypt(latin1(text), "LEMON", "keep")
+
+
+def test_read_only_buffers_and_bad_keys():
+    with pytest.raises(ValueError):
+        affine_inplace(b"HELLO", 3, 1)
+    with pytest.raises(ValueError):
+        vigenere_inplace(bytearray(b"HELLO"), "", alphabet=STANDARD)
+    with pytest.raises(ValueError):
+        affine_inplace(bytearray(b"HELLO"), 13, 1, alphabet=STANDARD)
+
+
+def test_file_in_place(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(DATA)
+    encrypt_file_inplace(str(path), "vigenere", "KEY")
+    assert latin1(path.read_bytes()) == vigenere_encrypt(latin1(DATA), "KEY", "error", BYTES)
+    encrypt_file_inplace(str(path), "vigenere", "KEY", decrypt=True)
+    assert path.read_bytes() == DATA
+    encrypt_file_inplace(str(path), "affine", 3, 5)
+    encrypt_file_inplace(str(path), "affine", 3, 5, decrypt=True)
+    assert path.read_bytes() == DATA
+
+
+def test_mmap_and_empty_file(tmp_path):
+    path = tmp_path / "text.txt"
+    path.write_bytes(b"Hello, World")
+    with open(path, "r+b") as file, mmap.mmap(file.fileno(), 0) as mapped:
+        shift_inplace(mapped, 1, alphabet=STANDARD)
+    assert path.read_bytes() == b"IFMMP, XPSME"
+    empty = tmp_path / "empty.bin"
+    empty.write_bytes(b"")
+    encrypt_file_inplace(str(empty), "shift", 3)
+    assert empty.read_bytes() == b""
+    with pytest.raises(ValueError):
+        encrypt_file_inplace(str(empty), "hill", 3)
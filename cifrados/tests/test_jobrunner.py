@@ -0,0 +1,99 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from cifrados.affine import affine_encrypt
+from cifrados.jobrunner import parse_job, run_jobs
+from cifrados.vigenere import vigenere_encrypt
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def read_results(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+@pytest.fixture
+def jobs(english):
+    lines = []
+    for i in range(40):
+        # Grupos intercalados: el orden de salida no depende del agrupamiento
+        if i % 2:
+            job = {"id": i, "cipher": "affine", "operation": "encrypt", "key": [7, 2]}
+        else:
+            job = {"id": i, "cipher": "vigenere", "operation": "encrypt", "key": "LEMON"}
+        lines.append(json.dumps({**job, "text": english[i : i + 15]}) + "\n")
+    return lines
+
+
+def expected_result(english, i):
+    text = english[i : i + 15]
+    return affine_encrypt(text, 7, 2) if i % 2 else vigenere_encrypt(text, "LEMON")
+
+
+@pytest.mark.parametrize("window, chunk", [(1000, 1000), (7, 3), (1, 1)])
+def test_results_keep_input_order(tmp_path, english, jobs, window, chunk):
+    source, destination = tmp_path / "jobs.jsonl", tmp_path / "results.jsonl"
+    source.write_text("".join(jobs), encoding="utf-8")
+    assert run_jobs(str(source), str(destination), workers=2, window=window, chunk=chunk) == (40, 0)
+    results = read_results(destination)
+    assert [result["line"] for result in results] == list(range(1, 41))
+    assert [result["id"] for result in results] == list(range(40))
+    assert [result["result"] for result in results] == [expected_result(english, i) for i in range(40)]
+
+
+def test_error_lines(tmp_path):
+    source, destination = tmp_path / "jobs.jsonl", tmp_path / "results.jsonl"
+    lines = [
+        '{"id": "ok", "cipher": "shift", "operation": "encrypt", "key": 3, "text": "HOLA"}',
+        "",
+        "{not json",
+        "[1, 2]",
+        '{"id": "cipher", "cipher": "enigma", "operation": "encrypt", "key": 1}',
+        '{"id": "key", "cipher": "affine", "operation": "encrypt", "key": [13, 1], "text": "HOLA"}',
+        '{"id": "text", "cipher": "shift", "operation": "encrypt", "key": 3, "text": 5}',
+        '{"cipher": "hill", "operation": "decrypt", "key": [[3, 3], [2, 5]], "text": "ABC"}',
+        '{"id": "empty", "cipher": "shift", "operation": "crack", "text": ""}',
+    ]
+    source.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    assert run_jobs(str(source), str(destination), workers=1) == (8, 7)
+    results = read_results(destination)
+    assert results[0] == {"line": 1, "id": "ok", "result": "KROD"}
+    # La línea vacía no es un trabajo, pero los números de línea son los del archivo
+    assert [result["line"] for result in results] == [1, 3, 4, 5, 6, 7, 8, 9]
+    assert all("error" in result for result in results[1:])
+    assert "id" not in results[1] and "id" not in results[2]
+    assert results[6] == {"line": 8, "error": results[6]["error"]}
+    assert "múltiplo" in results[6]["error"]
+
+
+def test_parse_job():
+    line = '{"id": 3, "cipher": "affine", "operation": "decrypt", "key": "7,2", "text": "AB"}'
+    job_id, group, text = parse_job(line)
+    assert (job_id, group, text) == (3, ("affine", "decrypt", (7, 2), None), "AB")
+    with pytest.raises(ValueError):
+        parse_job('{"cipher": "shift", "operation": "crack", "language": 1}')
+
+
+def test_empty_input(tmp_path):
+    source, destination = tmp_path / "jobs.jsonl", tmp_path / "results.jsonl"
+    source.write_text("\n\n", encoding="utf-8")
+    assert run_jobs(str(source), str(destination), workers=1) == (0, 0)
+    assert destination.read_text(encoding="utf-8") == ""
+
+
+def test_command_line(tmp_path, jobs):
+    source, destination = tmp_path / "jobs.jsonl", tmp_path / "results.jsonl"
+    source.write_text("".join(jobs[:5]), encoding="utf-8")
+    result = subprocess.run(
+        [sys.executable, "-m", "cifrados.jobrunner", str(source), str(destination), "1"],
+        cwd=ROOT,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    assert result.stdout.startswith("5 trabajos (0 con error)")
+    assert len(read_results(destination)) == 5
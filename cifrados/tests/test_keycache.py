@@ -0,0 +1,82 @@
+import threading
+
+import pytest
+
+from cifrados.alphabets import STANDARD
+from cifrados.hill import inverse_matrix
+from cifrados.keycache import KEY_CACHE, CacheStats, KeyCache
+from cifrados.lazy import numpy as np
+from cifrados.playfair import compilar_clave
+
+
+def test_hits_misses_and_lru_eviction():
+    cache = KeyCache(2)
+    built = []
+
+    def build(value):
+        return lambda: built.append(value) or value
+
+    assert cache.get(("a",), build(1)) == 1
+    assert cache.get(("b",), build(2)) == 2
+    assert cache.get(("a",), build(99)) == 1
+    # "b" es la menos usada y sale al entrar "c"
+    assert cache.get(("c",), build(3)) == 3
+    assert cache.get(("b",), build(4)) == 4
+    assert built == [1, 2, 3, 4]
+    assert cache.stats() == CacheStats(hits=1, misses=4, evictions=2, size=2, maxsize=2)
+
+
+def test_resize_clear_and_disabled_cache():
+    cache = KeyCache(3)
+    for key in "abc":
+        cache.get(key, lambda: key)
+    cache.resize(1)
+    assert len(cache) == 1 and cache.stats().evictions == 2
+    cache.clear()
+    assert cache.stats() == CacheStats(0, 0, 0, 0, 1)
+    disabled = KeyCache(0)
+    disabled.get("a", lambda: 1)
+    assert len(disabled) == 0 and disabled.stats().misses == 1
+    with pytest.raises(ValueError):
+        KeyCache(-1)
+    with pytest.raises(ValueError):
+        cache.resize(-1)
+
+
+def test_failed_builds_are_not_stored():
+    cache = KeyCache()
+
+    def fail():
+        raise ValueError("clave inválida")
+
+    with pytest.raises(ValueError):
+        cache.get("bad", fail)
+    assert len(cache) == 0
+
+
+def test_concurrent_access():
+    cache = KeyCache(8)
+
+    def work():
+        for i in range(200):
+            cache.get(i % 16, lambda i=i: i % 16)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = cache.stats()
+    assert stats.hits + stats.misses == 800
+    assert stats.size <= 8
+
+
+def test_shared_cache_holds_read_only_keys():
+    matrix = np.array([[5, 8], [17, 3]])
+    before = KEY_CACHE.stats()
+    inverse = inverse_matrix(matrix)
+    assert inverse_matrix(matrix) is inverse
+    assert not inverse.flags.writeable
+    assert compilar_clave("MONARCHY") is compilar_clave("monarchy")
+    assert STANDARD.substitution(5, 8) is STANDARD.substitution(5, 8)
+    assert KEY_CACHE.stats().hits - before.hits >= 3
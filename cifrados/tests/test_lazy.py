@@ -0,0 +1,81 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import cifrados
+from cifrados.lazy import lazy_import
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def run_fresh(code):
+    """Ejecuta código en un intérprete nuevo y regresa su salida JSON."""
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, check=True, capture_output=True, text=True
+    )
+    assert result.stderr == ""
+    return json.loads(result.stdout)
+
+
+# NumPy está cargado si ya existe alguno de sus submódulos; el módulo diferido no cuenta
+PROBE = """
+import json, sys
+import {module}
+numpy = any(name.startswith("numpy.") for name in sys.modules)
+print(json.dumps([numpy, sorted(m for m in sys.modules if m.startswith("cifrados."))]))
+"""
+
+
+def test_package_import_loads_nothing():
+    numpy, submodules = run_fresh(PROBE.format(module="cifrados"))
+    assert not numpy
+    assert submodules == []
+
+
+@pytest.mark.parametrize(
+    "module", ["cifrados.displacement", "cifrados.affine", "cifrados.playfair", "cifrados.vigenere"]
+)
+def test_cipher_modules_do_not_load_numpy(module):
+    numpy, _ = run_fresh(PROBE.format(module=module))
+    assert not numpy
+
+
+def test_submodules_have_no_import_side_effects():
+    code = "import importlib, cifrados\n" + "".join(
+        f"importlib.import_module('cifrados.{name}')\n" for name in cifrados.SUBMODULES
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True)
+    assert result.returncode == 0
+    assert result.stdout == "" and result.stderr == ""
+
+
+def test_playfair_without_numpy_until_first_use():
+    code = """
+import json, sys
+import cifrados
+before = any(name.startswith("numpy.") for name in sys.modules)
+result = cifrados.cifrar_playfair("HOLA", "CLAVE")
+after = any(name.startswith("numpy.") for name in sys.modules)
+print(json.dumps([before, after, result]))
+"""
+    before, after, result = run_fresh(code)
+    assert not before and after
+    assert result == cifrados.cifrar_playfair("HOLA", "CLAVE")
+
+
+def test_exports_resolve_lazily():
+    assert cifrados.affine_encrypt("HOLA", 7, 2) == "ZWBC"
+    assert cifrados.hill is sys.modules["cifrados.hill"]
+    assert "crack_vigenere" in dir(cifrados)
+    assert set(cifrados.__all__) >= set(cifrados.EXPORTS)
+    with pytest.raises(AttributeError):
+        cifrados.missing_name
+
+
+def test_lazy_import():
+    assert lazy_import("json") is sys.modules["json"]
+    with pytest.raises(ModuleNotFoundError):
+        lazy_import("cifrados_missing_module")
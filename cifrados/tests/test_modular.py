@@ -0,0 +1,82 @@
+import pytest
+
+from cifrados.lazy import numpy as np
+from cifrados.modular import (
+    SingularMatrixError,
+    cached_inverse_mod,
+    factorize,
+    is_invertible_mod,
+    matrix_inverse_mod,
+)
+
+
+def random_invertible(rng, n, modulus):
+    while True:
+        matrix = rng.integers(0, modulus, size=(n, n))
+        if is_invertible_mod(matrix, modulus):
+            return matrix
+
+
+def test_factorize():
+    assert factorize(26) == {2: 1, 13: 1}
+    assert factorize(256) == {2: 8}
+    assert factorize(210) == {2: 1, 3: 1, 5: 1, 7: 1}
+    assert factorize(97) == {97: 1}
+
+
+@pytest.mark.parametrize("modulus", [26, 29, 256, 2 * 3 * 5 * 7])
+@pytest.mark.parametrize("n", [2, 3, 5, 8])
+def test_inverse_on_composite_moduli(modulus, n):
+    rng = np.random.default_rng(modulus * n)
+    for _ in range(5):
+        matrix = random_invertible(rng, n, modulus)
+        inverse = matrix_inverse_mod(matrix, modulus)
+        assert inverse.min() >= 0 and inverse.max() < modulus
+        identity = np.eye(n, dtype=np.int64)
+        assert np.array_equal(matrix @ inverse % modulus, identity)
+        assert np.array_equal(inverse @ matrix % modulus, identity)
+
+
+def test_inverse_matches_adjugate_for_2x2():
+    matrix = np.array([[3, 3], [2, 5]])
+    assert matrix_inverse_mod(matrix, 26).tolist() == [[15, 17], [20, 9]]
+
+
+def test_large_modulus_uses_exact_integers():
+    modulus = 3 * 2**33
+    matrix = np.array([[2**40 + 1, 4], [5, 2**34 + 7]], dtype=object)
+    inverse = matrix_inverse_mod(matrix, modulus)
+    product = matrix.dot(inverse) % modulus
+    assert product.tolist() == [[1, 0], [0, 1]]
+
+
+@pytest.mark.parametrize(
+    "matrix, modulus, factor",
+    [
+        ([[2, 0], [0, 1]], 26, 2),
+        ([[13, 0], [0, 1]], 26, 13),
+        ([[1, 2], [2, 4]], 26, 2),
+        ([[4, 0], [0, 3]], 256, 2),
+        ([[7, 0], [0, 1]], 210, 7),
+        ([[1, 2, 3], [4, 5, 6], [7, 8, 9]], 26, 2),
+    ],
+)
+def test_singular_matrices_report_the_prime_factor(matrix, modulus, factor):
+    with pytest.raises(SingularMatrixError) as info:
+        matrix_inverse_mod(matrix, modulus)
+    assert info.value.modulus == modulus
+    assert info.value.factor == factor
+    assert isinstance(info.value, ValueError)
+    assert not is_invertible_mod(matrix, modulus)
+
+
+def test_non_square_matrix_is_rejected():
+    with pytest.raises(ValueError):
+        matrix_inverse_mod(np.ones((2, 3), dtype=int), 26)
+
+
+def test_cached_inverse_is_read_only_and_shared():
+    matrix = np.array([[3, 3], [2, 5]])
+    inverse = cached_inverse_mod(matrix, 26)
+    assert not inverse.flags.writeable
+    assert cached_inverse_mod(matrix + 26, 26) is inverse
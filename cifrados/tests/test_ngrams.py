@@ -0,0 +1,98 @@
+import pickle
+from collections import Counter
+
+import pytest
+
+from cifrados.lazy import numpy as np
+from cifrados.ngrams import (
+    NgramModel,
+    NgramTables,
+    count_ngrams,
+    log_probabilities,
+    ngram_indices,
+    open_model,
+    save_tables,
+)
+
+LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+def reference_counts(text, n):
+    """Conteo de n-gramas con un Counter sobre las letras del texto."""
+    letters = "".join(char for char in text.upper() if char in LETTERS)
+    counts = np.zeros(26**n, dtype=np.int64)
+    for gram, count in Counter(letters[i : i + n] for i in range(len(letters) - n + 1)).items():
+        counts[sum(LETTERS.index(char) * 26 ** (n - 1 - k) for k, char in enumerate(gram))] = count
+    return counts
+
+
+def test_ngram_indices_read_letters_in_base_m():
+    values = np.array([0, 1, 2, 25])
+    assert ngram_indices(values, 2, 26).tolist() == [1, 28, 77]
+    assert ngram_indices(values, 5, 26).tolist() == []
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 1000])
+def test_counts_across_chunk_borders(english, size):
+    text = english[:500].lower() + " !"
+    chunks = [text[i : i + size] for i in range(0, len(text), size)]
+    counts = count_ngrams(chunks)
+    whole = count_ngrams([text])
+    for n in (1, 2, 3, 4):
+        assert np.array_equal(counts[n], reference_counts(text, n))
+        assert np.array_equal(whole[n], counts[n])
+
+
+def test_unknown_characters_do_not_break_ngrams():
+    counts = count_ngrams(["TH", "-E"], orders=(3,))
+    assert counts[3].sum() == 1
+    assert counts[3][LETTERS.index("T") * 676 + LETTERS.index("H") * 26 + 4] == 1
+
+
+def test_saved_tables_are_memory_mapped(tmp_path, english):
+    path = str(tmp_path / "english.ngrams")
+    counts = count_ngrams([english], orders=(1, 2, 3))
+    save_tables(path, counts)
+    tables = NgramTables(path)
+    assert tables.alphabet == LETTERS
+    for n in (1, 2, 3):
+        assert isinstance(tables.tables[n], np.memmap)
+        assert np.array_equal(tables.tables[n], log_probabilities(counts[n]))
+    with pytest.raises(ValueError):
+        tables.model(4)
+
+
+def test_open_model_scores_like_model_from_text(tmp_path, english):
+    path = str(tmp_path / "english.ngrams")
+    save_tables(path, count_ngrams([english], orders=(2,)))
+    model = open_model(path, 2)
+    assert open_model(path, 2) is model
+    trained = NgramModel.from_text(english, n=2)
+    assert model.score("the season of light") == pytest.approx(trained.score("THESEASONOFLIGHT"))
+    assert model.score("the season") > model.score("xqz jkvw q")
+
+
+def test_file_model_pickles_by_path(tmp_path, english):
+    path = str(tmp_path / "english.ngrams")
+    save_tables(path, count_ngrams([english], orders=(2,)))
+    model = open_model(path, 2)
+    data = pickle.dumps(model)
+    assert len(data) < 1000
+    assert pickle.loads(data) is model
+    trained = NgramModel.from_text(english, n=2)
+    assert len(pickle.dumps(trained)) > 26**2 * 4
+
+
+def test_invalid_files_and_tables(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"not a table")
+    with pytest.raises(ValueError):
+        NgramTables(str(path))
+    with pytest.raises(ValueError):
+        NgramModel(np.zeros(10), 2)
+
+
+def test_score_rows_matches_score_values(english):
+    model = NgramModel.from_text(english, n=3)
+    rows = np.frombuffer(english[:300].encode(), dtype=np.uint8).reshape(10, 30) - 65
+    assert np.allclose(model.score_rows(rows), [model.score_values(row) for row in rows])
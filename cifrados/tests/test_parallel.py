@@ -0,0 +1,82 @@
+import pytest
+
+from cifrados import parallel
+from cifrados.affine import affine_decrypt, affine_encrypt
+from cifrados.hill import hill_decrypt, hill_encrypt
+from cifrados.lazy import numpy as np
+from cifrados.parallel import (
+    parallel_affine,
+    parallel_hill,
+    parallel_shift,
+    parallel_vigenere,
+    split_points,
+)
+from cifrados.vigenere import vigenere_decrypt, vigenere_encrypt
+
+KEY = np.array([[6, 24, 1], [13, 16, 10], [20, 17, 15]])
+WORKERS = [1, 2, 3, 8]
+
+
+@pytest.fixture(autouse=True)
+def small_segments(monkeypatch):
+    # Segmentos y trozos pequeños para que los textos de prueba se repartan entre hilos
+    monkeypatch.setattr(parallel, "SEGMENT_CHARS", 7)
+    monkeypatch.setattr(parallel, "CHUNK_ELEMENTS", 10)
+
+
+def test_split_points_cover_the_range():
+    for length in (0, 1, 10, 101):
+        for workers in (1, 2, 5):
+            for align in (1, 3):
+                points = split_points(length, workers, align, minimum=1)
+                assert points[0][0] == 0 and points[-1][1] == length
+                assert all(stop == start for (_, stop), (start, _) in zip(points, points[1:]))
+                assert all(start % align == 0 for start, _ in points)
+                assert len(points) <= max(workers, 1)
+
+
+@pytest.mark.parametrize("workers", WORKERS)
+@pytest.mark.parametrize("unknown", ["drop", "keep"])
+def test_affine_equals_serial(english_text, workers, unknown):
+    encrypted = parallel_affine(english_text, 7, 2, unknown=unknown, workers=workers)
+    assert encrypted == affine_encrypt(english_text, 7, 2, unknown)
+    decrypted = parallel_affine(encrypted, 7, 2, True, unknown=unknown, workers=workers)
+    assert decrypted == affine_decrypt(encrypted, 7, 2, unknown)
+    assert parallel_shift(english_text, 3, unknown=unknown, workers=workers) == (
+        affine_encrypt(english_text, 1, 3, unknown)
+    )
+
+
+@pytest.mark.parametrize("workers", WORKERS)
+@pytest.mark.parametrize("unknown", ["drop", "keep"])
+def test_vigenere_equals_serial(english_text, workers, unknown):
+    encrypted = parallel_vigenere(english_text, "LEMON", unknown=unknown, workers=workers)
+    assert encrypted == vigenere_encrypt(english_text, "LEMON", unknown)
+    decrypted = parallel_vigenere(encrypted, "LEMON", True, unknown=unknown, workers=workers)
+    assert decrypted == vigenere_decrypt(encrypted, "LEMON", unknown)
+
+
+@pytest.mark.parametrize("workers", WORKERS)
+@pytest.mark.parametrize("length", [1, 299, 300])
+def test_hill_equals_serial(english, workers, length):
+    text = english[:length]
+    encrypted = parallel_hill(text, KEY, workers=workers)
+    assert encrypted == hill_encrypt(text, KEY)
+    assert parallel_hill(encrypted, KEY, True, workers=workers) == hill_decrypt(encrypted, KEY)
+
+
+def test_hill_errors():
+    with pytest.raises(ValueError):
+        parallel_hill("ABCD", KEY, True, workers=2)
+    with pytest.raises(ValueError):
+        parallel_hill("AB CD", KEY, workers=2)
+    with pytest.raises(ValueError, match="relleno"):
+        parallel_hill("ABCD", KEY, workers=2, pad="?")
+
+
+def test_empty_key_and_text():
+    with pytest.raises(ValueError):
+        parallel_vigenere("ABC", "", workers=2)
+    assert parallel_affine("", 3, 1, workers=2) == ""
+    assert parallel_vigenere("", "KEY", workers=2) == ""
+    assert parallel_hill("", KEY, workers=2) == ""
@@ -0,0 +1,73 @@
+import pytest
+
+from cifrados.lazy import numpy as np
+from cifrados.playfair import (
+    ClavePlayfair,
+    cifrar_par,
+    cifrar_playfair,
+    compilar_clave,
+    crear_matriz_clave,
+    descifrar_par,
+    descifrar_playfair,
+    preparar_pares,
+)
+
+CLAVES = ["PLAYFAIREXAMPLE", "KEYWORD", "JUEGO", ""]
+
+
+def cifrado_por_pares(texto, clave, operacion=cifrar_par):
+    """Cifrado Playfair par por par, como lo hacía la versión original."""
+    matriz = crear_matriz_clave(clave)
+    return "".join(a + b for par in preparar_pares(texto) for a, b in [operacion(matriz, *par)])
+
+
+def test_vector_conocido():
+    cifrado = cifrar_playfair("HIDETHEGOLDINTHETREESTUMP", "PLAYFAIREXAMPLE")
+    assert cifrado == "BMODZBXDNABEKUDMUIXMMOUVIF"
+    assert descifrar_playfair(cifrado, "PLAYFAIREXAMPLE") == "HIDETHEGOLDINTHETREXESTUMP"
+
+
+@pytest.mark.parametrize("clave", CLAVES)
+def test_tablas_igualan_el_cifrado_por_pares(clave):
+    texto = "Jugaremos al ajedrez el lunes a las doce; trae las piezas!"
+    cifrado = cifrar_playfair(texto, clave)
+    assert cifrado == cifrado_por_pares(texto, clave)
+    assert descifrar_playfair(cifrado, clave) == cifrado_por_pares(cifrado, clave, descifrar_par)
+
+
+@pytest.mark.parametrize("clave", CLAVES)
+def test_los_625_digramas(clave):
+    letras = "ABCDEFGHIKLMNOPQRSTUVWXYZ"
+    matriz = crear_matriz_clave(clave)
+    compilada = ClavePlayfair(clave)
+    for a in letras:
+        for b in letras:
+            if a == b:
+                continue
+            esperado = "".join(cifrar_par(matriz, a, b))
+            assert compilada.cifrar(a + b) == esperado
+            assert compilada.descifrar(esperado) == a + b
+
+
+def test_tablas_little_endian_y_solo_lectura():
+    compilada = ClavePlayfair("KEYWORD")
+    assert compilada.tabla_cifrado.dtype == np.dtype("<u2")
+    assert not compilada.tabla_cifrado.flags.writeable
+    assert not compilada.tabla_descifrado.flags.writeable
+    with pytest.raises(ValueError):
+        compilada.tabla_cifrado[0] = 0
+
+
+def test_relleno_y_j():
+    assert cifrar_playfair("BALLOON", "KEYWORD") == cifrado_por_pares("BALXLOON", "KEYWORD")
+    assert cifrar_playfair("JAB", "KEYWORD") == cifrar_playfair("IABX", "KEYWORD")
+    assert cifrar_playfair("", "KEYWORD") == ""
+
+
+def test_letras_fuera_del_cuadro():
+    with pytest.raises(ValueError):
+        cifrar_playfair("AÑO", "KEYWORD")
+
+
+def test_claves_compiladas_se_reutilizan():
+    assert compilar_clave("keyword") is compilar_clave("KEYWORD")
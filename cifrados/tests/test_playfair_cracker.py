@@ -0,0 +1,52 @@
+import time
+
+import pytest
+
+from cifrados.analysis import CiphertextProfile
+from cifrados.ngrams import NgramModel
+from cifrados.playfair import ALFABETO, cifrar_playfair, romper_playfair
+
+
+@pytest.fixture
+def modelo(english):
+    return NgramModel.from_text(english * 3, n=2)
+
+
+def test_texto_demasiado_corto(modelo):
+    with pytest.raises(ValueError, match="al menos"):
+        romper_playfair("A", modelo, segundos=0.1, procesos=1)
+    with pytest.raises(ValueError, match="al menos"):
+        romper_playfair("12 !", modelo, segundos=0.1, procesos=1)
+
+
+def test_numero_impar_de_letras(modelo):
+    with pytest.raises(ValueError, match="par"):
+        romper_playfair("ABC", modelo, segundos=0.1, procesos=1)
+
+
+@pytest.mark.parametrize("temperatura", [0, -1.5])
+def test_temperatura_no_positiva(modelo, temperatura):
+    with pytest.raises(ValueError, match="temperatura"):
+        romper_playfair("ABCD", modelo, segundos=0.1, procesos=1, temperatura=temperatura)
+
+
+def test_busqueda_corta(modelo, english):
+    cifrado = cifrar_playfair(english[:200], "KEYWORD")
+    inicio = time.monotonic()
+    resultados = romper_playfair(
+        cifrado, modelo, segundos=0.5, procesos=1, iteraciones=500, mejores=3, semilla=1
+    )
+    assert time.monotonic() - inicio < 5
+    assert 0 < len(resultados) <= 3
+    claves = [clave for clave, _ in resultados]
+    assert len(set(claves)) == len(claves)
+    assert all(sorted(clave) == sorted(ALFABETO) for clave in claves)
+    puntajes = [puntaje for _, puntaje in resultados]
+    assert puntajes == sorted(puntajes, reverse=True)
+
+
+def test_perfil_como_entrada(modelo, english):
+    cifrado = cifrar_playfair(english[:100], "KEYWORD")
+    perfil = CiphertextProfile(cifrado)
+    resultados = romper_playfair(perfil, modelo, segundos=0.2, procesos=1, iteraciones=200, semilla=2)
+    assert resultados
@@ -0,0 +1,104 @@
+import threading
+
+import pytest
+
+from cifrados import profiling
+from cifrados.alphabets import STANDARD
+from cifrados.lazy import numpy as np
+from cifrados.profiling import ARITHMETIC, MAP, NORMALIZE, OUTPUT, stage
+from cifrados.vigenere import vigenere_encrypt
+
+
+@pytest.fixture
+def profiled():
+    profiling.reset()
+    yield profiling
+    profiling.disable()
+    profiling.reset()
+
+
+def test_disabled_stages_measure_nothing(profiled):
+    assert not profiling.is_enabled()
+    assert stage("op", ARITHMETIC) is stage("other", MAP)
+    with stage("op", ARITHMETIC, 10):
+        pass
+    assert profiling.snapshot()["stages"] == {}
+
+
+def test_cipher_stages_are_recorded(profiled):
+    profiling.enable()
+    vigenere_encrypt("ATTACK AT DAWN", "LEMON")
+    vigenere_encrypt("ATTACK AT DAWN", "LEMON")
+    stages = profiling.snapshot()["stages"]["vigenere_encrypt"]
+    assert set(stages) == {NORMALIZE, MAP, ARITHMETIC, OUTPUT}
+    assert stages[MAP]["calls"] == 2
+    assert stages[MAP]["chars"] == 28
+    assert stages[ARITHMETIC]["chars"] == 24
+    assert stages[MAP]["seconds"] > 0
+    assert stages[MAP]["peak_bytes"] == 0
+
+
+def test_memory_peak_of_separate_stages(profiled):
+    profiling.enable(memory=True)
+    with stage("alloc", ARITHMETIC):
+        data = np.ones(1 << 20, dtype=np.uint8)
+        del data
+    with stage("alloc", OUTPUT):
+        pass
+    stages = profiling.snapshot()["stages"]["alloc"]
+    assert stages[ARITHMETIC]["peak_bytes"] >= 1 << 20
+    assert stages[OUTPUT]["peak_bytes"] < 1 << 20
+
+
+def test_overlapping_stages_report_no_peak(profiled):
+    profiling.enable(memory=True)
+    with stage("outer", ARITHMETIC):
+        with stage("inner", ARITHMETIC):
+            pass
+    with stage("after", ARITHMETIC):
+        pass
+    stages = profiling.snapshot()["stages"]
+    assert stages["outer"][ARITHMETIC]["peak_bytes"] is None
+    assert stages["inner"][ARITHMETIC]["peak_bytes"] is None
+    assert stages["after"][ARITHMETIC]["peak_bytes"] is not None
+    lines = {line.split()[0]: line for line in profiling.report().splitlines()[1:-1]}
+    assert lines["outer"].split()[-1] == "-"
+    assert lines["after"].split()[-1].endswith("KB")
+
+
+def test_stages_in_threads_are_counted(profiled):
+    profiling.enable()
+
+    def work():
+        for _ in range(100):
+            with stage("threaded", ARITHMETIC, 1):
+                pass
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert profiling.snapshot()["stages"]["threaded"][ARITHMETIC]["chars"] == 400
+
+
+def test_key_cache_hits_since_reset(profiled):
+    STANDARD.substitution(3, 5)
+    profiling.reset()
+    profiling.enable()
+    STANDARD.substitution(3, 5)
+    STANDARD.substitution(3, 5)
+    cache = profiling.snapshot()["key_cache"]
+    assert cache["hits"] == 2 and cache["misses"] == 0
+    assert cache["hit_rate"] == 1.0
+    assert "2 aciertos" in profiling.report()
+
+
+def test_disable_keeps_totals_until_reset(profiled):
+    profiling.enable(memory=True)
+    with stage("kept", MAP):
+        pass
+    profiling.disable()
+    assert "kept" in profiling.snapshot()["stages"]
+    profiling.reset()
+    assert profiling.snapshot()["stages"] == {}
@@ -0,0 +1,174 @@
+import asyncio
+import json
+import math
+import signal
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from cifrados.affine import affine_encrypt
+from cifrados.hill import hill_encrypt
+from cifrados.lazy import numpy as np
+from cifrados.operations import json_line, normalize_key, run_batch
+from cifrados.playfair import cifrar_playfair
+from cifrados.service import EncryptionService
+from cifrados.vigenere import vigenere_encrypt
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+@pytest.mark.parametrize(
+    "cipher, operation, key, expected",
+    [
+        ("shift", "encrypt", "3", 3),
+        ("shift", "decrypt", [3], 3),
+        ("multiplicative", "encrypt", 7.0, 7),
+        ("affine", "encrypt", "7,2", (7, 2)),
+        ("affine", "decrypt", [7, "2"], (7, 2)),
+        ("vigenere", "encrypt", "LEMON", "LEMON"),
+        ("playfair", "encrypt", "KEYWORD", "KEYWORD"),
+        ("hill", "encrypt", [[3, 3], [2, 5]], ((3, 3), (2, 5))),
+        ("hill", "encrypt", "3,3,2,5", ((3, 3), (2, 5))),
+        ("hill", "crack", 2, 2),
+        ("vigenere", "crack", None, None),
+    ],
+)
+def test_normalize_key(cipher, operation, key, expected):
+    assert normalize_key(cipher, operation, key) == expected
+
+
+@pytest.mark.parametrize(
+    "cipher, operation, key",
+    [
+        ("rot13", "encrypt", 1),
+        ("shift", "sign", 1),
+        ("shift", "encrypt", None),
+        ("shift", "encrypt", [1, 2]),
+        ("shift", "encrypt", 1.5),
+        ("shift", "encrypt", True),
+        ("affine", "encrypt", [7]),
+        ("hill", "encrypt", [1, 2, 3]),
+        ("hill", "encrypt", [["a"]]),
+        ("hill", "crack", 0),
+    ],
+)
+def test_normalize_key_errors(cipher, operation, key):
+    with pytest.raises(ValueError):
+        normalize_key(cipher, operation, key)
+
+
+def test_run_batch_matches_single_calls(english):
+    texts = [english[:10], english[10:35], "", english[35:36]]
+    assert run_batch("affine", "encrypt", (7, 2), texts) == [
+        {"result": affine_encrypt(text, 7, 2)} for text in texts
+    ]
+    # La fase de la clave empieza de nuevo en cada texto
+    assert run_batch("vigenere", "encrypt", "LEMON", texts) == [
+        {"result": vigenere_encrypt(text, "LEMON")} for text in texts
+    ]
+    key = ((3, 3), (2, 5))
+    assert run_batch("hill", "encrypt", key, texts[:2]) == [
+        {"result": hill_encrypt(text, np.array(key))} for text in texts[:2]
+    ]
+    assert run_batch("playfair", "encrypt", "KEYWORD", texts[:2]) == [
+        {"result": cifrar_playfair(text, "KEYWORD")} for text in texts[:2]
+    ]
+
+
+def test_run_batch_reports_errors_per_text():
+    key = ((3, 3), (2, 5))
+    results = run_batch("hill", "decrypt", key, ["ABCD", "ABC", "AB CD"])
+    assert "result" in results[0]
+    assert "múltiplo" in results[1]["error"]
+    assert "no válidos" in results[2]["error"]
+    results = run_batch("affine", "encrypt", (13, 2), ["AB", "CD"])
+    assert all("error" in result for result in results)
+    results = run_batch("shift", "crack", None, ["", "KHOOR ZRUOG"])
+    assert "error" in results[0] and "result" in results[1]
+
+
+def test_run_batch_cracks(english):
+    texts = ["123", affine_encrypt(english[:300], 5, 8)]
+    results = run_batch("affine", "crack", None, texts, language="english")
+    assert "error" in results[0]
+    assert results[1]["result"]["key"] == [5, 8]
+    assert results[1]["result"]["plaintext"] == english[:300]
+
+
+def test_json_line_is_strict_json():
+    line = json_line({"score": math.inf, "values": [1.0, math.nan], "text": "ñ"})
+    assert line.endswith("\n")
+    assert json.loads(line) == {"score": None, "values": [1.0, None], "text": "ñ"}
+    assert "ñ" in line
+
+
+async def exchange(requests, **options):
+    service = EncryptionService(workers=1, **options)
+    host, port = await service.start("127.0.0.1", 0)
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write("".join(json.dumps(request) + "\n" for request in requests).encode())
+        writer.write(b"not json\n[1, 2]\n")
+        await writer.drain()
+        responses = [json.loads(await reader.readline()) for _ in range(len(requests) + 2)]
+        writer.write(json_line({"id": "stats", "operation": "stats"}).encode())
+        await writer.drain()
+        stats = json.loads(await reader.readline())
+        writer.close()
+        return responses, stats
+    finally:
+        await service.close()
+
+
+def test_service_answers_over_a_socket(english):
+    requests = [
+        {"id": i, "cipher": "affine", "operation": "encrypt", "key": [7, 2], "text": english[i : i + 20]}
+        for i in range(50)
+    ]
+    requests += [
+        {"id": "bad-key", "cipher": "affine", "operation": "encrypt", "key": [13, 2], "text": "HOLA"},
+        {"id": "bad-cipher", "cipher": "enigma", "operation": "encrypt", "key": 1, "text": "HOLA"},
+        {"id": "bad-language", "cipher": "shift", "operation": "crack", "text": "HOLA", "language": ["x"]},
+    ]
+    responses, stats = asyncio.run(exchange(requests))
+    by_id = {response["id"]: response for response in responses}
+    for i in range(50):
+        assert by_id[i] == {"id": i, "result": affine_encrypt(english[i : i + 20], 7, 2)}
+    assert "error" in by_id["bad-key"]
+    assert "error" in by_id["bad-cipher"]
+    assert "error" in by_id["bad-language"]
+    assert sum(response["id"] is None and "error" in response for response in responses) == 2
+    result = stats["result"]
+    assert result["requests"] == 51
+    # Las solicitudes que llegaron juntas comparten microlote
+    assert result["batches"] < 51
+    assert set(result["latency_ms"]) == {"p50", "p90", "p99"}
+
+
+def test_heavy_cracks_use_the_process_pool(english):
+    encrypted = vigenere_encrypt(english, "LEMON")
+    requests = [{"id": 1, "cipher": "vigenere", "operation": "crack", "text": encrypted}]
+    responses, _ = asyncio.run(exchange(requests))
+    (response,) = [response for response in responses if response["id"] == 1]
+    assert response["result"]["key"] == "LEMON"
+
+
+@pytest.mark.parametrize("signum", [signal.SIGINT, signal.SIGTERM])
+def test_signals_shut_the_service_down(signum):
+    process = subprocess.Popen(
+        [sys.executable, "-m", "cifrados.service", "0"],
+        cwd=ROOT,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        assert process.stdout.readline().startswith("Escuchando en")
+        process.send_signal(signum)
+        assert process.wait(timeout=30) == 0
+        assert "leaked" not in process.stderr.read()
+    finally:
+        process.kill()
+        process.wait()
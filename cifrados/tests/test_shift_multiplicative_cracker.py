@@ -0,0 +1,64 @@
+import pytest
+
+from cifrados.analysis import CiphertextProfile, expected_frequencies
+from cifrados.multiplication import (
+    displacement_decrypt,
+    displacement_encrypt,
+    guess_displacement_cipher,
+    guess_multiplicative_cipher,
+    multiplicative_decrypt,
+    multiplicative_encrypt,
+)
+
+LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+def reference_chi_squared(plain, language):
+    """Chi-cuadrado del texto ya descifrado, contando letra por letra."""
+    expected = expected_frequencies(language, 26)
+    return sum(
+        (plain.count(char) - len(plain) * p) ** 2 / (len(plain) * p)
+        for char, p in zip(LETTERS, expected)
+    )
+
+
+@pytest.mark.parametrize("shift", [0, 3, 17, 25])
+def test_displacement_key_is_ranked_first(spanish, shift):
+    encrypted = displacement_encrypt(spanish, shift)
+    ranking = guess_displacement_cipher(encrypted)
+    assert ranking[0][0] == shift
+    assert sorted(key for key, _ in ranking) == list(range(26))
+
+
+@pytest.mark.parametrize("key", [1, 5, 11, 25])
+def test_multiplicative_key_is_ranked_first(english, key):
+    encrypted = multiplicative_encrypt(english, key)
+    ranking = guess_multiplicative_cipher(encrypted, language="english")
+    assert ranking[0][0] == key
+    assert sorted(k for k, _ in ranking) == [1, 3, 5, 7, 9, 11, 15, 17, 19, 21, 23, 25]
+
+
+def test_scores_match_decrypting_every_key(spanish):
+    encrypted = displacement_encrypt(spanish[:300], 7)
+    for key, score in guess_displacement_cipher(encrypted):
+        plain = displacement_decrypt(encrypted, key)
+        assert score == pytest.approx(reference_chi_squared(plain, "spanish"))
+    encrypted = multiplicative_encrypt(spanish[:300], 7)
+    for key, score in guess_multiplicative_cipher(encrypted):
+        plain = multiplicative_decrypt(encrypted, key)
+        assert score == pytest.approx(reference_chi_squared(plain, "spanish"))
+
+
+def test_ranking_is_sorted_and_accepts_profiles(spanish):
+    encrypted = displacement_encrypt(spanish, 4)
+    ranking = guess_displacement_cipher(CiphertextProfile(encrypted))
+    assert ranking == guess_displacement_cipher(encrypted)
+    scores = [score for _, score in ranking]
+    assert scores == sorted(scores)
+
+
+def test_text_without_letters_is_rejected():
+    with pytest.raises(ValueError):
+        guess_displacement_cipher("")
+    with pytest.raises(ValueError):
+        guess_multiplicative_cipher("123 !?")
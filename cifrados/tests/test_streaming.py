@@ -0,0 +1,122 @@
+import io
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from cifrados.affine import affine_decrypt, affine_encrypt
+from cifrados.hill import hill_decrypt, hill_encrypt
+from cifrados.lazy import numpy as np
+from cifrados.streaming import (
+    affine_stream,
+    hill_stream,
+    multiplicative_stream,
+    parse_key,
+    read_chunks,
+    shift_stream,
+    vigenere_stream,
+    write_chunks,
+)
+from cifrados.vigenere import vigenere_decrypt, vigenere_encrypt
+
+SIZES = [1, 2, 3, 5, 64, 10_000]
+KEY = np.array([[6, 24, 1], [13, 16, 10], [20, 17, 15]])
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def split(text, size):
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("unknown", ["drop", "keep"])
+def test_affine_family_equals_whole_text(english_text, size, unknown):
+    text = english_text
+    chunks = split(text, size)
+    assert "".join(affine_stream(chunks, 7, 2, unknown=unknown)) == affine_encrypt(text, 7, 2, unknown)
+    encrypted = affine_encrypt(text, 7, 2, unknown)
+    assert "".join(affine_stream(split(encrypted, size), 7, 2, True, unknown=unknown)) == (
+        affine_decrypt(encrypted, 7, 2, unknown)
+    )
+    assert "".join(shift_stream(chunks, 3, unknown=unknown)) == affine_encrypt(text, 1, 3, unknown)
+    assert "".join(multiplicative_stream(chunks, 5, unknown=unknown)) == (
+        affine_encrypt(text, 5, 0, unknown)
+    )
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("unknown", ["drop", "keep"])
+def test_vigenere_keeps_key_phase_across_chunks(english_text, size, unknown):
+    encrypted = "".join(vigenere_stream(split(english_text, size), "LEMON", unknown=unknown))
+    assert encrypted == vigenere_encrypt(english_text, "LEMON", unknown)
+    decrypted = "".join(vigenere_stream(split(encrypted, size), "LEMON", True, unknown=unknown))
+    assert decrypted == vigenere_decrypt(encrypted, "LEMON", unknown)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_hill_carries_partial_blocks(english, size):
+    text = english[:301]
+    encrypted = "".join(hill_stream(split(text, size), KEY))
+    assert encrypted == hill_encrypt(text, KEY)
+    decrypted = "".join(hill_stream(split(encrypted, size), KEY, decrypt=True))
+    assert decrypted == hill_decrypt(encrypted, KEY)
+
+
+def test_hill_policies_and_lengths():
+    with pytest.raises(ValueError):
+        list(hill_stream(["ABC"], KEY, unknown="keep"))
+    with pytest.raises(ValueError):
+        list(hill_stream(["AB C"], KEY))
+    assert "".join(hill_stream(["AB C"], KEY, unknown="drop")) == hill_encrypt("ABC", KEY)
+    with pytest.raises(ValueError, match="múltiplo"):
+        list(hill_stream(["ABCD"], KEY, decrypt=True))
+    with pytest.raises(ValueError):
+        list(hill_stream(["ABCD"], KEY, pad="?"))
+
+
+def test_empty_vigenere_key_is_rejected():
+    with pytest.raises(ValueError):
+        list(vigenere_stream(["ABC"], ""))
+
+
+def test_read_and_write_chunks(tmp_path, english_text):
+    path = tmp_path / "plain.txt"
+    path.write_text(english_text, encoding="utf-8")
+    chunks = list(read_chunks(str(path), size=100))
+    assert all(len(chunk) == 100 for chunk in chunks[:-1])
+    assert "".join(chunks) == english_text
+    assert list(read_chunks(io.StringIO("abcde"), size=2)) == ["ab", "cd", "e"]
+    output = tmp_path / "out.txt"
+    assert write_chunks(iter(["ab", "cd"]), str(output)) == 4
+    assert output.read_text(encoding="utf-8") == "abcd"
+
+
+def test_read_chunks_invalid_utf8(tmp_path):
+    path = tmp_path / "latin1.txt"
+    path.write_bytes("AÑO".encode("latin-1"))
+    with pytest.raises(UnicodeDecodeError):
+        list(read_chunks(str(path)))
+    assert "".join(read_chunks(str(path), errors="ignore")) == "AO"
+    assert "".join(read_chunks(str(path), errors="replace")) == "A�O"
+
+
+def test_parse_key():
+    assert parse_key("vigenere", "LEMON") == ("LEMON",)
+    assert parse_key("affine", "7,2") == (7, 2)
+    assert parse_key("hill", "3,3,2,5")[0].tolist() == [[3, 3], [2, 5]]
+    with pytest.raises(ValueError):
+        parse_key("hill", "1,2,3")
+
+
+def test_command_line(tmp_path, english_text):
+    source, destination = tmp_path / "in.txt", tmp_path / "out.txt"
+    source.write_text(english_text, encoding="utf-8")
+    subprocess.run(
+        [sys.executable, "-m", "cifrados.streaming", "vigenere", "encrypt", "LEMON"]
+        + [str(source), str(destination)],
+        cwd=ROOT,
+        check=True,
+        capture_output=True,
+    )
+    assert destination.read_text(encoding="utf-8") == vigenere_encrypt(english_text, "LEMON")
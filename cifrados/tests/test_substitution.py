@@ -0,0 +1,78 @@
+import pytest
+
+from cifrados.affine import affine_decrypt, affine_encrypt
+from cifrados.displacement import caesar_decrypt, caesar_encrypt
+from cifrados.multiplication import (
+    displacement_decrypt,
+    displacement_encrypt,
+    multiplicative_decrypt,
+    multiplicative_encrypt,
+)
+from cifrados.substitution import AffineSubstitution, compile_affine
+
+LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+TEXT = "Ataque al amanecer, 5 de Mayo!"
+
+
+def reference_affine(text, a, b):
+    """Cifrado afín carácter por carácter, como lo hacían las funciones originales."""
+    return "".join(
+        LETTERS[(a * LETTERS.index(char) + b) % 26]
+        for char in text.upper()
+        if char in LETTERS
+    )
+
+
+@pytest.mark.parametrize("a, b", [(1, 0), (3, 7), (25, 25), (5, -4), (27, 30)])
+def test_affine_matches_arithmetic(a, b):
+    encrypted = affine_encrypt(TEXT, a, b)
+    assert encrypted == reference_affine(TEXT, a, b)
+    assert affine_decrypt(encrypted, a, b) == reference_affine(TEXT, 1, 0)
+
+
+@pytest.mark.parametrize("shift", [0, 3, 13, 25, -1])
+def test_displacement_matches_arithmetic(shift):
+    encrypted = displacement_encrypt(TEXT, shift)
+    assert encrypted == reference_affine(TEXT, 1, shift)
+    assert displacement_decrypt(encrypted, shift) == reference_affine(TEXT, 1, 0)
+
+
+@pytest.mark.parametrize("key", [1, 3, 11, 25])
+def test_multiplicative_matches_arithmetic(key):
+    encrypted = multiplicative_encrypt(TEXT, key)
+    assert encrypted == reference_affine(TEXT, key, 0)
+    assert multiplicative_decrypt(encrypted, key) == reference_affine(TEXT, 1, 0)
+
+
+def test_caesar_is_shift_by_three():
+    assert caesar_encrypt(TEXT) == reference_affine(TEXT, 1, 3)
+    assert caesar_decrypt(caesar_encrypt(TEXT)) == reference_affine(TEXT, 1, 0)
+
+
+def test_keep_policy_preserves_layout_and_case_folds():
+    assert affine_encrypt("ab, c!", 1, 1, unknown="keep") == "BC, D!"
+    assert affine_decrypt("BC, D!", 1, 1, unknown="keep") == "AB, C!"
+
+
+def test_error_policy_raises_on_unknown_characters():
+    assert affine_encrypt("abc", 3, 1, unknown="error") == "BEH"
+    with pytest.raises(ValueError):
+        affine_encrypt("ab c", 3, 1, unknown="error")
+    with pytest.raises(ValueError):
+        affine_encrypt("ÑANDU", 3, 1, unknown="error")
+
+
+def test_non_ascii_text_uses_str_path():
+    assert affine_encrypt("añb", 1, 1) == "BC"
+    assert affine_encrypt("añb", 1, 1, unknown="keep") == "BñC"
+
+
+def test_non_invertible_multiplier_is_rejected():
+    with pytest.raises(ValueError):
+        AffineSubstitution(13, 0, LETTERS)
+    with pytest.raises(ValueError):
+        multiplicative_encrypt(TEXT, 2)
+
+
+def test_compiled_keys_are_reused():
+    assert compile_affine(3, 7, LETTERS) is compile_affine(29, 33, LETTERS)
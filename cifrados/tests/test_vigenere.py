@@ -0,0 +1,64 @@
+import pytest
+
+from cifrados.alphabets import BYTES
+from cifrados.lazy import numpy as np
+from cifrados.vigenere import apply_key, vigenere_decrypt, vigenere_encrypt
+
+LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+def reference_vigenere(text, key, sign=1):
+    """Vigenère letra por letra; la clave avanza solo sobre las letras del alfabeto."""
+    letters = [char for char in text.upper() if char in LETTERS]
+    return "".join(
+        LETTERS[(LETTERS.index(char) + sign * LETTERS.index(key[i % len(key)])) % 26]
+        for i, char in enumerate(letters)
+    )
+
+
+def test_known_vector():
+    assert vigenere_encrypt("WEAREDISCOVEREDSAVEYOURSELF", "DECEPTIVE") == (
+        "ZICVTWQNGRZGVTWAVZHCQYGLMGJ"
+    )
+
+
+@pytest.mark.parametrize("key", ["A", "LEMON", "lemon", "ABCDEFGHIJKLMNOPQRSTUVWXYZQ"])
+@pytest.mark.parametrize("length", [0, 1, 4, 5, 6, 131])
+def test_matches_letter_by_letter(english, key, length):
+    text = english[:length]
+    encrypted = vigenere_encrypt(text, key)
+    assert encrypted == reference_vigenere(text, key.upper())
+    assert vigenere_decrypt(encrypted, key) == text
+
+
+def test_key_skips_unknown_characters():
+    text = "attack at dawn!"
+    assert vigenere_encrypt(text, "LEMON") == reference_vigenere(text, "LEMON")
+    assert vigenere_encrypt(text, "LEMON", unknown="keep") == "LXFOPV EF RNHR!"
+    assert vigenere_decrypt("LXFOPV EF RNHR!", "LEMON", unknown="keep") == "ATTACK AT DAWN!"
+
+
+def test_error_policy():
+    with pytest.raises(ValueError):
+        vigenere_encrypt("ATTACK AT DAWN", "LEMON", unknown="error")
+    with pytest.raises(ValueError):
+        vigenere_encrypt("ATTACK", "LEM ON")
+
+
+def test_empty_key_is_rejected():
+    with pytest.raises(ValueError):
+        vigenere_encrypt("ATTACK", "")
+
+
+def test_bytes_alphabet_round_trip():
+    text = bytes(range(256)).decode("latin-1") * 3
+    encrypted = vigenere_encrypt(text, "\x00\xffkey", alphabet=BYTES)
+    assert len(encrypted) == len(text)
+    assert vigenere_decrypt(encrypted, "\x00\xffkey", alphabet=BYTES) == text
+
+
+def test_apply_key_keeps_dtype():
+    values = np.arange(26, dtype=np.uint8)
+    result = apply_key(values, np.array([1, 2, 3]), 1, 26)
+    assert result.dtype == np.uint8
+    assert result.tolist() == [(x + (1, 2, 3)[x % 3]) % 26 for x in range(26)]
@@ -0,0 +1,58 @@
+import pytest
+
+from cifrados.lazy import numpy as np
+from cifrados.vigenere import (
+    crack_vigenere,
+    key_length_candidates,
+    shortest_period,
+    vigenere_decrypt,
+    vigenere_encrypt,
+)
+
+
+@pytest.mark.parametrize("key", ["LEMON", "CRYPTO", "DECEPTIVE"])
+def test_recovers_the_key(english, key):
+    encrypted = vigenere_encrypt(english, key)
+    assert key_length_candidates(encrypted)[0][0] == len(key)
+    best, score, preview = crack_vigenere(encrypted)[0]
+    assert best == key
+    assert preview == english[:60]
+    assert score > 0
+
+
+def test_spanish_language_table(spanish):
+    encrypted = vigenere_encrypt(spanish, "QUIJOTE")
+    assert crack_vigenere(encrypted, language="spanish")[0][0] == "QUIJOTE"
+
+
+def test_multiples_reduce_to_the_real_length(english):
+    encrypted = vigenere_encrypt(english, "LEMON")
+    lengths = [length for length, _, _ in key_length_candidates(encrypted, top=5)]
+    assert 10 not in lengths and 15 not in lengths
+
+
+def test_results_are_unique_and_sorted(english):
+    results = crack_vigenere(vigenere_encrypt(english, "LEMON"), preview=10)
+    keys = [key for key, _, _ in results]
+    assert len(set(keys)) == len(keys)
+    scores = [score for _, score, _ in results]
+    assert scores == sorted(scores, reverse=True)
+    assert all(len(preview) <= 10 for _, _, preview in results)
+
+
+def test_decrypt_with_found_key_round_trips(english):
+    encrypted = vigenere_encrypt(english, "LEMON")
+    assert vigenere_decrypt(encrypted, crack_vigenere(encrypted)[0][0]) == english
+
+
+def test_short_text_is_rejected():
+    with pytest.raises(ValueError):
+        crack_vigenere("A")
+    with pytest.raises(ValueError):
+        crack_vigenere("1 2 3 !")
+
+
+def test_shortest_period():
+    assert shortest_period(np.array([1, 2, 1, 2, 1, 2])).tolist() == [1, 2]
+    assert shortest_period(np.array([1, 2, 3])).tolist() == [1, 2, 3]
+    assert shortest_period(np.array([4, 4, 4, 4])).tolist() == [4]
@@ -1,102 +1,245 @@
-# Especificacion del alfabeto
-alphabet = list("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
-# alphabet = generate_alphabet("alfabeto.txt", separator="")
+from .alphabets import STANDARD
+from .analysis import as_profile, digraph_index_of_coincidence, expected_frequencies
+from .lazy import numpy as np
+from .profiling import ARITHMETIC, MAP, NORMALIZE, OUTPUT, stage
 
-# Diccionarios para facil transformación del alfabeto a su equivalente númerico
-alphabetical_decimal = {char: i for i, char in enumerate(alphabet)}
-decimal_alphabetical = {i: char for char, i in alphabetical_decimal.items()}
 
-modulus = len(alphabet)
-
-
-def generate_alphabet(filename, separator=None):
+def apply_key(values, key_values, sign, modulus):
     """
-    Extrae los caracteres de un archivo de texto y los devuelve como una lista,
-    en orden para hacer un alfabeto extendido. Permite definir un separador del contenido.
+    Suma (o resta) la clave a un arreglo de índices en una sola operación: el texto
+    se ve como una matriz (filas x longitud de la clave) y la clave se difunde sobre
+    sus filas. La clave solo avanza sobre los caracteres válidos.
     Argumentos:
-    filename (str): El nombre del archivo de texto desde donde se extraerán los caracteres.
-    separator (str, optional): El separador que se usa en el archivo, por defecto es None si no hay separador.
+    values (np.array): Índices del texto.
+    key_values (np.array): Índices de la clave.
+    sign (int): 1 para cifrar, -1 para descifrar.
+    modulus (int): El tamaño del alfabeto.
     Regresa:
-    list: Una lista con los caracteres válidos que pueden usarse como alfabeto.
-    """
-    try:
-        # Abrir el archivo y leer su contenido
-        with open(filename, "r", encoding="utf-8") as file:
-            content = file.read()  # Se almacena el contenido del archivo
-
-        # Si hay un separador, separar el contenido
-        if separator:
-            content = content.split(separator)
-        # Si no hay separador, tomar todos los caracteres
-        else:
-            content = list(content)
-
-        seen = set()  # Almacena los elementos ya vistos
-        characters = []  # Almacena los caracteres
-        # Se lee el archivo y se almacenan los caracteres en orden
-        for char in content:
-            if char not in seen:
-                characters.append(char)
-                seen.add(char)
-        # Regresa los caracteres para el diccionario extendido
-        return characters
-    # Excepcion por si no se encuentra el archivo
-    except FileNotFoundError:
-        print(f"El archivo {filename} no se encontró.")
-        return []
-
-
-def vigenere_encrypt(plaintext, key):
+    np.array: Los índices resultantes, con el mismo tipo que la entrada.
+    """
+    length = len(key_values)
+    if length == 0:
+        raise ValueError("La clave no puede estar vacía.")
+    rows = -(-len(values) // length)
+    padded = np.zeros(rows * length, dtype=np.int32)
+    padded[: len(values)] = values
+    result = (padded.reshape(rows, length) + sign * key_values.astype(np.int32)) % modulus
+    return result.ravel()[: len(values)].astype(values.dtype)
+
+
+def vigenere_encrypt(plaintext, key, unknown="drop", alphabet=STANDARD):
     """
     Cifra un texto plano usando el cifrado Vigenère.
     Argumentos:
     plaintext (str): El texto plano a cifrar.
     key (str): La clave para el cifrado.
+    unknown (str): Política para caracteres fuera del alfabeto ("drop", "keep" o "error").
+    alphabet (Alphabet): El alfabeto del cifrado.
     Regresa:
     str: El texto cifrado.
     """
-    ciphertext = []
-    key_length = len(key)
-    for i, char in enumerate(plaintext):
-        if char in alphabetical_decimal:
-            # Encuentra el índice del carácter en el alfabeto
-            p = alphabetical_decimal[char]
-            # Encuentra el índice del carácter de la clave correspondiente
-            k = alphabetical_decimal[key[i % key_length]]
-            # Cifra el carácter
-            encrypted_index = (p + k) % modulus
-            ciphertext.append(decimal_alphabetical[encrypted_index])
-        else:
-            print("Carácter no válido en el texto plano:", char)
-    return "".join(ciphertext)
+    with stage("vigenere_encrypt", NORMALIZE, len(key)):
+        key_values, _ = alphabet.encode(key, "error")
+    with stage("vigenere_encrypt", MAP, len(plaintext)):
+        values, layout = alphabet.encode(plaintext, unknown)
+    with stage("vigenere_encrypt", ARITHMETIC, len(values)):
+        result = apply_key(values, key_values, 1, alphabet.modulus)
+    with stage("vigenere_encrypt", OUTPUT, len(result)):
+        return alphabet.decode(result, layout)
 
 
-def vigenere_decrypt(ciphertext, key):
+def vigenere_decrypt(ciphertext, key, unknown="drop", alphabet=STANDARD):
     """
     Descifra un texto cifrado usando el cifrado Vigenère.
     Argumentos:
     ciphertext (str): El texto cifrado a descifrar.
     key (str): La clave para el descifrado.
+    unknown (str): Política para caracteres fuera del alfabeto ("drop", "keep" o "error").
+    alphabet (Alphabet): El alfabeto del cifrado.
     Regresa:
     str: El texto descifrado.
     """
-    plaintext = []
-    key_length = len(key)
-    for i, char in enumerate(ciphertext):
-        if char in alphabetical_decimal:
-            # Encuentra el índice del carácter en el alfabeto
-            c = alphabetical_decimal[char]
-            # Encuentra el índice del carácter de la clave correspondiente
-            k = alphabetical_decimal[key[i % key_length]]
-            # Descifra el carácter
-            decrypted_index = (c - k) % modulus
-            plaintext.append(decimal_alphabetical[decrypted_index])
-        else:
-            print("Carácter no válido en el texto cifrado:", char)
-    return "".join(plaintext)
-
-
-encrypted = vigenere_encrypt("WEAREDISCOVEREDSAVEYOURSELF", "DECEPTIVE")
-print(encrypted)
-decrypted = vigenere_decrypt(encrypted, "DECEPTIVE")
-print(decrypted)
+    with stage("vigenere_decrypt", NORMALIZE, len(key)):
+        key_values, _ = alphabet.encode(key, "error")
+    with stage("vigenere_decrypt", MAP, len(ciphertext)):
+        values, layout = alphabet.encode(ciphertext, unknown)
+    with stage("vigenere_decrypt", ARITHMETIC, len(values)):
+        result = apply_key(values, key_values, -1, alphabet.modulus)
+    with stage("vigenere_decrypt", OUTPUT, len(result)):
+        return alphabet.decode(result, layout)
+
+
+def kasiski_examination(profile, max_length, n=3):
+    """
+    Examen de Kasiski: para cada longitud de clave cuenta cuántas distancias entre
+    repeticiones consecutivas de un mismo n-grama son múltiplos de ella.
+    Argumentos:
+    profile (CiphertextProfile): El perfil del texto cifrado.
+    max_length (int): Longitud de clave máxima a considerar.
+    n (int): Tamaño de los n-gramas repetidos, por defecto trigramas.
+    Regresa:
+    np.array: Conteo por longitud, indexado por la longitud (la posición 0 no se usa).
+    """
+    distances = profile.repeat_distances(n)[2]
+    histogram = np.bincount(distances, minlength=max_length + 1)
+    counts = np.zeros(max_length + 1, dtype=np.int64)
+    for length in range(1, max_length + 1):
+        counts[length] = histogram[length::length].sum()
+    return counts
+
+
+def coincidence_by_length(values, max_length, modulus):
+    """
+    Calcula, para cada longitud de clave, el índice de coincidencia promedio de las
+    columnas que resultan de leer el texto cada 'longitud' letras.
+    Argumentos:
+    values (np.array): Índices del texto cifrado.
+    max_length (int): Longitud de clave máxima a considerar.
+    modulus (int): El tamaño del alfabeto.
+    Regresa:
+    np.array: Índice promedio por longitud, indexado por la longitud.
+    """
+    averages = np.zeros(max_length + 1)
+    for length in range(1, max_length + 1):
+        counts = column_counts(values, length, modulus)
+        sizes = counts.sum(axis=1)
+        valid = sizes > 1
+        coincidences = (counts * (counts - 1)).sum(axis=1)[valid]
+        averages[length] = np.mean(coincidences / (sizes[valid] * (sizes[valid] - 1)))
+    return averages
+
+
+def column_counts(values, length, modulus):
+    """
+    Cuenta las letras de cada columna del texto leído cada 'length' letras, con un
+    solo bincount sobre la vista (filas x length) del texto.
+    Argumentos:
+    values (np.array): Índices del texto cifrado.
+    length (int): La longitud de la clave.
+    modulus (int): El tamaño del alfabeto.
+    Regresa:
+    np.array: Matriz (length x m) de conteos.
+    """
+    columns = np.arange(len(values)) % length
+    counts = np.bincount(columns * modulus + values, minlength=length * modulus)
+    return counts.reshape(length, modulus)
+
+
+def key_length_candidates(
+    ciphertext, max_length=40, top=5, sample_size=1 << 18, alphabet=STANDARD
+):
+    """
+    Ordena las longitudes de clave más probables por el índice de coincidencia de
+    sus columnas, junto con el apoyo del examen de Kasiski. Los múltiplos de la
+    longitud real tienen el mismo índice esperado, así que cada longitud se reduce a
+    su divisor más pequeño que también supere el umbral entre texto aleatorio y el
+    mejor índice encontrado.
+    Argumentos:
+    ciphertext (str | CiphertextProfile): El texto cifrado o su perfil.
+    max_length (int): Longitud de clave máxima a considerar.
+    top (int): Número de longitudes a devolver.
+    sample_size (int): Letras del inicio del texto usadas para estimar la longitud.
+    alphabet (Alphabet): El alfabeto del cifrado.
+    Regresa:
+    list: Tuplas (longitud, índice de coincidencia, conteo de Kasiski), de mejor a peor.
+    """
+    profile = as_profile(ciphertext, alphabet).prefix(sample_size)
+    # Cada longitud probada necesita al menos dos periodos completos del texto
+    if len(profile) < 2:
+        raise ValueError("El texto cifrado necesita al menos dos letras del alfabeto.")
+    max_length = max(1, min(max_length, len(profile) // 2))
+    coincidences = coincidence_by_length(profile.values, max_length, alphabet.modulus)
+    kasiski = kasiski_examination(profile, max_length)
+    threshold = (1 / alphabet.modulus + coincidences.max()) / 2
+    lengths = []
+    for length in (np.argsort(-coincidences[1:], kind="stable") + 1).tolist():
+        divisors = (d for d in range(1, length) if length % d == 0)
+        length = next((d for d in divisors if coincidences[d] >= threshold), length)
+        if length not in lengths:
+            lengths.append(length)
+        if len(lengths) == top:
+            break
+    return [(n, float(coincidences[n]), int(kasiski[n])) for n in lengths]
+
+
+def solve_key(values, length, expected):
+    """
+    Encuentra el desplazamiento de cada columna comparando sus conteos contra los 26
+    desplazamientos de la distribución esperada con un solo producto de matrices.
+    Argumentos:
+    values (np.array): Índices del texto cifrado.
+    length (int): La longitud de la clave.
+    expected (np.array): Probabilidades de las letras del idioma.
+    Regresa:
+    np.array: Los índices de la clave.
+    """
+    modulus = len(expected)
+    counts = column_counts(values, length, modulus).astype(np.float64)
+    sizes = np.maximum(counts.sum(axis=1, keepdims=True), 1)
+    # shifted[k, j]: probabilidad de ver la letra cifrada j con el desplazamiento k
+    shifted = expected[(np.arange(modulus)[None, :] - np.arange(modulus)[:, None]) % modulus]
+    # chi² = Σ c² / (n·E) - n, para todas las columnas y desplazamientos a la vez
+    scores = (counts**2) @ (1 / shifted).T / sizes - sizes
+    return np.argmin(scores, axis=1)
+
+
+def shortest_period(key_values):
+    """
+    Reduce una clave que es repetición de una más corta, como sucede al probar un
+    múltiplo de la longitud real.
+    """
+    length = len(key_values)
+    for period in range(1, length):
+        repeated = np.tile(key_values[:period], length // period)
+        if length % period == 0 and (repeated == key_values).all():
+            return key_values[:period]
+    return key_values
+
+
+def crack_vigenere(
+    ciphertext, max_length=40, top=5, language="english", preview=60, alphabet=STANDARD
+):
+    """
+    Recupera la clave de un texto cifrado con Vigenère: estima las longitudes de clave
+    más probables y resuelve cada columna con chi-cuadrado. Las claves se ordenan por el
+    índice de coincidencia de digramas del texto descifrado, que a diferencia del
+    chi-cuadrado por columna no favorece claves largas sobreajustadas.
+    Argumentos:
+    ciphertext (str | CiphertextProfile): El texto cifrado o su perfil.
+    max_length (int): Longitud de clave máxima a considerar.
+    top (int): Número de longitudes candidatas a resolver.
+    language (str | list): "english", "spanish" o una tabla de frecuencias propia.
+    preview (int): Número de letras del texto descifrado a incluir.
+    alphabet (Alphabet): El alfabeto del cifrado.
+    Regresa:
+    list: Tuplas (clave, índice de coincidencia de digramas, inicio del texto
+    descifrado), de mejor a peor.
+    """
+    with stage("crack_vigenere", NORMALIZE, len(ciphertext)):
+        profile = as_profile(ciphertext, alphabet)
+    values = profile.values
+    modulus = alphabet.modulus
+    expected = expected_frequencies(language, modulus)
+    results = {}
+    with stage("crack_vigenere", ARITHMETIC, len(values)):
+        for length, _, _ in key_length_candidates(profile, max_length, top, alphabet=alphabet):
+            key_values = shortest_period(solve_key(values, length, expected))
+            key = alphabet.decode(key_values.astype(alphabet.codec.dtype))
+            if key in results:
+                continue
+            plain = apply_key(values, key_values, -1, modulus)
+            score = digraph_index_of_coincidence(plain, modulus)
+            results[key] = (key, score, alphabet.decode(plain[:preview]))
+    with stage("crack_vigenere", OUTPUT):
+        return sorted(results.values(), key=lambda result: result[1], reverse=True)
+
+
+def demo():
+    encrypted = vigenere_encrypt("WEAREDISCOVEREDSAVEYOURSELF", "DECEPTIVE")
+    print(encrypted)
+    decrypted = vigenere_decrypt(encrypted, "DECEPTIVE")
+    print(decrypted)
+
+
+if __name__ == "__main__":
+    demo()